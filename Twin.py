@@ -1,127 +1,198 @@
 from flask import Flask, render_template, request, jsonify
-import random
-import datetime
+import os
+import numpy as np
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock; a single process runs the scheduler there
+    fcntl = None
+from twin_engine import NUTRITION_LEVELS
+from twin_history import TwinHistory
+from twin_registry import TwinRegistry
+from twin_scheduler import TwinScheduler
+from twin_telemetry import TelemetryBuffer, parse_json_lines
 
 app = Flask(__name__)
 
 # --- Digital Twin Core Simulation (Simplified) ---
-# This dictionary will hold the state of our virtual crop
-# In a real system, this would be much more complex,
-# potentially pulling from a database or a more sophisticated simulation engine.
-crop_twin_data = {
-    "growth_stage": "Seedling",
-    "days_since_planting": 0,
-    "height_cm": 0.5,
-    "health_score": 100, # 0-100, 100 is perfect
-    "soil_moisture": 70, # %
-    "temperature_c": 25, # Celsius
-    "humidity_percent": 60, # %
-    "nutrition_level": "Optimal", # Optimal, Low N, Low P, Low K
-    "last_updated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-}
+# Every twin (one per farm plot) lives in the registry, which keeps state as
+# NumPy columns so all twins advance in one vectorized step, and persists it
+# to SQLite. A background scheduler advances all twins on a simulated clock,
+# so page loads only read state. Sensor readings posted to /telemetry are
+# buffered per twin and drive the sensor values of the days they cover.
+# Every simulated day is appended to the history store for growth charts.
+# Updates publish a new immutable, versioned snapshot, so request handlers
+# read a consistent state without locks and every response carries its
+# version. The day-by-day growth model lives in twin_engine.
+DATA_DIR = os.environ.get('TWIN_DATA', 'twin_data')
+
+# The single demo twin the dashboard at / shows
+DEFAULT_TWIN = 'demo'
+
+# Set up by create_app, so importing this module has no side effects
+history = None
+registry = None
+telemetry = None
+scheduler = None
+# Open lock file of the data directory while this process runs its scheduler
+scheduler_lock = None
+
+def claim_scheduler(data_dir):
+    """Take the data directory's scheduler lock; False if another process already holds it."""
+    global scheduler_lock
+    if fcntl is None:
+        return True
+    lock = open(os.path.join(data_dir, 'scheduler.lock'), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    scheduler_lock = lock
+    return True
+
+def create_app(data_dir=None, start_scheduler=True):
+    """
+    Open the twin stores and start the scheduler, and return the Flask app.
+    Serve it with `python Twin.py`, or under a WSGI server such as gunicorn
+    as Twin:create_app(). Every worker process serves requests, but only the
+    first one to claim the data directory runs the scheduler.
+
+    Args:
+        data_dir: Folder for twin state and history, defaults to DATA_DIR
+        start_scheduler: Start the background scheduler
+
+    Returns:
+        Flask: The app
+    """
+    global history, registry, telemetry, scheduler
+    if registry is None:
+        data_dir = data_dir or DATA_DIR
+        os.makedirs(data_dir, exist_ok=True)
+        history = TwinHistory(os.path.join(data_dir, 'history'))
+        registry = TwinRegistry(os.path.join(data_dir, 'twins.db'), history=history)
+        registry.register(DEFAULT_TWIN)
+        telemetry = TelemetryBuffer(capacity=int(os.environ.get('TWIN_TELEMETRY_CAPACITY', 128)))
+        scheduler = TwinScheduler(
+            registry,
+            seconds_per_day=float(os.environ.get('TWIN_SECONDS_PER_DAY', 60)),
+            tick_interval=float(os.environ.get('TWIN_TICK_SECONDS', 1)),
+            telemetry=telemetry
+        )
+        app.config['TWIN_DATA'] = data_dir
+    if start_scheduler and scheduler_lock is None and claim_scheduler(app.config['TWIN_DATA']):
+        scheduler.start()
+    return app
 
 # --- Simple Growth Model ---
-def simulate_growth(days_passed=1, soil_moisture=None, temperature_c=None, humidity_percent=None, nutrition_level=None):
-    global crop_twin_data
-
-    # Update parameters based on input, or use current twin data if not provided
-    current_moisture = soil_moisture if soil_moisture is not None else crop_twin_data["soil_moisture"]
-    current_temp = temperature_c if temperature_c is not None else crop_twin_data["temperature_c"]
-    current_humidity = humidity_percent if humidity_percent is not None else crop_twin_data["humidity_percent"]
-    current_nutrition = nutrition_level if nutrition_level is not None else crop_twin_data["nutrition_level"]
-
-    for _ in range(days_passed):
-        crop_twin_data["days_since_planting"] += 1
-
-        # Simulate height growth based on conditions
-        growth_factor = 1.0
-        if 50 <= current_moisture <= 80: growth_factor += 0.2
-        if 20 <= current_temp <= 30: growth_factor += 0.3
-        if 50 <= current_humidity <= 70: growth_factor += 0.1
-        if current_nutrition == "Optimal": growth_factor += 0.2
-
-        # Penalties for poor conditions
-        if current_moisture < 50 or current_moisture > 80: growth_factor -= 0.1
-        if current_temp < 20 or current_temp > 30: growth_factor -= 0.1
-        if current_nutrition != "Optimal": growth_factor -= 0.2
-
-        # Ensure growth factor doesn't go below zero
-        growth_factor = max(0.1, growth_factor)
-
-        crop_twin_data["height_cm"] += (random.uniform(0.5, 1.5) * growth_factor)
-        crop_twin_data["height_cm"] = round(crop_twin_data["height_cm"], 2)
-
-        # Simulate health score based on conditions
-        health_change = 0
-        if growth_factor < 0.8: health_change = -random.randint(1, 5)
-        elif growth_factor > 1.2: health_change = random.randint(0, 2) # Small positive for good conditions
-        else: health_change = random.randint(-1, 1) # Minor fluctuations
-
-        crop_twin_data["health_score"] = max(0, min(100, crop_twin_data["health_score"] + health_change))
-
-        # Update growth stage (very simple example)
-        if 0 <= crop_twin_data["days_since_planting"] < 10:
-            crop_twin_data["growth_stage"] = "Seedling"
-        elif 10 <= crop_twin_data["days_since_planting"] < 30:
-            crop_twin_data["growth_stage"] = "Vegetative"
-        elif 30 <= crop_twin_data["days_since_planting"] < 60:
-            crop_twin_data["growth_stage"] = "Flowering"
-        else:
-            crop_twin_data["growth_stage"] = "Fruiting/Harvest"
-
-        # Simulate sensor data fluctuations (if not controlled by user)
-        if soil_moisture is None:
-            crop_twin_data["soil_moisture"] = max(30, min(90, crop_twin_data["soil_moisture"] + random.randint(-5, 5)))
-        if temperature_c is None:
-            crop_twin_data["temperature_c"] = max(15, min(35, crop_twin_data["temperature_c"] + random.uniform(-1, 1)))
-        if humidity_percent is None:
-            crop_twin_data["humidity_percent"] = max(40, min(80, crop_twin_data["humidity_percent"] + random.randint(-3, 3)))
-        # Nutrition level could degrade over time or improve with "fertilizer" input
-        if current_nutrition == "Optimal" and random.random() < 0.1: # 10% chance to degrade
-            crop_twin_data["nutrition_level"] = random.choice(["Low N", "Low P", "Low K"])
-
-    crop_twin_data["last_updated"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def engine_inputs(soil_moisture=None, temperature_c=None, humidity_percent=None, nutrition_level=None):
+    """Engine inputs for one twin; conditions that are given hold for every simulated day."""
+    inputs = {"soil_moisture": soil_moisture, "temperature_c": temperature_c, "humidity_percent": humidity_percent}
+    inputs = {field: np.array([float(value)]) for field, value in inputs.items() if value is not None}
+    if nutrition_level in NUTRITION_LEVELS:
+        inputs["nutrition"] = np.array([NUTRITION_LEVELS.index(nutrition_level)])
+    return inputs
+
+def simulate_growth(days_passed=1, soil_moisture=None, temperature_c=None, humidity_percent=None, nutrition_level=None, trajectory=False, twin_id=DEFAULT_TWIN):
+    inputs = engine_inputs(soil_moisture, temperature_c, humidity_percent, nutrition_level)
+    snapshot, _, daily = registry.advance(days_passed, [twin_id], inputs, trajectory)
+    return snapshot, daily
+
+def request_conditions(data):
+    """Conditions from a request body, converted to numbers; missing ones fluctuate."""
+    conditions = {}
+    for field, convert in (("soil_moisture", int), ("temperature_c", float), ("humidity_percent", int)):
+        if data.get(field) is not None:
+            conditions[field] = convert(data[field])
+    conditions["nutrition_level"] = data.get("nutrition_level")
+    return conditions
 
 # --- Flask Routes ---
 
 @app.route('/')
 def index():
-    # Simulate initial growth for the first load
-    if crop_twin_data["days_since_planting"] == 0:
-        simulate_growth(days_passed=1) # Start with 1 day of growth
-    return render_template('index.html', twin_data=crop_twin_data)
+    return render_template('index.html', twin_data=registry.get(DEFAULT_TWIN))
 
 @app.route('/update_twin', methods=['POST'])
 def update_twin():
     data = request.json
-    days_to_simulate = int(data.get('days', 1))
-    soil_moisture = data.get('soil_moisture')
-    temperature_c = data.get('temperature_c')
-    humidity_percent = data.get('humidity_percent')
-    nutrition_level = data.get('nutrition_level')
-
-    # Convert to float/int if they are not None, otherwise keep as None for simulation to fluctuate
-    if soil_moisture is not None: soil_moisture = int(soil_moisture)
-    if temperature_c is not None: temperature_c = float(temperature_c)
-    if humidity_percent is not None: humidity_percent = int(humidity_percent)
-
-    simulate_growth(
-        days_passed=days_to_simulate,
-        soil_moisture=soil_moisture,
-        temperature_c=temperature_c,
-        humidity_percent=humidity_percent,
-        nutrition_level=nutrition_level
-    )
-    return jsonify(crop_twin_data)
+    snapshot, _ = simulate_growth(days_passed=int(data.get('days', 1)), **request_conditions(data))
+    return jsonify(snapshot.get(DEFAULT_TWIN))
+
+@app.route('/twins', methods=['GET'])
+def list_twins():
+    snapshot = registry.snapshot
+    return jsonify({"version": snapshot.version, "twins": snapshot.list(request.args.get('farm_id'))})
+
+@app.route('/twins', methods=['POST'])
+def register_twin():
+    data = request.json or {}
+    farm_id, plot_id = data.get('farm_id'), data.get('plot_id')
+    twin_id = data.get('twin_id') or (f"{farm_id}/{plot_id}" if farm_id and plot_id else None)
+    if not twin_id:
+        return jsonify({"error": "Give a twin_id, or a farm_id and plot_id."}), 400
+    return jsonify(registry.register(twin_id, farm_id=farm_id, plot_id=plot_id, crop=data.get('crop'))), 201
+
+@app.route('/twins/advance', methods=['POST'])
+def advance_twins():
+    # Advance every registered twin (or one farm's twins) in a single vectorized step
+    data = request.json or {}
+    farm_id = data.get('farm_id')
+    twin_ids = None if farm_id is None else [twin["twin_id"] for twin in registry.list(farm_id)]
+    snapshot, advanced, _ = registry.advance(int(data.get('days', 1)), twin_ids)
+    return jsonify({"advanced": len(advanced), "version": snapshot.version})
+
+@app.route('/twin/<path:twin_id>', methods=['GET'])
+def get_twin(twin_id):
+    twin = registry.get(twin_id)
+    if twin is None:
+        return jsonify({"error": "Twin not found."}), 404
+    return jsonify(twin)
+
+@app.route('/twin/<path:twin_id>/update', methods=['POST'])
+def update_one_twin(twin_id):
+    if twin_id not in registry:
+        return jsonify({"error": "Twin not found."}), 404
+    data = request.json or {}
+    snapshot, _ = simulate_growth(days_passed=int(data.get('days', 1)), twin_id=twin_id, **request_conditions(data))
+    return jsonify(snapshot.get(twin_id))
+
+@app.route('/twin/<path:twin_id>/history', methods=['GET'])
+def twin_history(twin_id):
+    # Days since planting from..to, averaged into one point per step days
+    start = request.args.get('from', type=int)
+    end = request.args.get('to', type=int)
+    step = max(request.args.get('step', 1, type=int), 1)
+    samples = history.query(twin_id, start, end, step)
+    if samples is None:
+        return jsonify({"error": "Twin not found."}), 404
+    return jsonify({"twin_id": twin_id, "from": start, "to": end, "step": step, **samples})
+
+@app.route('/telemetry', methods=['POST'])
+def ingest_telemetry():
+    # JSON lines of sensor records, or {"messages": [{"topic": "twins/<id>/<sensor>", "payload": ...}]}
+    snapshot = registry.snapshot
+    try:
+        if request.mimetype == 'application/json':
+            messages = request.get_json()['messages']
+            accepted, rejected = telemetry.ingest_messages(
+                ((message['topic'], message['payload']) for message in messages), known=snapshot
+            )
+        else:
+            accepted, rejected = telemetry.ingest_records(parse_json_lines(request.get_data(as_text=True)), known=snapshot)
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Send JSON lines of readings, or a JSON object with a messages list."}), 400
+    return jsonify({"accepted": accepted, "rejected": rejected})
 
 @app.route('/ai_analysis', methods=['POST'])
 def ai_analysis():
     # This is where you would integrate with a real AI model (e.g., Google Gemini)
     # For this demo, it's a simple rule-based analysis.
-    current_health = crop_twin_data["health_score"]
-    current_nutrition = crop_twin_data["nutrition_level"]
-    current_moisture = crop_twin_data["soil_moisture"]
-    current_temp = crop_twin_data["temperature_c"]
+    twin_data = registry.get(DEFAULT_TWIN)
+    current_health = twin_data["health_score"]
+    current_nutrition = twin_data["nutrition_level"]
+    current_moisture = twin_data["soil_moisture"]
+    current_temp = twin_data["temperature_c"]
 
     analysis_report = "Based on the digital twin's current state:\n"
 
@@ -142,7 +213,7 @@ def ai_analysis():
 
     analysis_report += "\n\nFor a real system, an image upload would trigger a more detailed visual analysis by an AI model like Google Gemini's Vision capabilities."
 
-    return jsonify({"analysis": analysis_report})
+    return jsonify({"analysis": analysis_report, "version": twin_data["version"]})
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=81) # Replit uses port 81 by default for Flask
+    create_app().run(host='0.0.0.0', port=81) # Replit uses port 81 by default for Flask
@@ -0,0 +1,446 @@
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
+from PIL import Image
+import datetime
+import json
+import logging
+import os
+import queue
+import re
+import threading
+
+from chunked_upload import UploadStore, UploadError
+from crop_database import find_crop, get_crop_database
+from image_analyzer import ImageAnalyzer
+from job_queue import JobQueue, WorkerPool
+from voice_processor import VoiceProcessor
+
+app = Flask(__name__)
+
+# --- Storage ---
+# Requests and their jobs live in one SQLite file so both survive a restart
+DATA_DIR = os.environ.get('AGRI_MITHRA_DATA', 'agri_mithra_data')
+UPLOAD_DIR = os.path.join(DATA_DIR, 'uploads')
+DB_PATH = os.path.join(DATA_DIR, 'agri_mithra.db')
+PAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'htmlvoice.py')
+
+# Request statuses shown by the front end
+STATUS_PENDING = 'Pending'
+STATUS_IMAGE_REQUESTED = 'Pending - Image Requested'
+STATUS_IMAGE_RECEIVED = 'Image Received - Analyzing'
+STATUS_COMPLETED = 'Completed - Response Sent'
+STATUS_FAILED = 'Completed - Could Not Process'
+
+# Every insert or update stamps the request with the next list version, so
+# clients can ask for just the requests changed since the version they hold.
+# The subquery runs inside the write statement, so versions never repeat.
+NEXT_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM support_requests)"
+
+ADDED_COLUMNS = {
+    'version': 'INTEGER NOT NULL DEFAULT 0',
+    'audio_upload_id': 'TEXT',
+    'image_upload_id': 'TEXT'
+}
+
+# Form language codes mapped to voice processor languages; the other form
+# languages are auto-detected by the speech model and answered in English
+LANGUAGE_NAMES = {'en': 'English', 'hi': 'Hindi', 'ta': 'Tamil', 'te': 'Telugu', 'kn': 'Kannada'}
+
+# Problems that need a photo of the crop before we can answer
+IMAGE_KEYWORDS = re.compile(
+    r'disease|pest|insect|worm|fung|spot|yellow|wilt|rot|blight|leaf|leaves'
+    r'|रोग|कीड़|कीट|पत्त|நோய்|பூச்சி|இலை|తెగులు|పురుగు|ఆకు|ರೋಗ|ಕೀಟ|ಎಲೆ'
+)
+
+
+class RequestStore:
+    def __init__(self, job_queue):
+        self.job_queue = job_queue
+        self.job_queue.connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS support_requests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                contact TEXT NOT NULL,
+                language TEXT NOT NULL,
+                status TEXT NOT NULL,
+                problem TEXT,
+                details TEXT,
+                audio_path TEXT,
+                image_path TEXT,
+                requires_image INTEGER NOT NULL DEFAULT 0,
+                image_uploaded INTEGER NOT NULL DEFAULT 0,
+                solution_sent TEXT,
+                submitted_at TEXT NOT NULL,
+                completed_at TEXT,
+                version INTEGER NOT NULL DEFAULT 0,
+                audio_upload_id TEXT,
+                image_upload_id TEXT
+            )
+            """
+        )
+        # Columns added after the first release, for databases created before them
+        columns = [column['name'] for column in self.job_queue.connection().execute("PRAGMA table_info(support_requests)")]
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in columns:
+                self.job_queue.connection().execute(f"ALTER TABLE support_requests ADD COLUMN {column} {definition}")
+        self.job_queue.connection().execute(
+            "CREATE INDEX IF NOT EXISTS support_requests_version ON support_requests (version)"
+        )
+
+    def create(self, contact, language):
+        cursor = self.job_queue.connection().execute(
+            f"""
+            INSERT INTO support_requests (contact, language, status, problem, submitted_at, version)
+            VALUES (?, ?, ?, ?, ?, {NEXT_VERSION})
+            """,
+            (contact, language, STATUS_PENDING, 'Transcribing audio...', _now())
+        )
+        return cursor.lastrowid
+
+    def get(self, request_id):
+        row = self.job_queue.connection().execute(
+            "SELECT * FROM support_requests WHERE id = ?", (request_id,)
+        ).fetchone()
+        return _to_dict(row) if row else None
+
+    def list(self, since=0):
+        """Requests changed after the given version, newest first."""
+
+        rows = self.job_queue.connection().execute(
+            "SELECT * FROM support_requests WHERE version > ? ORDER BY id DESC", (since,)
+        )
+        return [_to_dict(row) for row in rows]
+
+    def latest_version(self):
+        return self.job_queue.connection().execute(
+            "SELECT COALESCE(MAX(version), 0) FROM support_requests"
+        ).fetchone()[0]
+
+    def update(self, request_id, **fields):
+        """Update a request and push the new state to every connected browser."""
+
+        assignments = ', '.join(f'{field} = ?' for field in fields)
+        self.job_queue.connection().execute(
+            f"UPDATE support_requests SET {assignments}, version = {NEXT_VERSION} WHERE id = ?",
+            (*fields.values(), request_id)
+        )
+        updated = self.get(request_id)
+        events.publish(updated)
+        return updated
+
+
+class EventBroadcaster:
+    def __init__(self, backlog=100):
+        self.backlog = backlog
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=self.backlog)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # A stalled browser is dropped; it reloads the list when it reconnects
+                self.unsubscribe(subscriber)
+
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _to_dict(row):
+    data = dict(row)
+    data['requires_image'] = bool(data['requires_image'])
+    data['image_uploaded'] = bool(data['image_uploaded'])
+    data['details'] = json.loads(data['details']) if data['details'] else None
+    # Server file paths and upload ids are not for the browser
+    for field in ('audio_path', 'image_path', 'audio_upload_id', 'image_upload_id'):
+        del data[field]
+    return data
+
+
+def _public_upload(session):
+    return {key: session[key] for key in ('upload_id', 'size', 'offset', 'complete')}
+
+
+def log_message(contact, message):
+    """Default message sender: logs the SMS/WhatsApp message a gateway would deliver."""
+
+    app.logger.info("SMS to %s: %s", contact, message)
+
+
+# Set up by create_app, so importing this module has no side effects
+job_queue = None
+events = None
+store = None
+uploads = None
+voice_processor = None
+image_analyzer = None
+crop_database = None
+workers = None
+send_message = log_message
+
+
+# --- Pipeline Jobs ---
+# Each stage is its own job so a failed stage is retried without redoing the others
+
+def transcribe_job(payload):
+    request_id = payload['request_id']
+    row = job_queue.connection().execute(
+        "SELECT language, audio_path FROM support_requests WHERE id = ?", (request_id,)
+    ).fetchone()
+    try:
+        problem = voice_processor.transcriber.transcribe(row['audio_path'], LANGUAGE_NAMES.get(row['language']))
+    except ImportError:
+        problem = ''
+    store.update(request_id, problem=problem or 'Audio received (could not transcribe, an agent will listen to it)')
+    workers.submit('extract', {'request_id': request_id})
+
+
+def extract_job(payload):
+    request_id = payload['request_id']
+    support_request = store.get(request_id)
+    language = LANGUAGE_NAMES.get(support_request['language'], 'English')
+    details = voice_processor.process_voice_input(support_request['problem'], language)
+
+    if IMAGE_KEYWORDS.search(support_request['problem'].lower()):
+        store.update(request_id, details=json.dumps(details), requires_image=1, status=STATUS_IMAGE_REQUESTED)
+        send_message(support_request['contact'], "Please upload a clear photo of your crop so we can guide you precisely.")
+    else:
+        store.update(request_id, details=json.dumps(details))
+        workers.submit('respond', {'request_id': request_id})
+
+
+def respond_job(payload):
+    request_id = payload['request_id']
+    support_request = store.get(request_id)
+    image_path = job_queue.connection().execute(
+        "SELECT image_path FROM support_requests WHERE id = ?", (request_id,)
+    ).fetchone()['image_path']
+    language = LANGUAGE_NAMES.get(support_request['language'], 'English')
+    headers = voice_processor.generate_response(None, language)
+    details = support_request['details'] or {}
+
+    lines = [headers['greeting']]
+    crop = find_crop(crop_database, details.get('crop_preference') or '')
+    if crop:
+        lines.append(f"{headers['tips']} " + '; '.join(crop['growing_tips'][:2]))
+    if image_path:
+        with Image.open(image_path) as image:
+            analysis = image_analyzer.analyze_land_image(image, language, segment=True)
+            assessment = image_analyzer.get_visual_assessment(image, language, analysis['land_analysis'])
+        lines.extend(assessment.values())
+        zones = analysis['segmentation']['class_stats']
+        lines.append(', '.join(f"{name.replace('_', ' ')}: {stats['fraction']:.0%}" for name, stats in zones.items() if stats['zones']))
+    if len(lines) == 1:
+        lines.append("An agronomist will call you back shortly with detailed guidance.")
+
+    solution = '\n'.join(lines)
+    store.update(request_id, solution_sent=solution, status=STATUS_COMPLETED, completed_at=_now())
+    send_message(support_request['contact'], solution)
+
+
+def attach_upload(upload_id):
+    """Start processing every request waiting for a finished upload."""
+
+    path = uploads.path(upload_id)
+    connection = job_queue.connection()
+    for row in connection.execute(
+        "SELECT id FROM support_requests WHERE audio_upload_id = ? AND audio_path IS NULL", (upload_id,)
+    ).fetchall():
+        store.update(row['id'], audio_path=path, problem='Transcribing audio...')
+        workers.submit('transcribe', {'request_id': row['id']})
+    for row in connection.execute(
+        "SELECT id FROM support_requests WHERE image_upload_id = ? AND image_uploaded = 0", (upload_id,)
+    ).fetchall():
+        store.update(row['id'], image_path=path, image_uploaded=1, status=STATUS_IMAGE_RECEIVED)
+        workers.submit('respond', {'request_id': row['id']})
+
+
+def job_failed(job, error):
+    store.update(job['payload']['request_id'], status=STATUS_FAILED, completed_at=_now())
+
+
+def create_app(sender=None, start_workers=True):
+    """
+    Create the storage, models and job workers, and return the Flask app.
+    Serve it with `python agri_mithra.py`, or under a WSGI server as
+    agri_mithra:create_app().
+
+    Args:
+        sender: Optional callable(contact, message) delivering messages to
+                farmers; defaults to log_message
+        start_workers: Start the job worker threads
+
+    Returns:
+        Flask: The app
+    """
+
+    global job_queue, events, store, uploads, voice_processor, image_analyzer, crop_database, workers, send_message
+    if sender is not None:
+        send_message = sender
+    if app.logger.level == logging.NOTSET:
+        app.logger.setLevel(logging.INFO)
+    if workers is not None:
+        return app
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    job_queue = JobQueue(DB_PATH)
+    events = EventBroadcaster()
+    store = RequestStore(job_queue)
+    uploads = UploadStore(job_queue, UPLOAD_DIR)
+    voice_processor = VoiceProcessor()
+    image_analyzer = ImageAnalyzer()
+    crop_database = get_crop_database()
+    workers = WorkerPool(
+        job_queue,
+        {'transcribe': transcribe_job, 'extract': extract_job, 'respond': respond_job},
+        workers=int(os.environ.get('AGRI_MITHRA_WORKERS', 4)),
+        on_failure=job_failed
+    )
+    if start_workers:
+        workers.start()
+    return app
+
+
+# --- Flask Routes ---
+
+@app.route('/')
+def index():
+    return send_file(PAGE_PATH, mimetype='text/html')
+
+@app.route('/submit_audio_query', methods=['POST'])
+def submit_audio_query():
+    # The audio comes either as a chunked upload started with /uploads (upload_id)
+    # or, for simple clients, as a whole file in the form
+    audio = request.files.get('audio')
+    upload_id = request.form.get('upload_id', '').strip()
+    contact = request.form.get('contact', '').strip()
+    language = request.form.get('language', '').strip()
+    if not (upload_id or (audio and audio.filename)) or not contact or not language:
+        return jsonify({"message": "Audio file, contact and language are required."}), 400
+    if upload_id:
+        uploads.get(upload_id)
+
+    request_id = store.create(contact, language)
+    if upload_id:
+        # Processing starts as soon as the last chunk arrives, or now if the
+        # server already had this exact recording
+        store.update(request_id, audio_upload_id=upload_id, problem='Receiving audio...')
+        if uploads.path(upload_id):
+            attach_upload(upload_id)
+    else:
+        extension = os.path.splitext(audio.filename)[1].lower()[:8]
+        audio_path = os.path.join(UPLOAD_DIR, f'{request_id}_audio{extension}')
+        audio.save(audio_path)
+        store.update(request_id, audio_path=audio_path)
+        workers.submit('transcribe', {'request_id': request_id})
+
+    return jsonify({"message": f"Your problem was received (request {request_id}).", "request_id": request_id})
+
+@app.route('/get_requests')
+def get_requests():
+    # ?since=<version> returns only requests changed after that version; the
+    # ETag is the latest version, so an unchanged list costs a bare 304
+    etag = str(store.latest_version())
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+
+    response = jsonify(store.list(request.args.get('since', 0, type=int)))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/upload_image_for_request/<int:request_id>', methods=['POST'])
+def upload_image_for_request(request_id):
+    image = request.files.get('image')
+    upload_id = request.form.get('upload_id', '').strip()
+    support_request = store.get(request_id)
+    if support_request is None:
+        return jsonify({"message": "Request not found."}), 404
+    if not upload_id and not (image and image.filename):
+        return jsonify({"message": "Please attach an image."}), 400
+
+    if upload_id:
+        uploads.get(upload_id)
+        store.update(request_id, image_upload_id=upload_id)
+        if uploads.path(upload_id):
+            attach_upload(upload_id)
+        return jsonify({"message": "Image upload started. Analysis begins when it finishes."})
+
+    extension = os.path.splitext(image.filename)[1].lower()[:8]
+    image_path = os.path.join(UPLOAD_DIR, f'{request_id}_image{extension}')
+    image.save(image_path)
+    store.update(request_id, image_path=image_path, image_uploaded=1, status=STATUS_IMAGE_RECEIVED)
+    workers.submit('respond', {'request_id': request_id})
+
+    return jsonify({"message": "Image received. Analyzing your crop now."})
+
+# --- Chunked Uploads ---
+# POST /uploads declares a file by size and SHA-256 and returns the offset to
+# send from (the whole size if the server already has it); each PATCH then
+# carries the next chunk with its Upload-Offset, streamed straight to disk.
+
+@app.route('/uploads', methods=['POST'])
+def create_upload():
+    data = request.get_json(silent=True) or {}
+    session = uploads.create(data.get('filename'), int(data.get('size') or 0), data.get('sha256'))
+    return jsonify(_public_upload(session))
+
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    return jsonify(_public_upload(uploads.get(upload_id)))
+
+@app.route('/uploads/<upload_id>', methods=['PATCH'])
+def upload_chunk(upload_id):
+    offset = request.headers.get('Upload-Offset', type=int)
+    if offset is None:
+        return jsonify({"message": "Upload-Offset header is required."}), 400
+
+    was_complete = uploads.get(upload_id)['complete']
+    session = uploads.write_chunk(upload_id, offset, request.stream)
+    if session['complete'] and not was_complete:
+        attach_upload(upload_id)
+    return jsonify(_public_upload(session))
+
+@app.errorhandler(UploadError)
+def upload_error(error):
+    return jsonify({"message": str(error), "offset": error.offset}), error.status
+
+@app.route('/events')
+def request_events():
+    # Server-sent events: each request is pushed once per status change instead
+    # of every browser polling the full list
+    def stream():
+        subscriber = events.subscribe()
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f'data: {json.dumps(event)}\n\n'
+        finally:
+            events.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+if __name__ == '__main__':
+    create_app().run(host='0.0.0.0', port=81, threaded=True)
@@ -3,11 +3,14 @@ import pandas as pd
 from crop_database import get_crop_database
 from recommendation_engine import CropRecommendationEngine
 from image_analyzer import ImageAnalyzer
-from voice_processor import VoiceProcessor
+from voice_processor import VoiceProcessor, CARE_ADVICE
 from economic_advisor import EconomicAdvisor
 import base64
 from PIL import Image
 import io
+import os
+import shutil
+import tempfile
 import streamlit as st
 
 st.set_page_config(page_title="Farmer Planner App", page_icon="🌱")
@@ -27,7 +30,12 @@ def load_image_analyzer():
 
 @st.cache_resource
 def load_voice_processor():
-    return VoiceProcessor()
+    processor = VoiceProcessor()
+    # Load the offline speech model once per process so the first voice note is fast
+    processor.warm_up_speech_model()
+    # Synthesize common response phrases once, so spoken replies are just joined clips
+    processor.prerender_common_phrases()
+    return processor
 
 @st.cache_resource
 def load_economic_advisor():
@@ -66,7 +74,9 @@ def get_translations():
             'why_crop': 'Why this crop?',
             'growing_tips': 'Growing Tips',
             'budget_breakdown': 'Budget Breakdown',
-            'total_cost': 'Total cost for top 3 crops',
+            'total_cost': 'Cost of this planting plan',
+            'max_crop_share': 'Most land for any one crop (%)',
+            'plan_profit': 'Expected profit',
             'your_budget': 'Your budget',
             'can_afford': 'You can afford these crops!',
             'budget_warning': 'Consider fewer crops or cheaper options.',
@@ -106,7 +116,9 @@ def get_translations():
             'why_crop': 'यह फसल क्यों?',
             'growing_tips': 'उगाने की सलाह',
             'budget_breakdown': 'बजट विवरण',
-            'total_cost': 'टॉप 3 फसलों की कुल लागत',
+            'total_cost': 'इस बुवाई योजना की लागत',
+            'max_crop_share': 'एक फसल के लिए अधिकतम जमीन (%)',
+            'plan_profit': 'अपेक्षित लाभ',
             'your_budget': 'आपका बजट',
             'can_afford': 'आप इन फसलों को उगा सकते हैं!',
             'budget_warning': 'कम फसलें या सस्ते विकल्प चुनें।',
@@ -146,7 +158,9 @@ def get_translations():
             'why_crop': 'இந்த பயிர் ஏன்?',
             'growing_tips': 'வளர்ப்பு குறிப்புகள்',
             'budget_breakdown': 'பட்ஜெட் விவரம்',
-            'total_cost': 'முதல் 3 பயிர்களின் மொத்த செலவு',
+            'total_cost': 'இந்த நடவு திட்டத்தின் செலவு',
+            'max_crop_share': 'ஒரு பயிருக்கு அதிகபட்ச நிலம் (%)',
+            'plan_profit': 'எதிர்பார்க்கப்படும் லாபம்',
             'your_budget': 'உங்கள் பட்ஜெட்',
             'can_afford': 'நீங்கள் இந்த பயிர்களை வளர்க்க முடியும்!',
             'budget_warning': 'குறைவான பயிர்கள் அல்லது மலிவான விருப்பங்களைக் கருத்தில் கொள்ளுங்கள்.',
@@ -186,7 +200,9 @@ def get_translations():
             'why_crop': 'ఈ పంట ఎందుకు?',
             'growing_tips': 'పెరుగుదల చిట్కాలు',
             'budget_breakdown': 'బడ్జెట్ వివరణ',
-            'total_cost': 'టాప్ 3 పంటల మొత్తం ఖర్చు',
+            'total_cost': 'ఈ సాగు ప్రణాళిక ఖర్చు',
+            'max_crop_share': 'ఒక పంటకు గరిష్ఠ భూమి (%)',
+            'plan_profit': 'అంచనా లాభం',
             'your_budget': 'మీ బడ్జెట్',
             'can_afford': 'మీరు ఈ పంటలను పెంచగలరు!',
             'budget_warning': 'తక్కువ పంటలు లేదా తక్కువ ఖర్చైన ఎంపికలను పరిగణించండి.',
@@ -452,16 +468,36 @@ def main():
                                 st.session_state.step = 'economic_input'
                                 st.rerun()
                     
-                    # Budget breakdown
+                    # Budget breakdown: best split of the land and budget across the suitable crops
                     st.subheader(f"💵 {t['budget_breakdown']}")
-                    total_cost = sum(crop['cost_per_acre'] for crop in recommendations['suitable_crops'][:3])
+                    crop_names = [crop['name'] for crop in recommendations['suitable_crops']]
+                    # Keep the optimizer between reruns so moving the slider re-solves from a warm start
+                    optimizer = st.session_state.get('allocation_optimizer')
+                    if optimizer is None or optimizer.crops != crop_names:
+                        optimizer = load_economic_advisor().allocation_optimizer(crop_names)
+                        st.session_state.allocation_optimizer = optimizer
+                    
+                    max_crop_share = st.slider(t['max_crop_share'], min_value=20, max_value=100, value=50, step=10)
+                    plan = optimizer.solve(
+                        [farm_details['land_size']],
+                        [farm_details['soil_type']],
+                        budget=farm_details['budget'],
+                        max_crop_share=max_crop_share / 100
+                    )
+                    for name, acres in plan['acres_by_crop'].items():
+                        if acres > 0:
+                            st.write(f"• **{name}:** {acres:.2f} {t['acres']}")
+                    
+                    total_cost = plan['usage']['budget']
                     st.write(f"**{t['total_cost']}:** {currency_symbol}{total_cost:.2f}")
+                    st.write(f"**{t['plan_profit']}:** {currency_symbol}{plan['profit']:,.0f}")
                     st.write(f"**{t['your_budget']}:** {currency_symbol}{farm_details['budget']}")
                     
-                    if total_cost <= farm_details['budget']:
-                        st.success(f"✅ {t['can_afford']}")
-                    else:
+                    # Land left unplanted because the money ran out
+                    if 'budget' in plan['binding'] and plan['fallow_acres'] > 0.01:
                         st.warning(f"⚠️ {t['budget_warning']}")
+                    else:
+                        st.success(f"✅ {t['can_afford']}")
                         
                 else:
                     st.warning(t['no_crops'])
@@ -508,8 +544,8 @@ def main():
                 analyzer = load_image_analyzer()
                 
                 with st.spinner("Analyzing your land photo..."):
-                    analysis_result = analyzer.analyze_land_image(image, lang)
-                    visual_assessment = analyzer.get_visual_assessment(image, lang)
+                    analysis_result = analyzer.analyze_land_image(image, lang, segment=True)
+                    visual_assessment = analyzer.get_visual_assessment(image, lang, analysis_result['land_analysis'])
                 
                 # Display analysis results
                 st.success("Analysis Complete!")
@@ -534,6 +570,14 @@ def main():
                     st.write(f"**Sunlight:** {land_analysis['sunlight']}")
                     st.write(f"**Suitability Score:** {land_analysis['suitability_score']}/10")
                 
+                # Field zones
+                st.subheader("🗺️ Field Zones")
+                zone_stats = analysis_result['segmentation']['class_stats']
+                zone_cols = st.columns(len(zone_stats))
+                for zone_col, (zone_name, stats) in zip(zone_cols, zone_stats.items()):
+                    with zone_col:
+                        st.metric(zone_name.replace('_', ' ').title(), f"{stats['fraction'] * 100:.0f}%")
+                
                 # Recommendations
                 st.subheader("🌱 Crop Recommendations")
                 recommendations = analysis_result['recommendations']
@@ -590,9 +634,38 @@ def main():
         
         st.info(instructions.get(lang, instructions['English']))
         
+        # Voice note upload, transcribed offline with partial results shown as they arrive
+        voice_note = st.file_uploader(
+            "Or upload a voice note:",
+            type=['wav', 'mp3', 'm4a', 'ogg', 'flac']
+        )
+        
+        transcript = ""
+        if voice_note is not None and st.session_state.get('voice_note_id') == voice_note.file_id:
+            # Already transcribed on an earlier rerun
+            transcript = st.session_state.voice_note_transcript
+        elif voice_note is not None:
+            processor = load_voice_processor()
+            suffix = os.path.splitext(voice_note.name)[1]
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as audio_file:
+                shutil.copyfileobj(voice_note, audio_file)
+            
+            transcript_placeholder = st.empty()
+            try:
+                for partial in processor.transcribe_voice_note(audio_file.name, lang):
+                    transcript_placeholder.info(f"🎤 {partial['transcript']}")
+                    transcript = partial['transcript']
+            except ImportError as error:
+                st.warning(str(error))
+            finally:
+                os.remove(audio_file.name)
+            st.session_state.voice_note_id = voice_note.file_id
+            st.session_state.voice_note_transcript = transcript
+        
         # Text input area
         user_input = st.text_area(
             "Enter your farm details:",
+            value=transcript,
             height=150,
             placeholder="Describe your land, soil type, preferred crops, season, budget, etc."
         )
@@ -602,16 +675,17 @@ def main():
             
             with st.spinner("Processing your input..."):
                 # Process voice/text input
-                extracted_info = processor.process_voice_input(user_input, lang)
+                filled = processor.fill_slots(user_input, lang)
+                extracted_info = filled['slots']
                 
                 # Generate recommendations based on extracted info
                 engine = load_recommendation_engine()
                 
-                # Use extracted info or defaults
-                land_size = extracted_info.get('land_size', 1.0)
-                soil_type = extracted_info.get('soil_type', 'Loamy')
-                season = extracted_info.get('season', 'Summer')
-                budget = 5000 if lang in ['Hindi', 'Tamil', 'Telugu'] else 500
+                # Use extracted info or defaults (land size is in acres, budget in rupees)
+                land_size = extracted_info.get('land_size') or 1.0
+                soil_type = extracted_info.get('soil_type') or 'Loamy'
+                season = extracted_info.get('season') or 'Summer'
+                budget = extracted_info.get('budget') or (5000 if lang in ['Hindi', 'Tamil', 'Telugu'] else 500)
                 
                 recommendations = engine.get_recommendations(
                     land_size=land_size,
@@ -638,8 +712,13 @@ def main():
             with col2:
                 st.write(f"**Season:** {extracted_info.get('season', 'Not specified')}")
                 st.write(f"**Location:** {extracted_info.get('location', 'Not specified')}")
+                st.write(f"**Budget:** {extracted_info.get('budget') or 'Not specified'}")
                 st.write(f"**Language:** {extracted_info.get('language', lang)}")
             
+            # Ask about what was missing or unclear; defaults are used meanwhile
+            if filled['questions']:
+                st.info("\n\n".join(f"❓ {question}" for question in filled['questions']))
+            
             # Show recommendations
             if recommendations['suitable_crops']:
                 st.subheader(f"🌱 {response_templates['crop_suggestion']}")
@@ -653,33 +732,34 @@ def main():
                 
                 # Daily care recommendations
                 st.subheader(f"📅 {response_templates['care_schedule']}")
-                daily_care = [
-                    "Water plants early morning (6-8 AM)",
-                    "Check for pests and diseases",
-                    "Remove weeds regularly",
-                    "Monitor soil moisture"
-                ]
-                for care in daily_care:
+                for care in CARE_ADVICE['care_schedule']:
                     st.write(f"• {care}")
                 
                 # Water and fertilizer info
                 col1, col2 = st.columns(2)
                 with col1:
                     st.subheader(f"💧 {response_templates['water_info']}")
-                    st.write("• 2-3 liters per plant per day")
-                    st.write("• Water early morning or evening")
-                    st.write("• Check soil moisture before watering")
+                    for advice in CARE_ADVICE['water_info']:
+                        st.write(f"• {advice}")
                 
                 with col2:
                     st.subheader(f"🌾 {response_templates['fertilizer_info']}")
-                    st.write("• Use organic compost monthly")
-                    st.write("• Apply NPK fertilizer bi-weekly")
-                    st.write("• Add cow dung before planting")
+                    for advice in CARE_ADVICE['fertilizer_info']:
+                        st.write(f"• {advice}")
                 
                 # General tips
                 st.subheader(f"💡 {response_templates['tips']}")
                 for tip in recommendations['general_tips']:
                     st.write(f"• {tip}")
+                
+                # Spoken version for farmers who prefer listening
+                try:
+                    spoken = processor.compose_spoken_response(recommendations, lang)
+                    audio = processor.speak_response(spoken, lang)
+                    st.subheader("🔊 Listen")
+                    st.audio(audio, format='audio/wav')
+                except RuntimeError:
+                    st.caption("Install espeak-ng to hear these recommendations read aloud.")
             
             else:
                 st.warning("No suitable crops found based on your input. Please provide more details.")
@@ -814,6 +894,39 @@ def main():
                 else:
                     st.error(f"⚠️ Expected Loss: ₹{abs(profit_loss):,} ({abs(profit_percentage):.1f}%)")
                 
+                # Risk outlook: how the profit could vary with yield, price and cost swings
+                st.subheader("🎲 Risk Outlook")
+                risk = advisor.simulate_profit(crop['name'], total_budget, total_turnover)[0]
+                
+                risk_col1, risk_col2, risk_col3, risk_col4 = st.columns(4)
+                with risk_col1:
+                    st.metric("Chance of Loss", f"{risk['probability_of_loss']:.0%}")
+                with risk_col2:
+                    st.metric("Bad Year (1 in 20)", f"₹{risk['quantiles'][0.05]:,.0f}")
+                with risk_col3:
+                    st.metric("Typical Profit", f"₹{risk['quantiles'][0.5]:,.0f}")
+                with risk_col4:
+                    st.metric("Good Year (1 in 20)", f"₹{risk['quantiles'][0.95]:,.0f}")
+                
+                if risk['expected_shortfall'] < 0:
+                    st.warning(f"In the worst 5% of seasons the average loss is ₹{abs(risk['expected_shortfall']):,.0f}. "
+                               "Crop insurance (PMFBY) can cover part of this.")
+                
+                # Price outlook from the local price history, when prices have been ingested
+                trend = advisor.price_trend(crop['name'], location)
+                if trend:
+                    st.subheader("📈 Price Trend")
+                    trend_col1, trend_col2, trend_col3 = st.columns(3)
+                    with trend_col1:
+                        st.metric("Current Price (per quintal)", f"₹{trend['current']:,.0f}")
+                    with trend_col2:
+                        st.metric(f"In {trend['horizon']} Days", f"₹{trend['forecast']:,.0f}",
+                                  f"{trend['change_percent']:+.1f}%")
+                    with trend_col3:
+                        st.metric("Likely Range", f"₹{trend['low']:,.0f} – ₹{trend['high']:,.0f}")
+                    st.caption(f"Prices as of {trend['as_of']} from " +
+                               ", ".join(market['market'] for market in trend['markets']))
+                
                 # Cost breakdown
                 st.subheader("💸 Cost Breakdown")
                 cost_breakdown = economic_analysis['cost_breakdown']
@@ -877,24 +990,37 @@ def main():
                 # Alternative crops if profit is low
                 if profit_percentage < 20:
                     st.subheader("🌿 Alternative Crop Suggestions")
-                    alternatives = advisor.get_alternative_crops(crop['name'], location, lang)
+                    farm_details = st.session_state.get('farm_details', {})
+                    alternatives = advisor.get_alternative_crops(
+                        crop['name'], location, lang,
+                        season=farm_details.get('season'),
+                        soil_type=farm_details.get('soil_type')
+                    )
+                    
+                    def alternative_line(alt):
+                        if alt['gain'] is None:
+                            return f"• {alt['name']} (₹{alt['margin']:,.0f}/acre)"
+                        return f"• {alt['name']} (+₹{alt['gain']:,.0f}/acre)"
                     
                     alt_col1, alt_col2, alt_col3 = st.columns(3)
                     
                     with alt_col1:
                         st.write("**High-Value Crops:**")
                         for alt in alternatives['high_value']:
-                            st.write(f"• {alt}")
+                            st.write(alternative_line(alt))
                     
                     with alt_col2:
                         st.write("**Medium-Value Crops:**")
                         for alt in alternatives['medium_value']:
-                            st.write(f"• {alt}")
+                            st.write(alternative_line(alt))
                     
                     with alt_col3:
                         st.write("**Safe Options:**")
                         for alt in alternatives['safe_options']:
-                            st.write(f"• {alt}")
+                            st.write(alternative_line(alt))
+                    
+                    if not any(alternatives.values()):
+                        st.info(f"{crop['name']} already has the best expected margin for your farm.")
                 
                 # Contact information
                 st.subheader("📞 Need More Help?")
@@ -0,0 +1,291 @@
+"""
+Acreage and budget allocation across candidate crops and plots.
+The allocation is a linear program over the acres of each crop on each group
+of plots with the same soil, limited by the land of every group, the budget,
+water, labour and risk, and each crop's acreage bounds. It is solved with a
+small dense simplex. The optimal basis is kept as a warm start, so re-solving
+after a limit changes usually takes a few dual simplex pivots.
+"""
+
+import numpy as np
+
+# Seasonal irrigation in acre-inches and labour in person-days per acre, by
+# the catalogue's water needs and difficulty
+WATER_PER_ACRE = {'Low': 12.0, 'Moderate': 20.0, 'High': 30.0}
+LABOUR_DAYS_PER_ACRE = {'Easy': 25.0, 'Medium': 40.0, 'Hard': 60.0}
+
+# Limited resources, in the column order of the per-acre resource matrix
+RESOURCES = ['budget', 'water', 'labour', 'risk']
+
+# Tolerance of the simplex on scaled rows and objectives
+EPSILON = 1e-9
+
+
+def _pivot(tableau, row, column):
+    """Make a column basic in a row, eliminating it from every other row."""
+
+    tableau[row] /= tableau[row, column]
+    factors = tableau[:, column].copy()
+    factors[row] = 0.0
+    tableau -= np.outer(factors, tableau[row])
+
+
+def _improving(reduced):
+    """
+    Columns that raise the first objective, or the second one without
+    lowering the first, from the two rows of reduced costs.
+    """
+
+    return (reduced[0] > EPSILON) | ((reduced[0] >= -EPSILON) & (reduced[1] > EPSILON))
+
+
+def _primal_simplex(tableau, basis, max_pivots):
+    """
+    Primal simplex from a feasible basis until no column improves. Entering
+    columns have the largest reduced cost, except after a step that did not
+    move, when Bland's rule keeps degenerate pivots from cycling.
+
+    Returns:
+        int: Pivots taken
+    """
+
+    pivots, degenerate = 0, False
+    while pivots < max_pivots:
+        reduced = tableau[-2:, :-1]
+        improving = np.flatnonzero(_improving(reduced))
+        if not len(improving):
+            break
+        if degenerate:
+            column = improving[0]
+        elif reduced[0, improving].max() > EPSILON:
+            column = improving[np.argmax(reduced[0, improving])]
+        else:
+            column = improving[np.argmax(reduced[1, improving])]
+
+        entries = tableau[:-2, column]
+        rows = np.flatnonzero(entries > EPSILON)
+        if not len(rows):
+            break
+        ratios = tableau[rows, -1] / entries[rows]
+        ties = rows[ratios <= ratios.min() + EPSILON]
+        row = ties[np.argmin(basis[ties])]
+        degenerate = ratios.min() <= EPSILON
+        _pivot(tableau, row, column)
+        basis[row] = column
+        pivots += 1
+    return pivots
+
+
+def _dual_simplex(tableau, basis, max_pivots):
+    """
+    Dual simplex from a basis that is optimal but no longer feasible, which
+    is what a warm start becomes after the limits change.
+
+    Returns:
+        int: Pivots taken, or None if the basis did not lead to a feasible one
+    """
+
+    pivots = 0
+    while pivots < max_pivots:
+        values = tableau[:-2, -1]
+        row = np.argmin(values)
+        if values[row] >= -EPSILON:
+            return pivots
+        entries = tableau[row, :-1]
+        columns = np.flatnonzero(entries < -EPSILON)
+        if not len(columns):
+            return None
+        # Smallest ratio of reduced cost to pivot entry keeps every column
+        # non-improving, with ties on the first objective settled by the second
+        ratios = tableau[-2:, columns] / entries[columns]
+        closest = ratios[0] <= ratios[0].min() + EPSILON
+        column = columns[closest][np.argmin(ratios[1, closest])]
+        _pivot(tableau, row, column)
+        basis[row] = column
+        pivots += 1
+    return None
+
+
+def _tableau(matrix, rhs, costs, basis):
+    """Simplex tableau of a basis, with the two rows of reduced costs last; None if the basis is singular."""
+
+    columns = matrix[:, basis]
+    if np.linalg.cond(columns) > 1e12:
+        return None
+    body = np.linalg.solve(columns, np.column_stack([matrix, rhs]))
+    objectives = np.column_stack([costs, np.zeros(2)])
+    return np.vstack([body, objectives - objectives[:, basis] @ body])
+
+
+class AllocationOptimizer:
+    def __init__(self, crops, profit_per_acre, cost_per_acre, water_per_acre, labour_per_acre, risk_per_acre,
+                 soil_preferences):
+        """
+        Args:
+            crops: Candidate crop names
+            profit_per_acre: Expected profit per acre of each crop
+            cost_per_acre: Input cost per acre, in the same currency as the budget
+            water_per_acre: Seasonal irrigation need in acre-inches per acre
+            labour_per_acre: Labour need in person-days per acre
+            risk_per_acre: Standard deviation of profit per acre
+            soil_preferences: List of suitable soil types for each crop
+        """
+
+        self.crops = list(crops)
+        self.profit_per_acre = np.asarray(profit_per_acre, dtype=float)
+        self.usage_per_acre = np.column_stack([
+            np.asarray(cost_per_acre, dtype=float),
+            np.asarray(water_per_acre, dtype=float),
+            np.asarray(labour_per_acre, dtype=float),
+            np.asarray(risk_per_acre, dtype=float)
+        ])
+        self.soil_preferences = [set(soils) for soils in soil_preferences]
+        # Optimal basis of the last solve
+        self._basis = None
+
+    def solve(self, plot_acres, plot_soils=None, budget=np.inf, water=np.inf, labour=np.inf, risk=np.inf,
+              max_crop_share=1.0, crop_bounds=None, max_pivots=5000):
+        """
+        Allocate acreage on every plot to maximize expected profit within the limits.
+
+        Args:
+            plot_acres: Size of each plot in acres
+            plot_soils: Soil type of each plot, or None to allow every crop everywhere
+            budget: Total input spending allowed
+            water: Total seasonal irrigation available in acre-inches
+            labour: Total labour available in person-days
+            risk: Largest allowed sum of per-crop profit standard deviations
+            max_crop_share: Largest fraction of the land given to any one crop
+            crop_bounds: Optional dict of crop name -> (min acres, max acres);
+                         minimums that do not fit are met as far as possible
+            max_pivots: Upper limit on simplex pivots
+
+        Returns:
+            dict: 'allocation' (acres, shape plots x crops), 'crops', 'acres_by_crop',
+                  'profit', 'usage' and 'limits' (dicts by resource), 'fallow_acres',
+                  'binding' (resources at least 99% used), 'pivots' and
+                  'unmet_minimums' (crops whose minimum acres did not fit)
+        """
+
+        plot_acres = np.asarray(plot_acres, dtype=float)
+        if plot_soils is None:
+            eligible = np.ones((len(plot_acres), len(self.crops)), dtype=bool)
+        else:
+            eligible = np.array([[soil in soils for soils in self.soil_preferences] for soil in plot_soils])
+        eligible = eligible.reshape(len(plot_acres), len(self.crops))
+        limits = np.array([budget, water, labour, risk], dtype=float)
+
+        total_acres = plot_acres.sum()
+        lower = np.zeros(len(self.crops))
+        upper = np.full(len(self.crops), max_crop_share * total_acres)
+        for name, (minimum, maximum) in (crop_bounds or {}).items():
+            position = self.crops.index(name)
+            lower[position] = minimum
+            upper[position] = min(maximum, upper[position])
+
+        # Plots with the same eligible crops are interchangeable, so the
+        # program only needs the acres of each crop on each group of them
+        patterns, group_of = np.unique(eligible, axis=0, return_inverse=True)
+        group_of = group_of.reshape(-1)
+        group_acres = np.bincount(group_of, weights=plot_acres, minlength=len(patterns))
+        variable_group, variable_crop = np.nonzero(patterns)
+        variables = len(variable_crop)
+
+        # Rows at most their limit: land of each group, each finite resource,
+        # each crop's maximum; then each crop minimum as an equality with a
+        # shortfall and a surplus column
+        at_most = [np.eye(len(patterns))[variable_group].T]
+        at_most_rhs = [group_acres]
+        finite = np.flatnonzero(np.isfinite(limits))
+        at_most.append(self.usage_per_acre[variable_crop][:, finite].T)
+        at_most_rhs.append(np.maximum(limits[finite], 0.0))
+        at_most.append(np.eye(len(self.crops))[variable_crop].T)
+        at_most_rhs.append(np.maximum(upper, 0.0))
+        at_most, at_most_rhs = np.vstack(at_most), np.concatenate(at_most_rhs)
+        minimums = np.flatnonzero(lower > 0)
+        at_least = np.eye(len(self.crops))[variable_crop].T[minimums]
+
+        rows = len(at_most) + len(minimums)
+        matrix = np.zeros((rows, variables + len(at_most) + 2 * len(minimums)))
+        matrix[:len(at_most), :variables] = at_most
+        matrix[len(at_most):, :variables] = at_least
+        rhs = np.concatenate([at_most_rhs, lower[minimums]])
+        # Rows scaled to a largest coefficient of one, so rupees and acres
+        # share one tolerance
+        scale = np.abs(matrix[:, :variables]).max(axis=1, initial=0.0)
+        scale = np.where(scale > 0, scale, 1.0)
+        matrix[:, :variables] /= scale[:, None]
+        rhs = rhs / scale
+        slacks = variables + np.arange(len(at_most))
+        shortfalls = variables + len(at_most) + np.arange(len(minimums))
+        matrix[np.arange(len(at_most)), slacks] = 1.0
+        matrix[len(at_most) + np.arange(len(minimums)), shortfalls] = 1.0
+        matrix[len(at_most) + np.arange(len(minimums)), shortfalls + len(minimums)] = -1.0
+
+        # Meeting minimums comes first, then profit
+        costs = np.zeros((2, matrix.shape[1]))
+        costs[0, shortfalls] = -1.0
+        costs[1, :variables] = self.profit_per_acre[variable_crop] / max(np.abs(self.profit_per_acre).max(initial=0.0), 1e-12)
+
+        tableau, basis, pivots = self._warm_start(matrix, rhs, costs, max_pivots)
+        if tableau is None:
+            basis = np.concatenate([slacks, shortfalls])
+            tableau = _tableau(matrix, rhs, costs, basis)
+            pivots = _primal_simplex(tableau, basis, max_pivots)
+        self._basis = basis.copy()
+
+        solution = np.zeros(matrix.shape[1])
+        solution[basis] = np.maximum(tableau[:-2, -1], 0.0)
+        group_crop_acres = np.zeros((len(patterns), len(self.crops)))
+        group_crop_acres[variable_group, variable_crop] = solution[:variables]
+
+        # Fill each group's plots in order with its crops
+        allocation = np.zeros((len(plot_acres), len(self.crops)))
+        for group in range(len(patterns)):
+            plots = np.flatnonzero(group_of == group)
+            free = plot_acres[plots].copy()
+            for crop in np.flatnonzero(group_crop_acres[group] > 0):
+                before = np.cumsum(free) - free
+                taken = np.clip(group_crop_acres[group, crop] - before, 0.0, free)
+                allocation[plots, crop] = taken
+                free -= taken
+
+        acres_by_crop = allocation.sum(axis=0)
+        used = acres_by_crop @ self.usage_per_acre
+        return {
+            'allocation': allocation,
+            'crops': self.crops,
+            'acres_by_crop': dict(zip(self.crops, acres_by_crop.tolist())),
+            'profit': float(acres_by_crop @ self.profit_per_acre),
+            'usage': dict(zip(RESOURCES, used.tolist())),
+            'limits': dict(zip(RESOURCES, limits.tolist())),
+            'fallow_acres': float(total_acres - acres_by_crop.sum()),
+            'binding': [name for name, use, limit in zip(RESOURCES, used, limits) if np.isfinite(limit) and use >= 0.99 * limit],
+            'pivots': pivots,
+            'unmet_minimums': [name for name, acres, minimum in zip(self.crops, acres_by_crop, lower) if acres < minimum - 1e-6]
+        }
+
+    def _warm_start(self, matrix, rhs, costs, max_pivots):
+        """
+        Re-optimize from the last solve's basis: primal pivots if it is still
+        feasible, dual pivots if it is still optimal for the new limits.
+
+        Returns:
+            tuple: (tableau, basis, pivots), or (None, None, 0) to start cold
+        """
+
+        basis = self._basis
+        if basis is None or len(basis) != len(matrix) or basis.max() >= matrix.shape[1]:
+            return None, None, 0
+        basis = basis.copy()
+        tableau = _tableau(matrix, rhs, costs, basis)
+        if tableau is None:
+            return None, None, 0
+        if tableau[:-2, -1].min() >= -EPSILON:
+            return tableau, basis, _primal_simplex(tableau, basis, max_pivots)
+        if _improving(tableau[-2:, :-1]).any():
+            return None, None, 0
+        pivots = _dual_simplex(tableau, basis, max_pivots)
+        if pivots is None:
+            return None, None, 0
+        return tableau, basis, pivots
@@ -0,0 +1,177 @@
+"""
+Resumable chunked file uploads with content-hash deduplication.
+Chunks are streamed straight to a partial file on disk at the offset the
+client sends, so a dropped connection only costs the chunk in flight and a
+file the server already has (same SHA-256) is never uploaded twice.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class UploadStore:
+    def __init__(self, job_queue, directory, max_size=50 * 1024 * 1024):
+        """
+        Args:
+            job_queue: JobQueue whose database also holds the upload sessions
+            directory: Where partial and finished files are kept
+            max_size: Largest accepted file in bytes
+        """
+
+        self.job_queue = job_queue
+        self.max_size = max_size
+        self.partial_dir = os.path.join(directory, 'partial')
+        self.blob_dir = os.path.join(directory, 'blobs')
+        os.makedirs(self.partial_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        # One writer per upload at a time
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+        self.job_queue.connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                id TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                extension TEXT NOT NULL,
+                received INTEGER NOT NULL DEFAULT 0,
+                path TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self.job_queue.connection().execute("CREATE INDEX IF NOT EXISTS uploads_sha256 ON uploads (sha256)")
+
+    def create(self, filename, size, sha256):
+        """
+        Start an upload, or pick up an existing one for the same content.
+
+        Returns:
+            dict: Upload session with the offset to continue from; 'complete'
+                  is already True when the server has this exact file
+        """
+
+        sha256 = (sha256 or '').lower()
+        if len(sha256) != 64 or any(char not in '0123456789abcdef' for char in sha256):
+            raise UploadError("A SHA-256 hex digest of the file is required.")
+        if not 0 < size <= self.max_size:
+            raise UploadError(f"File size must be between 1 byte and {self.max_size} bytes.", 413)
+
+        connection = self.job_queue.connection()
+        finished = connection.execute(
+            "SELECT path FROM uploads WHERE sha256 = ? AND size = ? AND path IS NOT NULL LIMIT 1", (sha256, size)
+        ).fetchone()
+        if finished is None:
+            # Resume an interrupted upload of the same file, e.g. after a page reload
+            unfinished = connection.execute(
+                "SELECT * FROM uploads WHERE sha256 = ? AND size = ? AND path IS NULL ORDER BY received DESC LIMIT 1",
+                (sha256, size)
+            ).fetchone()
+            if unfinished is not None:
+                return self._session(unfinished)
+
+        extension = os.path.splitext(filename or '')[1].lower()[:8]
+        upload_id = uuid.uuid4().hex
+        connection.execute(
+            "INSERT INTO uploads (id, sha256, size, extension, received, path, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (upload_id, sha256, size, extension, size if finished else 0, finished['path'] if finished else None, time.time())
+        )
+        return self.get(upload_id)
+
+    def get(self, upload_id):
+        row = self.job_queue.connection().execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        if row is None:
+            raise UploadError("Upload not found.", 404)
+        return self._session(row)
+
+    def write_chunk(self, upload_id, offset, stream):
+        """
+        Append one chunk read from a stream, without holding it in memory.
+
+        Args:
+            upload_id: Upload session id
+            offset: Byte offset of the chunk, which must equal the bytes received so far
+            stream: File-like object to read the chunk from
+
+        Returns:
+            dict: Updated upload session; 'complete' once the whole file arrived and verified
+        """
+
+        with self._lock_for(upload_id):
+            session = self.get(upload_id)
+            if session['complete']:
+                return session
+            if offset != session['offset']:
+                raise UploadError("Chunk offset does not match the bytes received.", 409, session['offset'])
+
+            partial_path = os.path.join(self.partial_dir, upload_id)
+            received = offset
+            with open(partial_path, 'r+b' if os.path.exists(partial_path) else 'wb') as partial:
+                partial.seek(offset)
+                partial.truncate()
+                while True:
+                    block = stream.read(READ_SIZE)
+                    if not block:
+                        break
+                    received += len(block)
+                    if received > session['size']:
+                        raise UploadError("Chunk runs past the declared file size.", 413, offset)
+                    partial.write(block)
+
+            self.job_queue.connection().execute("UPDATE uploads SET received = ? WHERE id = ?", (received, upload_id))
+            if received == session['size']:
+                self._finish(upload_id, partial_path)
+            return self.get(upload_id)
+
+    def _finish(self, upload_id, partial_path):
+        """Verify the hash and move the file to its content-addressed path."""
+
+        row = self.job_queue.connection().execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        digest = hashlib.sha256()
+        with open(partial_path, 'rb') as partial:
+            for block in iter(lambda: partial.read(READ_SIZE), b''):
+                digest.update(block)
+
+        if digest.hexdigest() != row['sha256']:
+            os.remove(partial_path)
+            self.job_queue.connection().execute("UPDATE uploads SET received = 0 WHERE id = ?", (upload_id,))
+            raise UploadError("Uploaded file does not match its SHA-256; please upload it again.", 422, 0)
+
+        blob_path = os.path.join(self.blob_dir, row['sha256'] + row['extension'])
+        if os.path.exists(blob_path):
+            os.remove(partial_path)
+        else:
+            os.replace(partial_path, blob_path)
+        self.job_queue.connection().execute("UPDATE uploads SET path = ? WHERE id = ?", (blob_path, upload_id))
+
+    def path(self, upload_id):
+        """Path of a finished upload, or None while it is still in progress."""
+
+        return self.get(upload_id)['path']
+
+    def _lock_for(self, upload_id):
+        with self._locks_lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    @staticmethod
+    def _session(row):
+        return {
+            'upload_id': row['id'],
+            'size': row['size'],
+            'offset': row['received'],
+            'complete': row['path'] is not None,
+            'path': row['path']
+        }
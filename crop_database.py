@@ -400,3 +400,19 @@ def get_crop_database():
     }
     
     return crops
+
+
+def crop_keys(crop_name):
+    """Catalogue keys a crop name may have: as given, or plural (e.g. "Tomato" -> "tomatoes")."""
+    
+    name = crop_name.lower().strip().replace(' ', '_')
+    return (name, name + 's', name + 'es')
+
+
+def find_crop(crops, crop_name):
+    """Catalogue entry of a crop, accepting singular names, or None."""
+    
+    for key in crop_keys(crop_name):
+        if key in crops:
+            return crops[key]
+    return None
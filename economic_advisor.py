@@ -4,145 +4,439 @@ and government scheme recommendations for crop cultivation.
 """
 
 import streamlit as st
+import functools
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from crop_database import crop_keys, get_crop_database
+from gazetteer import Gazetteer
+from price_history import PriceHistory
+from budget_optimizer import AllocationOptimizer, WATER_PER_ACRE, LABOUR_DAYS_PER_ACRE
+
+# State whose schemes are shown when the location cannot be resolved
+DEFAULT_STATE = 'Tamil Nadu'
+
+# Scheme, market and advice tables, kept out of the code
+ECONOMIC_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'economic_data.json')
+
+# Forecast price changes within this percentage are reported as stable
+PRICE_STABLE_PERCENT = 3.0
+
+# Cost categories, in the column order of every cost share row
+COST_CATEGORIES = ['seeds', 'fertilizers', 'irrigation', 'labor', 'miscellaneous']
+
+# Typical cost distribution for Indian agriculture, used for crops without their own
+DEFAULT_COST_SHARES = [0.15, 0.25, 0.20, 0.30, 0.10]
+
+# Crops whose inputs are spent differently from the typical split
+CROP_COST_SHARES = {
+    'rice': [0.10, 0.25, 0.25, 0.30, 0.10],       # puddled fields need more water
+    'wheat': [0.15, 0.30, 0.20, 0.25, 0.10],
+    'sugarcane': [0.20, 0.20, 0.25, 0.25, 0.10],  # setts and a long irrigated season
+    'cotton': [0.15, 0.30, 0.10, 0.35, 0.10],     # plant protection and hand picking
+    'turmeric': [0.30, 0.20, 0.15, 0.25, 0.10],   # seed rhizomes are costly
+    'onion': [0.20, 0.25, 0.15, 0.30, 0.10],
+    'tomatoes': [0.15, 0.25, 0.15, 0.35, 0.10],
+    'potatoes': [0.35, 0.20, 0.15, 0.20, 0.10]    # seed tubers
+}
+
+# Quintals per yield unit used in the crop database; bushel weight depends on the crop
+QUINTALS_PER_UNIT = {'tons': 10.0, 'quintal': 1.0, 'cwt': 0.508}
+QUINTALS_PER_BUSHEL = {'corn': 0.254, 'wheat': 0.272}
+
+# Season-to-season variation (coefficient of variation) of yield and price by
+# crop category; perishables swing far more in price than MSP-backed grains
+CATEGORY_RISK = {
+    'Grains': (0.15, 0.08),
+    'Cash Crops': (0.20, 0.15),
+    'Oilseeds': (0.20, 0.15),
+    'Legumes': (0.20, 0.15),
+    'Spices': (0.20, 0.30),
+    'Vegetables': (0.25, 0.35),
+    'Root Vegetables': (0.20, 0.30),
+    'Leafy Greens': (0.25, 0.35),
+    'Brassicas': (0.25, 0.30),
+    'Fruits': (0.25, 0.30),
+    'Herbs': (0.25, 0.30)
+}
+DEFAULT_RISK = (0.20, 0.20)
+COST_CV = 0.08
+# Good harvests depress local prices
+YIELD_PRICE_CORRELATION = -0.3
+
+# Crops simulated per worker process; smaller runs stay in-process since
+# starting workers costs more than the sampling itself
+SIMULATION_CROPS_PER_WORKER = 8
+_simulation_pool = None
+_simulation_pool_lock = threading.Lock()
+
+
+def _lognormal_factors(normals, cv):
+    """Turn standard normals into lognormal factors with mean 1 and the given CV."""
+
+    sigma = np.sqrt(np.log1p(np.square(cv)))
+    return np.exp(sigma * normals - sigma ** 2 / 2)
+
+
+def _simulate_profits(seeds, budgets, turnovers, yield_cvs, price_cvs, draws, quantiles, tail):
+    """
+    Sample profits for a block of crops, one row of draws per crop.
+
+    Each crop has its own seed, so results do not depend on how crops are
+    split across worker processes.
+    """
+
+    results = []
+    for seed, budget, turnover, yield_cv, price_cv in zip(seeds, budgets, turnovers, yield_cvs, price_cvs):
+        rng = np.random.default_rng(seed)
+        normals = rng.standard_normal((3, draws))
+        # Correlate price with yield
+        normals[1] = YIELD_PRICE_CORRELATION * normals[0] + np.sqrt(1 - YIELD_PRICE_CORRELATION ** 2) * normals[1]
+        revenue = turnover * _lognormal_factors(normals[0], yield_cv) * _lognormal_factors(normals[1], price_cv)
+        cost = budget * _lognormal_factors(normals[2], COST_CV)
+        profit = revenue - cost
+
+        tail_count = max(1, int(draws * tail))
+        worst = np.partition(profit, tail_count - 1)[:tail_count]
+        results.append({
+            'expected_profit': float(profit.mean()),
+            'quantiles': dict(zip(quantiles, np.quantile(profit, quantiles).tolist())),
+            'probability_of_loss': float((profit < 0).mean()),
+            'expected_shortfall': float(worst.mean())
+        })
+    return results
+
+
+def _pool():
+    global _simulation_pool
+    with _simulation_pool_lock:
+        if _simulation_pool is None:
+            _simulation_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return _simulation_pool
+
+@functools.lru_cache(maxsize=None)
+def _static_tables():
+    """
+    Tables from economic_data.json, parsed once per process and shared by
+    every advisor. Callers must treat them as read-only.
+    """
+    
+    with open(ECONOMIC_DATA_PATH, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+@functools.lru_cache(maxsize=None)
+def _language_table(name, language):
+    """One language's slice of a translated table, falling back to English."""
+    
+    table = _static_tables()[name]
+    return table.get(language, table['English'])
+
 
 class EconomicAdvisor:
-    def __init__(self):
-        self.government_schemes = self._load_government_schemes()
-        self.market_data = self._load_market_data()
+    def __init__(self, gazetteer_path=None, price_history_dir=None):
+        """
+        Args:
+            gazetteer_path: Optional CSV of extra places (taluks, villages) for location lookup
+            price_history_dir: Price history store; see price_history.py for ingesting prices
+        """
         
-    def _load_government_schemes(self):
-        """Load government schemes and subsidies data for different crops and states."""
-        return {
-            'Tamil Nadu': {
-                'rice': [
-                    "Tamil Nadu Paddy Procurement Scheme",
-                    "Direct Benefit Transfer for Rice Farmers",
-                    "Crop Insurance under PMFBY"
-                ],
-                'sugarcane': [
-                    "Sugarcane Development Scheme",
-                    "Fair and Remunerative Price (FRP) for Sugarcane",
-                    "Interest Subvention Scheme"
-                ],
-                'turmeric': [
-                    "Spice Development Scheme",
-                    "Export Promotion Scheme for Spices",
-                    "Rural Development Loans"
-                ],
-                'cotton': [
-                    "Cotton Development Program",
-                    "Minimum Support Price (MSP) for Cotton",
-                    "Technology Mission on Cotton"
-                ],
-                'general': [
-                    "Pradhan Mantri Fasal Bima Yojana (PMFBY)",
-                    "Kisan Credit Card Scheme",
-                    "PM-KISAN Direct Benefit Transfer"
-                ]
-            },
-            'Karnataka': {
-                'rice': [
-                    "Karnataka Raitha Sampada Scheme",
-                    "Crop Insurance Scheme",
-                    "Bhoochetana Scheme"
-                ],
-                'sugarcane': [
-                    "Sugarcane Development Program",
-                    "Fair and Remunerative Price Support",
-                    "Drip Irrigation Subsidy"
-                ],
-                'turmeric': [
-                    "Spice Development Scheme",
-                    "Karnataka Spice Board Support",
-                    "Organic Farming Promotion"
-                ],
-                'general': [
-                    "Raitha Sampada Scheme",
-                    "Kisan Credit Card",
-                    "Zero Interest Loans for Farmers"
-                ]
-            },
-            'Andhra Pradesh': {
-                'rice': [
-                    "YSR Rythu Bharosa Scheme",
-                    "Paddy Procurement at MSP",
-                    "Free Crop Insurance"
-                ],
-                'sugarcane': [
-                    "Sugarcane Development Scheme",
-                    "Fair Price Support",
-                    "Drip Irrigation Subsidy"
-                ],
-                'turmeric': [
-                    "Spice Development Program",
-                    "Export Promotion Scheme",
-                    "Cold Storage Subsidy"
-                ],
-                'general': [
-                    "YSR Rythu Bharosa",
-                    "Interest-Free Loans",
-                    "Input Subsidy Scheme"
-                ]
-            },
-            'Telangana': {
-                'rice': [
-                    "Rythu Bandhu Scheme",
-                    "Paddy Procurement Support",
-                    "Free Electricity for Agriculture"
-                ],
-                'cotton': [
-                    "Cotton Development Program",
-                    "Minimum Support Price",
-                    "Seed Subsidy Scheme"
-                ],
-                'turmeric': [
-                    "Spice Development Scheme",
-                    "Market Development Support",
-                    "Processing Unit Subsidy"
-                ],
-                'general': [
-                    "Rythu Bandhu Investment Support",
-                    "Rythu Bima Life Insurance",
-                    "KCC Interest Subvention"
-                ]
+        tables = _static_tables()
+        self.government_schemes = tables['government_schemes']
+        self.market_data = tables['market_data']
+        self.gazetteer = Gazetteer()
+        if gazetteer_path:
+            self.gazetteer.load_csv(gazetteer_path)
+        # Filled per state on first use by _state_tables
+        self.scheme_table = {}
+        self.market_table = {}
+        self._load_crop_economics()
+        self.price_history = PriceHistory(price_history_dir)
+        self._build_alternative_index()
+        
+    def _state_tables(self, state):
+        """
+        Build scheme and market answers for every crop in one state on first
+        use, so a request is one dictionary lookup and start-up does not pay
+        for states nobody asks about. The (state, None) entry covers crops
+        without data of their own and is written last, marking the state done.
+        """
+        
+        if (state, None) in self.scheme_table:
+            return
+        
+        state_schemes = self.government_schemes[state]
+        crops = {crop for crop in state_schemes if crop != 'general'} | set(self.market_data)
+        default_markets = {
+            'local_markets': ['Local Agricultural Markets'],
+            'export_destinations': ['Regional Export Markets'],
+            'processing_centers': ['Local Processing Units']
+        }
+        
+        for crop in sorted(crops) + [None]:
+            market_data = dict(self.market_data.get(crop, default_markets))
+            # Stable sort: markets in the farmer's state first, the rest in their usual order
+            market_data['local_markets'] = sorted(
+                market_data['local_markets'],
+                key=lambda market: self.gazetteer.resolve(market, None)['state'] != state
+            )
+            self.market_table[(state, crop)] = market_data
+            self.scheme_table[(state, crop)] = {
+                'crop_specific': state_schemes.get(crop, []),
+                'general': state_schemes.get('general', [])
             }
+    
+    def _load_crop_economics(self):
+        """
+        Turn the crop catalogue into arrays indexed by crop, for projections.
+        
+        Yields are the midpoint of the catalogue range, converted to quintals per acre.
+        """
+        
+        crops = get_crop_database()
+        self.crop_names = np.array(sorted(crops))
+        self.crop_cost_per_acre = np.array([crops[name]['cost_per_acre'] for name in self.crop_names], dtype=float)
+        self.crop_cost_shares = np.array(
+            [CROP_COST_SHARES.get(name, DEFAULT_COST_SHARES) for name in self.crop_names], dtype=float
+        )
+        risks = np.array([CATEGORY_RISK.get(crops[name]['category'], DEFAULT_RISK) for name in self.crop_names])
+        self.crop_yield_cv = risks[:, 0]
+        self.crop_price_cv = risks[:, 1]
+        self.crop_water_per_acre = np.array([WATER_PER_ACRE[crops[name]['water_needs']] for name in self.crop_names])
+        self.crop_labour_per_acre = np.array([LABOUR_DAYS_PER_ACRE[crops[name]['difficulty']] for name in self.crop_names])
+        self.crop_soils = [crops[name]['soil_preferences'] for name in self.crop_names]
+        
+        yields = []
+        for name in self.crop_names:
+            low, high, unit = re.match(r'([\d.]+)-([\d.]+)\s*(\w+)', crops[name]['yield_per_acre']).groups()
+            if unit == 'bushels':
+                quintals = QUINTALS_PER_BUSHEL.get(name, 0.27)
+            else:
+                quintals = QUINTALS_PER_UNIT[unit]
+            yields.append((float(low) + float(high)) / 2 * quintals)
+        self.crop_yield_per_acre = np.array(yields)
+    
+    def crop_indices(self, crops):
+        """
+        Catalogue index of each crop name, for any array shape.
+        
+        Raises:
+            ValueError: If a crop is not in the catalogue
+        """
+        
+        crops = np.char.replace(np.char.lower(np.asarray(crops, dtype=str)), ' ', '_')
+        indices = np.searchsorted(self.crop_names, crops)
+        found = (indices < len(self.crop_names)) & (self.crop_names[np.minimum(indices, len(self.crop_names) - 1)] == crops)
+        if not found.all():
+            raise ValueError(f"Unknown crops: {sorted(set(crops[~found].tolist()))}")
+        return indices
+    
+    def project_crops(self, sale_prices, acres=1.0, crops=None, expected_yields=None, cost_per_acre=None,
+                      input_price_index=None):
+        """
+        Project costs, profit and ROI for many crops and plots at once.
+        
+        All inputs broadcast against each other like NumPy arrays, so every crop
+        can be compared on every member plot in one call, e.g. with
+        crops=None, acres=plot_acres[:, None] and sale_prices for each crop.
+        
+        Args:
+            sale_prices: Expected sale price in rupees per quintal
+            acres: Land under each crop in acres
+            crops: Crop names, or None for the whole catalogue (self.crop_names)
+            expected_yields: Yield in quintals per acre, or None for the catalogue yields
+            cost_per_acre: Input cost in rupees per acre, or None for the catalogue costs
+            input_price_index: Price multiplier per cost category (last axis in
+                               COST_CATEGORIES order), e.g. 1.2 for 20% dearer fertilizer
+            
+        Returns:
+            dict: NumPy columns of the broadcast shape: 'crop', 'acres', 'yield_quintals',
+                  'revenue', 'cost', one 'cost_<category>' per category, 'profit' and
+                  'roi' (percent of cost, NaN where the cost is zero)
+        """
+        
+        indices = self.crop_indices(self.crop_names if crops is None else crops)
+        if expected_yields is None:
+            expected_yields = self.crop_yield_per_acre[indices]
+        if cost_per_acre is None:
+            cost_per_acre = self.crop_cost_per_acre[indices]
+        indices, acres, sale_prices, expected_yields, cost_per_acre = np.broadcast_arrays(
+            indices, np.asarray(acres, dtype=float), np.asarray(sale_prices, dtype=float),
+            np.asarray(expected_yields, dtype=float), np.asarray(cost_per_acre, dtype=float)
+        )
+        
+        # Category costs along a trailing axis: (..., len(COST_CATEGORIES))
+        category_costs = (acres * cost_per_acre)[..., None] * self.crop_cost_shares[indices]
+        if input_price_index is not None:
+            category_costs = category_costs * np.asarray(input_price_index, dtype=float)
+        
+        yield_quintals = acres * expected_yields
+        revenue = yield_quintals * sale_prices
+        cost = category_costs.sum(axis=-1)
+        profit = revenue - cost
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi = np.where(cost > 0, profit / cost * 100, np.nan)
+        
+        projection = {
+            'crop': self.crop_names[indices],
+            'acres': acres,
+            'yield_quintals': yield_quintals,
+            'revenue': revenue,
+            'cost': cost
         }
+        for position, category in enumerate(COST_CATEGORIES):
+            projection['cost_' + category] = category_costs[..., position]
+        projection['profit'] = profit
+        projection['roi'] = roi
+        return projection
     
-    def _load_market_data(self):
-        """Load market and export destination data for different crops."""
+    def simulate_profit(self, crops, budgets, expected_turnovers, draws=100000, seed=None,
+                        quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), tail=0.05):
+        """
+        Monte Carlo profit risk for one or more crops.
+        
+        Yield and price are sampled as correlated lognormal factors around the
+        expected turnover, and costs around the budget, using each crop's
+        category volatility. Many crops are spread over a process pool.
+        
+        Args:
+            crops: Crop name or list of crop names from the catalogue
+            budgets: Planned cost in rupees, one for all crops or one per crop
+            expected_turnovers: Expected revenue in rupees, one or one per crop
+            draws: Samples per crop
+            seed: Random seed for reproducible results
+            quantiles: Profit quantiles to report
+            tail: Share of worst outcomes averaged for the expected shortfall
+            
+        Returns:
+            list: Per crop, a dict with 'crop', 'expected_profit', 'quantiles'
+                  (quantile -> profit), 'probability_of_loss' and
+                  'expected_shortfall' (mean profit of the worst tail)
+        """
+        
+        crops = np.atleast_1d(crops)
+        indices = self.crop_indices(crops)
+        budgets = np.broadcast_to(np.asarray(budgets, dtype=float), indices.shape)
+        turnovers = np.broadcast_to(np.asarray(expected_turnovers, dtype=float), indices.shape)
+        seeds = np.random.SeedSequence(seed).spawn(len(indices))
+        blocks = [
+            (seeds[start:start + SIMULATION_CROPS_PER_WORKER],
+             budgets[start:start + SIMULATION_CROPS_PER_WORKER],
+             turnovers[start:start + SIMULATION_CROPS_PER_WORKER],
+             self.crop_yield_cv[indices[start:start + SIMULATION_CROPS_PER_WORKER]],
+             self.crop_price_cv[indices[start:start + SIMULATION_CROPS_PER_WORKER]],
+             draws, tuple(quantiles), tail)
+            for start in range(0, len(indices), SIMULATION_CROPS_PER_WORKER)
+        ]
+        
+        if len(blocks) == 1:
+            block_results = [_simulate_profits(*blocks[0])]
+        else:
+            block_results = list(_pool().map(_simulate_profits, *zip(*blocks)))
+        
+        results = [result for block in block_results for result in block]
+        for crop, result in zip(crops.tolist(), results):
+            result['crop'] = crop
+        return results
+    
+    def price_trend(self, crop_name, location=None, horizon=30):
+        """
+        Price outlook for a crop from the local price history, preferring
+        markets in the farmer's state. Forecasts for all stored series are
+        computed in one batch and reused for the rest of the day.
+        
+        Args:
+            crop_name: Crop to look up
+            location: Farm location, used to pick nearby markets
+            horizon: Days ahead to forecast
+        
+        Returns:
+            dict: 'current' and 'forecast' average price per quintal, forecast
+                  'low' and 'high', 'change_percent', 'direction' ('rising',
+                  'falling' or 'stable'), 'as_of' and per-market 'markets';
+                  None when no recent prices are stored for the crop
+        """
+        
+        result = self.price_history.forecast_all(horizon)
+        crop_lower = crop_name.lower()
+        rows = [
+            row for row, (market, crop) in enumerate(result['keys'])
+            if crop == crop_lower and not np.isnan(result['forecast'][row, -1])
+        ]
+        if not rows:
+            return None
+        
+        if location:
+            state = self._extract_state(location)
+            local_rows = [row for row in rows if self.gazetteer.resolve(result['keys'][row][0], None)['state'] == state]
+            rows = local_rows or rows
+        
+        current = float(np.mean(result['last'][rows]))
+        forecast = float(np.mean(result['forecast'][rows, -1]))
+        change_percent = (forecast - current) / current * 100
+        if change_percent > PRICE_STABLE_PERCENT:
+            direction = 'rising'
+        elif change_percent < -PRICE_STABLE_PERCENT:
+            direction = 'falling'
+        else:
+            direction = 'stable'
+        
         return {
-            'rice': {
-                'local_markets': ['Thanjavur', 'Coimbatore', 'Madurai', 'Chennai'],
-                'export_destinations': ['Middle East', 'Africa', 'Europe', 'USA'],
-                'processing_centers': ['Rice Mills', 'Parboiling Units', 'Modern Rice Parks']
-            },
-            'sugarcane': {
-                'local_markets': ['Sugar Mills', 'Jaggery Units', 'Cooperative Societies'],
-                'export_destinations': ['Middle East', 'Africa', 'Bangladesh'],
-                'processing_centers': ['Sugar Factories', 'Ethanol Plants', 'Jaggery Production']
-            },
-            'turmeric': {
-                'local_markets': ['Erode', 'Coimbatore', 'Salem', 'Madurai'],
-                'export_destinations': ['USA', 'UK', 'UAE', 'Germany', 'Japan'],
-                'processing_centers': ['Turmeric Processing Units', 'Spice Parks', 'Export Houses']
-            },
-            'cotton': {
-                'local_markets': ['Cotton Markets', 'Ginning Mills', 'Textile Mills'],
-                'export_destinations': ['China', 'Bangladesh', 'Vietnam', 'Turkey'],
-                'processing_centers': ['Cotton Ginning', 'Spinning Mills', 'Textile Units']
-            },
-            'onion': {
-                'local_markets': ['Nashik', 'Bangalore', 'Chennai', 'Hyderabad'],
-                'export_destinations': ['Middle East', 'Malaysia', 'Singapore', 'Sri Lanka'],
-                'processing_centers': ['Cold Storage', 'Dehydration Units', 'Processing Centers']
-            },
-            'tomato': {
-                'local_markets': ['Bangalore', 'Chennai', 'Hyderabad', 'Kochi'],
-                'export_destinations': ['Middle East', 'Maldives', 'Sri Lanka'],
-                'processing_centers': ['Food Processing Units', 'Tomato Paste Plants', 'Canning Industry']
-            }
+            'current': current,
+            'forecast': forecast,
+            'low': float(np.mean(result['lower'][rows, -1])),
+            'high': float(np.mean(result['upper'][rows, -1])),
+            'change_percent': change_percent,
+            'direction': direction,
+            'as_of': result['as_of'],
+            'horizon': horizon,
+            'markets': [
+                {
+                    'market': result['keys'][row][0],
+                    'current': float(result['last'][row]),
+                    'forecast': float(result['forecast'][row, -1])
+                }
+                for row in rows
+            ]
         }
     
+    def allocation_optimizer(self, crops=None, location=None):
+        """
+        Optimizer for splitting land and budget across crops, using the same
+        expected margins as the alternative-crop ranking. Keep the returned
+        optimizer to re-solve quickly when only the limits change.
+        
+        Args:
+            crops: Candidate crop names, or None for the whole catalogue
+            location: Farm location, for state market prices
+        
+        Returns:
+            AllocationOptimizer: Optimizer over the known crops among the candidates
+        """
+        
+        self._refresh_market_prices()
+        state = self._extract_state(location) if location else DEFAULT_STATE
+        if crops is None:
+            indices = np.arange(len(self.crop_names))
+        else:
+            positions = (self._crop_position(crop) for crop in crops)
+            indices = np.array([index for index in positions if index is not None], dtype=int)
+        
+        margins = self._crop_margins[state][indices]
+        cost = self.crop_cost_per_acre[indices]
+        profit_spread = (margins + cost) * np.hypot(self.crop_yield_cv[indices], self.crop_price_cv[indices])
+        return AllocationOptimizer(
+            [self._crop_display_names[index] for index in indices],
+            margins, cost,
+            self.crop_water_per_acre[indices],
+            self.crop_labour_per_acre[indices],
+            profit_spread,
+            [self.crop_soils[index] for index in indices]
+        )
+    
     def calculate_profit_loss(self, crop_name, budget, expected_turnover, location, language='English'):
         """Calculate profit/loss and provide financial analysis."""
         
@@ -173,192 +467,40 @@ class EconomicAdvisor:
     
     def _get_cost_breakdown(self, crop_name, budget):
         """Get typical cost breakdown for a crop."""
-        # Typical cost distribution for Indian agriculture
-        return {
-            'seeds': budget * 0.15,  # 15% for seeds
-            'fertilizers': budget * 0.25,  # 25% for fertilizers
-            'irrigation': budget * 0.20,  # 20% for irrigation
-            'labor': budget * 0.30,  # 30% for labor
-            'miscellaneous': budget * 0.10  # 10% for other costs
-        }
+        shares = CROP_COST_SHARES.get(crop_name.lower(), DEFAULT_COST_SHARES)
+        return {category: budget * share for category, share in zip(COST_CATEGORIES, shares)}
     
     def _get_market_recommendations(self, crop_name, location, language):
-        """Get market recommendations for the crop."""
+        """Get market recommendations for the crop, with markets in the farmer's state first."""
         
+        state = self._extract_state(location)
+        self._state_tables(state)
         crop_lower = crop_name.lower()
-        market_data = self.market_data.get(crop_lower, {
-            'local_markets': ['Local Agricultural Markets'],
-            'export_destinations': ['Regional Export Markets'],
-            'processing_centers': ['Local Processing Units']
-        })
-        
-        translations = {
-            'English': {
-                'local_markets': 'Local Markets',
-                'export_destinations': 'Export Opportunities',
-                'processing_centers': 'Processing Centers'
-            },
-            'Hindi': {
-                'local_markets': 'स्थानीय बाजार',
-                'export_destinations': 'निर्यात अवसर',
-                'processing_centers': 'प्रसंस्करण केंद्र'
-            },
-            'Tamil': {
-                'local_markets': 'உள்ளூர் சந்தைகள்',
-                'export_destinations': 'ஏற்றுமதி வாய்ப்புகள்',
-                'processing_centers': 'செயலாக்க மையங்கள்'
-            },
-            'Telugu': {
-                'local_markets': 'స్థానిక మార్కెట్లు',
-                'export_destinations': 'ఎగుమతి అవకాశాలు',
-                'processing_centers': 'ప్రాసెసింగ్ కేంద్రాలు'
-            }
-        }
-        
-        t = translations.get(language, translations['English'])
+        market_data = self.market_table.get((state, crop_lower)) or self.market_table[(state, None)]
+        t = _language_table('market_titles', language)
         
         return {
-            'local_markets': {
-                'title': t['local_markets'],
-                'options': market_data['local_markets']
-            },
-            'export_destinations': {
-                'title': t['export_destinations'],
-                'options': market_data['export_destinations']
-            },
-            'processing_centers': {
-                'title': t['processing_centers'],
-                'options': market_data['processing_centers']
-            }
+            section: {'title': t[section], 'options': options}
+            for section, options in market_data.items()
         }
     
     def _get_government_schemes(self, crop_name, location, language):
         """Get government schemes for the crop and location."""
         
-        # Extract state from location (simple approach)
         state = self._extract_state(location)
-        
+        self._state_tables(state)
         crop_lower = crop_name.lower()
-        state_schemes = self.government_schemes.get(state, self.government_schemes.get('Tamil Nadu', {}))
-        
-        # Get crop-specific schemes
-        crop_schemes = state_schemes.get(crop_lower, [])
-        general_schemes = state_schemes.get('general', [])
-        
-        return {
-            'crop_specific': crop_schemes,
-            'general': general_schemes
-        }
+        return self.scheme_table.get((state, crop_lower)) or self.scheme_table[(state, None)]
     
     def _extract_state(self, location):
-        """Extract state from location string."""
-        location_lower = location.lower()
-        
-        if 'tamil nadu' in location_lower or 'erode' in location_lower or 'coimbatore' in location_lower:
-            return 'Tamil Nadu'
-        elif 'karnataka' in location_lower or 'bangalore' in location_lower or 'mysore' in location_lower:
-            return 'Karnataka'
-        elif 'andhra pradesh' in location_lower or 'vijayawada' in location_lower:
-            return 'Andhra Pradesh'
-        elif 'telangana' in location_lower or 'hyderabad' in location_lower:
-            return 'Telangana'
-        else:
-            return 'Tamil Nadu'  # Default
+        """Resolve the state of a location, falling back to the default state."""
+        
+        state = self.gazetteer.resolve(location, DEFAULT_STATE)['state']
+        return state if state in self.government_schemes else DEFAULT_STATE
     
     def _generate_recommendations(self, crop_name, profit_percentage, language):
         """Generate profit maximization recommendations."""
         
-        recommendations = {
-            'English': {
-                'high_profit': [
-                    "Excellent choice! Focus on quality seeds and proper timing",
-                    "Consider value-added processing for higher profits",
-                    "Explore export opportunities for premium prices"
-                ],
-                'medium_profit': [
-                    "Good profit potential. Optimize input costs",
-                    "Consider organic farming for premium pricing",
-                    "Look for government subsidies to reduce costs"
-                ],
-                'low_profit': [
-                    "Profit margins are tight. Consider cost reduction strategies",
-                    "Look into contract farming for assured prices",
-                    "Explore alternative crops with better returns"
-                ],
-                'loss': [
-                    "Current plan may result in losses. Reconsider crop choice",
-                    "Look for high-value crops suitable for your region",
-                    "Consider consulting agricultural extension officers"
-                ]
-            },
-            'Hindi': {
-                'high_profit': [
-                    "बहुत अच्छा विकल्प! अच्छे बीज और सही समय पर ध्यान दें",
-                    "अधिक मुनाफे के लिए मूल्य संवर्धन पर विचार करें",
-                    "प्रीमियम कीमतों के लिए निर्यात अवसरों का पता लगाएं"
-                ],
-                'medium_profit': [
-                    "अच्छी लाभ संभावना। इनपुट लागत को अनुकूलित करें",
-                    "प्रीमियम मूल्य के लिए जैविक खेती पर विचार करें",
-                    "लागत कम करने के लिए सरकारी सब्सिडी देखें"
-                ],
-                'low_profit': [
-                    "लाभ मार्जिन कम है। लागत कम करने की रणनीति पर विचार करें",
-                    "निश्चित कीमतों के लिए कॉन्ट्रैक्ट फार्मिंग देखें",
-                    "बेहतर रिटर्न वाली वैकल्पिक फसलों का पता लगाएं"
-                ],
-                'loss': [
-                    "वर्तमान योजना में नुकसान हो सकता है। फसल चुनाव पर पुनर्विचार करें",
-                    "अपने क्षेत्र के लिए उच्च मूल्य वाली फसलों की तलाश करें",
-                    "कृषि विस्तार अधिकारियों से सलाह लें"
-                ]
-            },
-            'Tamil': {
-                'high_profit': [
-                    "சிறந்த தேர்வு! தரமான விதைகள் மற்றும் சரியான நேரத்தில் கவனம் செலுத்துங்கள்",
-                    "அதிக லாபத்திற்காக மதிப்பு கூட்டப்பட்ட செயலாக்கத்தை கருத்தில் கொள்ளுங்கள்",
-                    "பிரீமியம் விலைகளுக்காக ஏற்றுமதி வாய்ப்புகளை ஆராயுங்கள்"
-                ],
-                'medium_profit': [
-                    "நல்ல லாப சாத்தியம். உள்ளீட்டு செலவுகளை மேம்படுத்துங்கள்",
-                    "பிரீமியம் விலைக்காக இயற்கை விவசாயத்தை கருத்தில் கொள்ளுங்கள்",
-                    "செலவுகளை குறைக்க அரசு மானியங்களை பாருங்கள்"
-                ],
-                'low_profit': [
-                    "லாப வரம்புகள் குறைவாக உள்ளன. செலவு குறைப்பு உத்திகளை கருத்தில் கொள்ளுங்கள்",
-                    "உறுதியான விலைகளுக்காக ஒப்பந்த விவசாயத்தை பாருங்கள்",
-                    "சிறந்த வருமானம் கொண்ட மாற்று பயிர்களை ஆராயுங்கள்"
-                ],
-                'loss': [
-                    "தற்போதைய திட்டம் இழப்பை ஏற்படுத்தலாம். பயிர் தேர்வை மறுபரிசீலனை செய்யுங்கள்",
-                    "உங்கள் பகுதிக்கு ஏற்ற அதிக மதிப்பு பயிர்களை தேடுங்கள்",
-                    "விவசாய விரிவாக்க அதிகாரிகளிடம் ஆலோசனை பெறுங்கள்"
-                ]
-            },
-            'Telugu': {
-                'high_profit': [
-                    "అద్భుతమైన ఎంపిక! నాణ్యమైన విత్తనాలు మరియు సరైన సమయంపై దృష్టి పెట్టండి",
-                    "అధిక లాభాల కోసం విలువ జోడించిన ప్రాసెసింగ్‌ను పరిగణించండి",
-                    "ప్రీమియం ధరలకు ఎగుమతి అవకాశాలను అన్వేషించండి"
-                ],
-                'medium_profit': [
-                    "మంచి లాభ సంభావ్యత. ఇన్‌పుట్ వ్యయాలను ఆప్టిమైజ్ చేయండి",
-                    "ప్రీమియం ధరల కోసం సేంద్రీయ వ్యవసాయాన్ని పరిగణించండి",
-                    "వ్యయాలను తగ్గించడానికి ప్రభుత్వ సబ్సిడీలను చూడండి"
-                ],
-                'low_profit': [
-                    "లాభ మార్జిన్లు తక్కువగా ఉన్నాయి. వ్యయ తగ్గింపు వ్యూహాలను పరిగణించండి",
-                    "నిర్ధారిత ధరల కోసం కాంట్రాక్ట్ వ్యవసాయాన్ని చూడండి",
-                    "మెరుగైన రిటర్న్లతో ప్రత్యామ్నాయ పంటలను అన్వేషించండి"
-                ],
-                'loss': [
-                    "ప్రస్తుత ప్రణాళిక నష్టాలకు దారితీయవచ్చు. పంట ఎంపికను పునఃపరిశీలించండి",
-                    "మీ ప్రాంతానికి అనుకూలమైన అధిక విలువ పంటలను వెతకండి",
-                    "వ్యవసాయ విస్తరణ అధికారులను సంప్రదించండి"
-                ]
-            }
-        }
-        
         # Determine recommendation category based on profit percentage
         if profit_percentage >= 50:
             category = 'high_profit'
@@ -369,32 +511,168 @@ class EconomicAdvisor:
         else:
             category = 'loss'
         
-        return recommendations.get(language, recommendations['English']).get(category, [])
+        return _language_table('profit_recommendations', language).get(category, [])
     
-    def get_alternative_crops(self, current_crop, location, language='English'):
-        """Suggest alternative crops with better profit potential."""
-        
-        alternatives = {
-            'English': {
-                'high_value': ['Saffron', 'Vanilla', 'Cardamom', 'Organic Vegetables'],
-                'medium_value': ['Ginger', 'Turmeric', 'Chili', 'Coriander'],
-                'safe_options': ['Onion', 'Tomato', 'Brinjal', 'Okra']
-            },
-            'Hindi': {
-                'high_value': ['केसर', 'वनीला', 'इलायची', 'जैविक सब्जियां'],
-                'medium_value': ['अदरक', 'हल्दी', 'मिर्च', 'धनिया'],
-                'safe_options': ['प्याज', 'टमाटर', 'बैंगन', 'भिंडी']
-            },
-            'Tamil': {
-                'high_value': ['குங்குமப்பூ', 'வெனிலா', 'ஏலக்காய்', 'இயற்கை காய்கறிகள்'],
-                'medium_value': ['இஞ்சி', 'மஞ்சள்', 'மிளகாய்', 'கொத்தமல்லி'],
-                'safe_options': ['வெங்காயம்', 'தக்காளி', 'கத்தரிக்காய்', 'வெண்டைக்காய்']
-            },
-            'Telugu': {
-                'high_value': ['కుంకుమపువ్వు', 'వనిల్లా', 'ఏలకులు', 'సేంద్రీయ కూరగాయలు'],
-                'medium_value': ['అల్లం', 'పసుపు', 'మిర్చి', 'కొత్తిమీర'],
-                'safe_options': ['ఉల్లిపాయ', 'టమాటా', 'వంకాయ', 'భిండి']
-            }
+    def get_alternative_crops(self, current_crop, location, language='English', season=None, soil_type=None,
+                              limit=4):
+        """
+        Suggest catalogue crops with a higher expected margin per acre than
+        the current crop, read from the precomputed ranking for the farm's
+        state, season and soil.
+        
+        Args:
+            current_crop: Crop the farmer is planning
+            location: Farm location, resolved to a state
+            language: Language of the crop names
+            season: Planting season, or None for any
+            soil_type: Soil type, or None for any
+            limit: Crops per group
+        
+        Returns:
+            dict: 'high_value' (best margins), 'medium_value' (next best) and
+                  'safe_options' (steadiest yields and prices) lists of dicts with
+                  'name', 'margin' and 'gain' over the current crop, in rupees per acre
+        """
+        
+        self._refresh_market_prices()
+        state = self._extract_state(location)
+        cell = None
+        for key in ((state, season, soil_type), (state, season, None), (state, None, soil_type), (state, None, None)):
+            cell = self._alternative_index.get(key)
+            if cell and cell['by_margin']:
+                break
+        
+        margins = self._crop_margins[state]
+        current = self._crop_position(current_crop)
+        current_margin = margins[current] if current is not None else -np.inf
+        names = _language_table('crop_names', language)
+        
+        def suggestion(index):
+            gain = float(margins[index] - current_margin) if current is not None else None
+            name = names.get(self.crop_names[index], self._crop_display_names[index])
+            return {'name': name, 'margin': float(margins[index]), 'gain': gain}
+        
+        # Both orders are bounded by the catalogue size, so a lookup does not
+        # depend on how many states, seasons or soils are indexed
+        best = []
+        for index in cell['by_margin']:
+            if margins[index] <= current_margin or len(best) == 2 * limit:
+                break
+            if index != current:
+                best.append(suggestion(index))
+        safe = [
+            suggestion(index) for index in cell['by_risk']
+            if index != current and margins[index] > current_margin
+        ][:limit]
+        
+        return {
+            'high_value': best[:limit],
+            'medium_value': best[limit:],
+            'safe_options': safe
         }
+    
+    def _build_alternative_index(self):
+        """
+        Rank catalogue crops by expected margin per acre for every (state,
+        season, soil) cell, with None standing for any season or soil.
+        
+        Margins are project_crops profits at the state's market price when the
+        price history has one, and otherwise at the price implied by the
+        catalogue's profit potential.
+        """
+        
+        crops = get_crop_database()
+        profit_potential = np.array([crops[name]['profit_potential'] for name in self.crop_names], dtype=float)
+        self.crop_reference_price = (profit_potential + self.crop_cost_per_acre) / self.crop_yield_per_acre
+        self._crop_display_names = [crops[name]['name'] for name in self.crop_names]
+        self._crop_risk = self.crop_yield_cv + self.crop_price_cv
+        
+        seasons, soils = {None}, {None}
+        for crop in crops.values():
+            seasons.update(crop['seasons'])
+            soils.update(crop['soil_preferences'])
+        self._alternative_cells = {
+            (season, soil): [
+                index for index, name in enumerate(self.crop_names)
+                if (season is None or season in crops[name]['seasons'])
+                and (soil is None or soil in crops[name]['soil_preferences'])
+            ]
+            for season in seasons for soil in soils
+        }
+        
+        self._state_prices = {state: self.crop_reference_price.copy() for state in self.government_schemes}
+        self._crop_margins = {}
+        self._alternative_index = {}
+        # Price store version and fresh series the ranking was last priced at
+        self._priced_version = None
+        self._priced_series = set()
+        for state in self._state_prices:
+            self._rank_state(state, np.arange(len(self.crop_names)))
+    
+    def _rank_state(self, state, changed):
+        """Re-project the changed crops and re-sort only the cells that contain them."""
+        
+        margins = self._crop_margins.setdefault(state, np.zeros(len(self.crop_names)))
+        margins[changed] = self.project_crops(self._state_prices[state][changed], crops=self.crop_names[changed])['profit']
+        
+        changed = set(changed.tolist())
+        for (season, soil), members in self._alternative_cells.items():
+            if changed.isdisjoint(members):
+                continue
+            self._alternative_index[(state, season, soil)] = {
+                'by_margin': sorted(members, key=lambda index: -margins[index]),
+                'by_risk': sorted(members, key=lambda index: (self._crop_risk[index], -margins[index]))
+            }
+    
+    def _refresh_market_prices(self):
+        """
+        Move the ranking onto the latest stored market prices. Nothing is done
+        until the price store's version changes (prices ingested here or by
+        another process), and then only the crops whose series changed are
+        re-priced and only states where their price moved are re-ranked.
+        """
+        
+        self.price_history.refresh()
+        if self.price_history.version == self._priced_version:
+            return
+        changed_series = self.price_history.changed_since(self._priced_version)
+        forecasts = self.price_history.forecast_all()
+        self._priced_version = self.price_history.version
+        
+        # A new price can also move other series in or out of the fresh window
+        fresh = set(forecasts['keys'])
+        changed_series |= fresh ^ self._priced_series
+        self._priced_series = fresh
+        changed_crops = {self._crop_position(crop) for market, crop in changed_series} - {None}
+        if not changed_crops:
+            return
+        
+        national = {index: [] for index in changed_crops}
+        by_state = {state: {} for state in self._state_prices}
+        for row, (market, crop) in enumerate(forecasts['keys']):
+            index = self._crop_position(crop)
+            if index not in national:
+                continue
+            national[index].append(forecasts['last'][row])
+            state = self.gazetteer.resolve(market, None)['state']
+            if state in by_state:
+                by_state[state].setdefault(index, []).append(forecasts['last'][row])
+        
+        for state, prices in self._state_prices.items():
+            latest = prices.copy()
+            for index, national_prices in national.items():
+                state_prices = by_state[state].get(index, national_prices)
+                latest[index] = np.mean(state_prices) if state_prices else self.crop_reference_price[index]
+            changed = np.flatnonzero(latest != prices)
+            if len(changed):
+                self._state_prices[state] = latest
+                self._rank_state(state, changed)
+    
+    def _crop_position(self, crop_name):
+        """Catalogue index of a crop, accepting singular names (e.g. "Tomato"), or None."""
         
-        return alternatives.get(language, alternatives['English'])
\ No newline at end of file
+        for candidate in crop_keys(crop_name):
+            index = np.searchsorted(self.crop_names, candidate)
+            if index < len(self.crop_names) and self.crop_names[index] == candidate:
+                return int(index)
+        return None
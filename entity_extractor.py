@@ -0,0 +1,321 @@
+"""
+Compiled multilingual entity extraction for farmer voice/text input.
+Each language's lexicon is compiled once into a single regex so that land size,
+units, crop, soil, season, budget and water availability are found in one pass.
+"""
+
+import re
+from quantity_parser import QuantityParser, to_acres, WORD_CHAR
+
+# Slots filled from keyword lexicons, in the order they are reported
+KEYWORD_SLOTS = ['crop_preference', 'soil_type', 'season', 'water_availability']
+
+# Joins batched messages; no lexicon entry or quantity pattern can match across it
+MESSAGE_SEPARATOR = '\x00'
+CURRENCY_PREFIX_PATTERN = r'(?:₹|\brs\.?|\binr)'
+
+# Confidence of a slot by the evidence that filled it
+SLOT_CONFIDENCE = {
+    'land_unit_tiers': [0.95, 0.85, 0.8, 0.75],  # by land unit tier, acre/hectare first
+    'prefixed_currency': 0.95,                  # "₹ 50,000", "rs 2 lakh"
+    'currency_word': 0.9,                       # "50000 rupees"
+    'money_scale': 0.7,                         # "2 lakh" with no currency
+    'whole_word': 0.9,                          # keyword standing on its own
+    'part_word': 0.6                            # keyword inside a longer word
+}
+# Applied when the same message gives a slot more than one value
+CONFLICT_PENALTY = 0.75
+
+_is_word_char = re.compile(WORD_CHAR).match
+
+# Per-language lexicons. Land units are listed in priority tiers: a match in an
+# earlier tier wins over any match in a later tier, as with the old pattern lists.
+# Keyword dicts are in priority order: the first listed keyword found wins.
+LEXICONS = {
+    'English': {
+        'land_units': [
+            {'acre': 'acre', 'acres': 'acre', 'hectare': 'hectare', 'hectares': 'hectare'},
+            {'bigha': 'bigha', 'bighas': 'bigha'},
+            {'square feet': 'sq_ft', 'sq ft': 'sq_ft', 'square meter': 'sq_m', 'sq m': 'sq_m'},
+            {'cent': 'cent', 'cents': 'cent', 'guntha': 'guntha', 'gunthas': 'guntha'}
+        ],
+        'currency_units': ['rupees', 'rupee', 'rs', 'inr'],
+        'crop_preference': {
+            'rice': 'Rice', 'wheat': 'Wheat', 'corn': 'Corn', 'tomato': 'Tomato', 'potato': 'Potato',
+            'onion': 'Onion', 'sugarcane': 'Sugarcane', 'cotton': 'Cotton', 'turmeric': 'Turmeric',
+            'paddy': 'Rice', 'maize': 'Corn', 'chilli': 'Chili', 'chili': 'Chili'
+        },
+        'soil_type': {
+            'clay': 'Clay', 'sandy': 'Sandy', 'loamy': 'Loamy', 'silty': 'Silty', 'black': 'Black', 'red': 'Red'
+        },
+        'season': {
+            'spring': 'Spring', 'summer': 'Summer', 'winter': 'Winter', 'monsoon': 'Monsoon', 'rainy': 'Rainy'
+        },
+        'water_availability': {
+            'canal': 'High', 'river': 'High', 'plenty of water': 'High',
+            'borewell': 'Medium', 'bore well': 'Medium', 'well': 'Medium',
+            'rainfed': 'Low', 'rain-fed': 'Low', 'no water': 'Low', 'drought': 'Low'
+        }
+    },
+    'Hindi': {
+        'land_units': [{'एकड़': 'acre', 'हेक्टेयर': 'hectare'}, {'बीघा': 'bigha', 'बीघे': 'bigha'}],
+        'currency_units': ['रुपये', 'रुपए', 'रुपया'],
+        'crop_preference': {
+            'चावल': 'Rice', 'गेहूं': 'Wheat', 'मक्का': 'Corn', 'टमाटर': 'Tomato',
+            'आलू': 'Potato', 'प्याज': 'Onion', 'गन्ना': 'Sugarcane', 'कपास': 'Cotton',
+            'हल्दी': 'Turmeric', 'मिर्च': 'Chili', 'बैंगन': 'Eggplant'
+        },
+        'soil_type': {
+            'चिकनी': 'Clay', 'रेतीली': 'Sandy', 'दोमट': 'Loamy', 'काली': 'Black', 'लाल': 'Red'
+        },
+        'season': {
+            'वसंत': 'Spring', 'गर्मी': 'Summer', 'सर्दी': 'Winter', 'मानसून': 'Monsoon', 'बरसात': 'Rainy'
+        },
+        'water_availability': {
+            'नहर': 'High', 'नदी': 'High', 'बोरवेल': 'Medium', 'कुआं': 'Medium', 'बारानी': 'Low', 'सूखा': 'Low'
+        }
+    },
+    'Tamil': {
+        'land_units': [{'ஏக்கர்': 'acre', 'ஹெக்டேர்': 'hectare'}, {'சென்ட்': 'cent'}],
+        'currency_units': ['ரூபாய்'],
+        'crop_preference': {
+            'அரிசி': 'Rice', 'கோதுமை': 'Wheat', 'சோளம்': 'Corn', 'தக்காளி': 'Tomato',
+            'உருளைக்கிழங்கு': 'Potato', 'வெங்காயம்': 'Onion', 'கரும்பு': 'Sugarcane',
+            'பருத்தி': 'Cotton', 'மஞ்சள்': 'Turmeric', 'மிளகாய்': 'Chili'
+        },
+        'soil_type': {
+            'களிமண்': 'Clay', 'மணல்': 'Sandy', 'கலவை': 'Loamy', 'கருப்பு': 'Black', 'சிவப்பு': 'Red'
+        },
+        'season': {
+            'வசந்த': 'Spring', 'கோடை': 'Summer', 'குளிர்': 'Winter', 'மழைக்கால': 'Monsoon'
+        },
+        'water_availability': {
+            'கால்வாய்': 'High', 'நதி': 'High', 'ஆழ்துளை': 'Medium', 'கிணறு': 'Medium', 'மானாவாரி': 'Low', 'வறட்சி': 'Low'
+        }
+    },
+    'Telugu': {
+        'land_units': [{'ఎకరాలు': 'acre', 'ఎకరం': 'acre', 'హెక్టార్': 'hectare'}, {'సెంట్లు': 'cent', 'గుంటలు': 'guntha'}],
+        'currency_units': ['రూపాయలు'],
+        'crop_preference': {
+            'వరి': 'Rice', 'గోధుమ': 'Wheat', 'మొక్కజొన్న': 'Corn', 'టమోటా': 'Tomato',
+            'బంగాళాదుంప': 'Potato', 'ఉల్లిపాయ': 'Onion', 'చెరకు': 'Sugarcane',
+            'పత్తి': 'Cotton', 'పసుపు': 'Turmeric', 'మిరపకాయ': 'Chili'
+        },
+        'soil_type': {
+            'బంకమట్టి': 'Clay', 'ఇసుకమట్టి': 'Sandy', 'లోమిమట్టి': 'Loamy', 'నల్లమట్టి': 'Black', 'ఎర్రమట్టి': 'Red'
+        },
+        'season': {
+            'వసంత': 'Spring', 'వేసవి': 'Summer', 'శీతాకాల': 'Winter', 'వర్షాకాల': 'Monsoon'
+        },
+        'water_availability': {
+            'కాలువ': 'High', 'నది': 'High', 'బోరుబావి': 'Medium', 'బావి': 'Medium', 'వర్షాధార': 'Low', 'కరువు': 'Low'
+        }
+    },
+    'Kannada': {
+        'land_units': [{'ಎಕರೆ': 'acre', 'ಹೆಕ್ಟೇರ್': 'hectare'}, {'ಗುಂಟೆ': 'guntha'}],
+        'currency_units': ['ರೂಪಾಯಿ'],
+        'crop_preference': {
+            'ಅಕ್ಕಿ': 'Rice', 'ಗೋಧಿ': 'Wheat', 'ಸೋಳ': 'Corn', 'ಟೊಮೇಟೊ': 'Tomato',
+            'ಆಲೂಗಡ್ಡೆ': 'Potato', 'ಈರುಳ್ಳಿ': 'Onion', 'ಕಬ್ಬು': 'Sugarcane'
+        },
+        'soil_type': {},
+        'season': {
+            'ವಸಂತ': 'Spring', 'ಬೇಸಿಗೆ': 'Summer', 'ಚಳಿಗಾಲ': 'Winter', 'ಮಳೆಗಾಲ': 'Monsoon'
+        },
+        'water_availability': {
+            'ಕಾಲುವೆ': 'High', 'ನದಿ': 'High', 'ಕೊಳವೆಬಾವಿ': 'Medium', 'ಬಾವಿ': 'Medium', 'ಮಳೆಯಾಶ್ರಿತ': 'Low', 'ಬರ': 'Low'
+        }
+    }
+}
+
+
+def trie_pattern(words):
+    """
+    Build a regex alternation for the given words factored as a prefix trie.
+
+    A flat ``a|b|c`` alternation retries every word at every position; the trie
+    form shares common prefixes, so matching cost tracks word length rather
+    than lexicon size. Longer words are preferred over their prefixes.
+    """
+
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    """Convert one trie node into a regex fragment."""
+
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # Word may end here; the group is greedy so longer words still win
+        return '(?:' + body + ')?'
+    return body
+
+
+class EntityExtractor:
+    def __init__(self, language, lexicon=None):
+        lexicon = lexicon or LEXICONS[language]
+        self.quantities = QuantityParser(language)
+
+        # keyword -> list of (slot, value, priority)
+        self.keywords = {}
+        for slot in KEYWORD_SLOTS:
+            for priority, (keyword, value) in enumerate(lexicon.get(slot, {}).items()):
+                self.keywords.setdefault(keyword, []).append((slot, value, priority))
+
+        # land unit -> (canonical unit, tier)
+        self.land_units = {}
+        for tier, units in enumerate(lexicon['land_units']):
+            for unit, canonical in units.items():
+                self.land_units.setdefault(unit, (canonical, tier))
+
+        self.currency_units = set(lexicon.get('currency_units', []))
+        self.pattern = self._compile()
+
+    def _compile(self):
+        """Compile the lexicon into one regex of zero-width lookahead branches."""
+
+        # Lookaheads let overlapping entities (e.g. a crop inside another word)
+        # be reported, matching the substring semantics of the old keyword scans
+        quantity = self.quantities.pattern
+        currency = trie_pattern(self.currency_units) if self.currency_units else '(?!)'
+        branches = [
+            r'(?P<land_size>{0})\s*(?P<land_unit>{1})'.format(quantity, trie_pattern(self.land_units)),
+            r'(?P<amount>{0})(?P<currency>\s*(?:{1}))?'.format(quantity, currency),
+            r'{0}\s*(?P<prefixed_amount>{1})'.format(CURRENCY_PREFIX_PATTERN, quantity)
+        ]
+        if self.keywords:
+            branches.append(r'(?P<keyword>{0})'.format(trie_pattern(self.keywords)))
+
+        # Cheap first-character test so most positions are rejected without
+        # trying every branch
+        first_chars = set('₹ri')
+        for words in (self.quantities.numbers, self.keywords):
+            first_chars.update(word[0] for word in words)
+        prefilter = r'(?=[\d{0}])'.format(''.join(re.escape(char) for char in sorted(first_chars)))
+
+        return re.compile(prefilter + '(?=' + '|'.join('(?:' + branch + ')' for branch in branches) + ')')
+
+    def extract(self, text):
+        """
+        Extract farming entities from normalized text in a single pass.
+
+        Args:
+            text: Lower-cased input text
+
+        Returns:
+            dict: Only the slots that were found
+        """
+
+        return self.extract_many([text])[0]
+
+    def extract_many(self, texts, with_confidence=False):
+        """
+        Extract farming entities from many texts with one regex scan.
+
+        The texts are joined with a separator no pattern can cross, scanned
+        once, and each match is mapped back to its message by offset.
+
+        Args:
+            texts: Lower-cased input texts
+            with_confidence: Also score each slot between 0 and 1
+
+        Returns:
+            list: One dict per text with only the slots that were found, or
+                  (slots, confidences) pairs if with_confidence is set
+        """
+
+        joined = MESSAGE_SEPARATOR.join(text.replace(MESSAGE_SEPARATOR, ' ') for text in texts)
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(MESSAGE_SEPARATOR)
+
+        # Per message: slot -> (rank, value, confidence); lower rank wins,
+        # earlier position breaks ties. Every value offered per slot is kept
+        # in seen so conflicting mentions lower the confidence.
+        results = [{} for _ in texts]
+        seen = [{} for _ in texts]
+        index = 0
+
+        for match in self.pattern.finditer(joined):
+            # Matches arrive in position order, so the owning message only moves forward
+            while index + 1 < len(starts) and match.start() >= starts[index + 1]:
+                index += 1
+            self._offer(results[index], seen[index], match, match.start() - starts[index])
+
+        if with_confidence:
+            return [(self._finish(best), self._confidences(best, values)) for best, values in zip(results, seen)]
+        return [self._finish(best) for best in results]
+
+    def _offer(self, best, seen, match, position):
+        """Record a match for its slot if it outranks what was found so far."""
+
+        def offer(slot, rank, value, confidence, end):
+            # Lookahead scanning also matches the tail of a quantity ("50000" in
+            # "250000"); only mentions after the previous one count as values
+            values, previous_end = seen.get(slot, (set(), -1))
+            if match.start() >= previous_end:
+                values.add(value)
+                seen[slot] = (values, end)
+            if slot not in best or rank < best[slot][0]:
+                best[slot] = (rank, value, confidence)
+
+        groups = match.groupdict()
+        if groups['land_size'] is not None:
+            canonical, tier = self.land_units[groups['land_unit']]
+            acres = to_acres(self.quantities.parse(groups['land_size']), canonical)
+            tiers = SLOT_CONFIDENCE['land_unit_tiers']
+            offer('land_size', (tier, position), (round(acres, 4), canonical), tiers[min(tier, len(tiers) - 1)],
+                  match.end('land_unit'))
+        elif groups['amount'] is not None:
+            # Bare numbers only count as budget when spoken in money terms
+            amount = groups['amount']
+            if groups['currency']:
+                offer('budget', (0, position), self.quantities.parse(amount), SLOT_CONFIDENCE['currency_word'],
+                      match.end('currency'))
+            elif self.quantities.is_money_scale(amount):
+                offer('budget', (0, position), self.quantities.parse(amount), SLOT_CONFIDENCE['money_scale'],
+                      match.end('amount'))
+        elif groups['prefixed_amount'] is not None:
+            offer('budget', (0, position), self.quantities.parse(groups['prefixed_amount']),
+                  SLOT_CONFIDENCE['prefixed_currency'], match.end('prefixed_amount'))
+        else:
+            start, end = match.span('keyword')
+            text = match.string
+            inside_word = (start > 0 and _is_word_char(text[start - 1])) or (end < len(text) and _is_word_char(text[end]))
+            confidence = SLOT_CONFIDENCE['part_word' if inside_word else 'whole_word']
+            for slot, value, priority in self.keywords[groups['keyword']]:
+                offer(slot, (priority, position), value, confidence, end)
+
+    def _finish(self, best):
+        """Drop ranks and split land size into acres and the unit as spoken."""
+
+        details = {slot: value for slot, (rank, value, confidence) in best.items()}
+        if 'land_size' in details:
+            details['land_size'], details['land_unit'] = details['land_size']
+
+        return details
+
+    def _confidences(self, best, seen):
+        """Confidence per found slot, lowered where the message gave conflicting values."""
+
+        confidences = {}
+        for slot, (rank, value, confidence) in best.items():
+            if len(seen[slot][0]) > 1:
+                confidence *= CONFLICT_PENALTY
+            confidences[slot] = round(confidence, 2)
+        if 'land_size' in confidences:
+            confidences['land_unit'] = confidences['land_size']
+
+        return confidences
@@ -0,0 +1,272 @@
+"""
+Location gazetteer for resolving free-text farm locations to a state.
+Place names are indexed in a character trie, walked from each word of the
+query so resolution cost grows with the query length, not the number of
+places, and in a trigram index that catches misspelt names.
+"""
+
+import csv
+import math
+import re
+
+# Districts of the states with scheme data, plus common town, taluk and older
+# names mapped to (district, kind). More places (taluks, villages) can be
+# loaded from a CSV directory with Gazetteer.load_csv.
+STATE_PLACES = {
+    'Tamil Nadu': {
+        'districts': [
+            'Ariyalur', 'Chengalpattu', 'Chennai', 'Coimbatore', 'Cuddalore', 'Dharmapuri', 'Dindigul',
+            'Erode', 'Kallakurichi', 'Kancheepuram', 'Kanniyakumari', 'Karur', 'Krishnagiri', 'Madurai',
+            'Mayiladuthurai', 'Nagapattinam', 'Namakkal', 'Nilgiris', 'Perambalur', 'Pudukkottai',
+            'Ramanathapuram', 'Ranipet', 'Salem', 'Sivaganga', 'Tenkasi', 'Thanjavur', 'Theni',
+            'Thoothukudi', 'Tiruchirappalli', 'Tirunelveli', 'Tirupathur', 'Tiruppur', 'Tiruvallur',
+            'Tiruvannamalai', 'Tiruvarur', 'Vellore', 'Viluppuram', 'Virudhunagar'
+        ],
+        'places': {
+            'Trichy': ('Tiruchirappalli', 'alias'), 'Tanjore': ('Thanjavur', 'alias'),
+            'Tuticorin': ('Thoothukudi', 'alias'), 'Kanyakumari': ('Kanniyakumari', 'alias'),
+            'Kanchipuram': ('Kancheepuram', 'alias'), 'Villupuram': ('Viluppuram', 'alias'),
+            'Tirupur': ('Tiruppur', 'alias'), 'Ooty': ('Nilgiris', 'town'), 'Madras': ('Chennai', 'alias'),
+            'Pollachi': ('Coimbatore', 'taluk'), 'Mettupalayam': ('Coimbatore', 'taluk'),
+            'Gobichettipalayam': ('Erode', 'taluk'), 'Bhavani': ('Erode', 'taluk'),
+            'Kumbakonam': ('Thanjavur', 'taluk'), 'Hosur': ('Krishnagiri', 'taluk'),
+            'Mettur': ('Salem', 'taluk'), 'Palani': ('Dindigul', 'taluk'), 'Karaikudi': ('Sivaganga', 'taluk'),
+            'Rasipuram': ('Namakkal', 'taluk'), 'Sathyamangalam': ('Erode', 'taluk')
+        }
+    },
+    'Karnataka': {
+        'districts': [
+            'Bagalkot', 'Ballari', 'Belagavi', 'Bengaluru Rural', 'Bengaluru Urban', 'Bidar',
+            'Chamarajanagar', 'Chikkaballapur', 'Chikkamagaluru', 'Chitradurga', 'Dakshina Kannada',
+            'Davanagere', 'Dharwad', 'Gadag', 'Hassan', 'Haveri', 'Kalaburagi', 'Kodagu', 'Kolar',
+            'Koppal', 'Mandya', 'Mysuru', 'Raichur', 'Ramanagara', 'Shivamogga', 'Tumakuru', 'Udupi',
+            'Uttara Kannada', 'Vijayapura', 'Yadgir', 'Vijayanagara'
+        ],
+        'places': {
+            'Bengaluru': ('Bengaluru Urban', 'alias'), 'Bangalore': ('Bengaluru Urban', 'alias'),
+            'Mysore': ('Mysuru', 'alias'), 'Belgaum': ('Belagavi', 'alias'), 'Gulbarga': ('Kalaburagi', 'alias'),
+            'Bellary': ('Ballari', 'alias'), 'Bijapur': ('Vijayapura', 'alias'), 'Shimoga': ('Shivamogga', 'alias'),
+            'Tumkur': ('Tumakuru', 'alias'), 'Chikmagalur': ('Chikkamagaluru', 'alias'), 'Coorg': ('Kodagu', 'alias'),
+            'Mangaluru': ('Dakshina Kannada', 'town'), 'Mangalore': ('Dakshina Kannada', 'town'),
+            'Hubballi': ('Dharwad', 'town'), 'Hubli': ('Dharwad', 'town'), 'Hospet': ('Vijayanagara', 'taluk'),
+            'Sirsi': ('Uttara Kannada', 'taluk'), 'Gokak': ('Belagavi', 'taluk'), 'Channapatna': ('Ramanagara', 'taluk')
+        }
+    },
+    'Andhra Pradesh': {
+        'districts': [
+            'Alluri Sitharama Raju', 'Anakapalli', 'Anantapur', 'Annamayya', 'Bapatla', 'Chittoor',
+            'Konaseema', 'East Godavari', 'Eluru', 'Guntur', 'Kakinada', 'Krishna', 'Kurnool', 'Nandyal',
+            'NTR', 'Palnadu', 'Parvathipuram Manyam', 'Prakasam', 'Nellore', 'Sri Sathya Sai', 'Srikakulam',
+            'Tirupati', 'Visakhapatnam', 'Vizianagaram', 'West Godavari', 'YSR Kadapa'
+        ],
+        'places': {
+            'Vijayawada': ('NTR', 'town'), 'Vizag': ('Visakhapatnam', 'alias'), 'Kadapa': ('YSR Kadapa', 'alias'),
+            'Cuddapah': ('YSR Kadapa', 'alias'), 'Anantapuramu': ('Anantapur', 'alias'),
+            'Rajahmundry': ('East Godavari', 'town'), 'Rajamahendravaram': ('East Godavari', 'town'),
+            'Ongole': ('Prakasam', 'town'), 'Machilipatnam': ('Krishna', 'town'), 'Guntakal': ('Anantapur', 'taluk'),
+            'Tenali': ('Guntur', 'taluk'), 'Bhimavaram': ('West Godavari', 'taluk'), 'Amaravati': ('Guntur', 'town')
+        }
+    },
+    'Telangana': {
+        'districts': [
+            'Adilabad', 'Bhadradri Kothagudem', 'Hanumakonda', 'Hyderabad', 'Jagtial', 'Jangaon',
+            'Jayashankar Bhupalpally', 'Jogulamba Gadwal', 'Kamareddy', 'Karimnagar', 'Khammam',
+            'Kumuram Bheem Asifabad', 'Mahabubabad', 'Mahabubnagar', 'Mancherial', 'Medak',
+            'Medchal Malkajgiri', 'Mulugu', 'Nagarkurnool', 'Nalgonda', 'Narayanpet', 'Nirmal', 'Nizamabad',
+            'Peddapalli', 'Rajanna Sircilla', 'Rangareddy', 'Sangareddy', 'Siddipet', 'Suryapet',
+            'Vikarabad', 'Wanaparthy', 'Warangal', 'Yadadri Bhuvanagiri'
+        ],
+        'places': {
+            'Secunderabad': ('Hyderabad', 'town'), 'Bhadrachalam': ('Bhadradri Kothagudem', 'taluk'),
+            'Miryalaguda': ('Nalgonda', 'taluk'), 'Ramagundam': ('Peddapalli', 'town'),
+            'Bodhan': ('Nizamabad', 'taluk'), 'Gadwal': ('Jogulamba Gadwal', 'town')
+        }
+    }
+}
+
+# When one name belongs to several places, the more specific kind of match is
+# trusted less than a district or the state itself
+KIND_PRIORITY = {'state': 0, 'district': 1, 'alias': 1, 'town': 2, 'taluk': 3, 'village': 4}
+# Kinds from a CSV that are not listed above are trusted least
+UNKNOWN_KIND_PRIORITY = max(KIND_PRIORITY.values()) + 1
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_THRESHOLD = 0.6
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(name):
+    """Lower-case a place name and collapse punctuation and spacing to single spaces."""
+
+    return _NON_WORD.sub(' ', name.lower()).strip()
+
+
+def _trigrams(text):
+    padded = f' {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _kind_priority(place):
+    return KIND_PRIORITY.get(place['kind'], UNKNOWN_KIND_PRIORITY)
+
+
+class Gazetteer:
+    def __init__(self, state_places=STATE_PLACES):
+        self.places = []
+        self._trie = {}
+        self._trigram_index = {}
+        self._place_trigrams = []
+        for state, entries in state_places.items():
+            self.add(state, state, state, 'state')
+            for district in entries['districts']:
+                self.add(district, district, state, 'district')
+            for name, (district, kind) in entries['places'].items():
+                self.add(name, district, state, kind)
+
+    def add(self, name, district, state, kind='village'):
+        """Index one place name."""
+
+        key = normalize(name)
+        if not key:
+            return
+        place_id = len(self.places)
+        self.places.append({'name': name, 'district': district, 'state': state, 'kind': kind, 'key': key})
+
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault('', []).append(place_id)
+
+        trigrams = _trigrams(key)
+        self._place_trigrams.append(trigrams)
+        for trigram in trigrams:
+            self._trigram_index.setdefault(trigram, []).append(place_id)
+
+    def load_csv(self, path):
+        """
+        Add places from a CSV directory with name, district, state and kind
+        (district, taluk, town or village) columns.
+
+        Returns:
+            int: Number of places added
+        """
+
+        added = 0
+        with open(path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                self.add(row['name'], row['district'], row['state'], row.get('kind') or 'village')
+                added += 1
+        return added
+
+    def complete(self, prefix, limit=10):
+        """Place names starting with the prefix, shortest first, for autocompletion."""
+
+        node = self._trie
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+
+        found = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            found.extend(current.get('', []))
+            stack.extend(child for char, child in current.items() if char)
+        found.sort(key=lambda place_id: len(self.places[place_id]['key']))
+        return [self.places[place_id] for place_id in found[:limit]]
+
+    def find(self, text):
+        """
+        All exact place mentions in the text.
+
+        The trie is walked from the start of every word, keeping the longest
+        name that ends on a word boundary, so "bengaluru rural" wins over "bengaluru".
+
+        Returns:
+            list: Matched place dicts
+        """
+
+        query = normalize(text)
+        matches = []
+        for start in [0] + [index + 1 for index, char in enumerate(query) if char == ' ']:
+            node = self._trie
+            longest = None
+            for index in range(start, len(query)):
+                node = node.get(query[index])
+                if node is None:
+                    break
+                if '' in node and (index + 1 == len(query) or query[index + 1] == ' '):
+                    longest = node['']
+            if longest:
+                matches.extend(self.places[place_id] for place_id in longest)
+        return matches
+
+    def fuzzy_find(self, text, threshold=FUZZY_THRESHOLD):
+        """
+        Best misspelt place mention, from runs of one to three words scored by
+        trigram similarity against the indexed names.
+
+        Returns:
+            tuple: (place dict, score), or (None, 0.0)
+        """
+
+        words = normalize(text).split()
+        best, best_score = None, 0.0
+        for size in (1, 2, 3):
+            for start in range(len(words) - size + 1):
+                window = ' '.join(words[start:start + size])
+                if len(window) < 4:
+                    continue
+                grams = _trigrams(window)
+                # A place scoring at least `floor` shares at least
+                # floor * n / (2 - floor) of the n trigrams, so it holds one of
+                # the rarest n - needed + 1; the common trigrams' long posting
+                # lists are never scanned
+                floor = max(threshold, best_score)
+                needed = math.ceil(floor * len(grams) / (2 - floor) - 1e-9)
+                rarest = sorted(grams, key=lambda gram: len(self._trigram_index.get(gram, ())))
+                candidates = set()
+                for gram in rarest[:max(len(grams) - needed + 1, 0)]:
+                    candidates.update(self._trigram_index.get(gram, ()))
+                for place_id in sorted(candidates):
+                    place_grams = self._place_trigrams[place_id]
+                    score = 2 * len(grams & place_grams) / (len(grams) + len(place_grams))
+                    if score > best_score:
+                        best, best_score = self.places[place_id], score
+        return (best, round(best_score, 2)) if best_score >= threshold else (None, 0.0)
+
+    def resolve(self, text, default_state='Tamil Nadu'):
+        """
+        Resolve a free-text location to a state.
+
+        A state named in the text wins; otherwise the most trusted exact place
+        match, then the best fuzzy match, then the default state.
+
+        Returns:
+            dict: 'state', 'district' (or None), 'place' (or None), and 'match':
+                  'exact', 'fuzzy' or 'default'
+        """
+
+        matches = self.find(text)
+        states = {place['state'] for place in matches if place['kind'] == 'state'}
+        if len(states) == 1:
+            state = states.pop()
+            places = [place for place in matches if place['state'] == state and place['kind'] != 'state']
+            place = min(places, key=_kind_priority) if places else None
+            return self._resolution(state, place, 'exact')
+        if matches:
+            place = min(matches, key=_kind_priority)
+            return self._resolution(place['state'], place, 'exact')
+
+        place, score = self.fuzzy_find(text)
+        if place is not None:
+            return self._resolution(place['state'], place, 'fuzzy')
+        return self._resolution(default_state, None, 'default')
+
+    @staticmethod
+    def _resolution(state, place, match):
+        if place is None or place['kind'] == 'state':
+            return {'state': state, 'district': None, 'place': None, 'match': match}
+        return {'state': state, 'district': place['district'], 'place': place['name'], 'match': match}
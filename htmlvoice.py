@@ -142,12 +142,19 @@
                 return;
             }
 
-            const formData = new FormData();
-            formData.append('audio', audioFile); // 'audio' must match the key expected by Flask (request.files['audio'])
-            formData.append('contact', contact);
-            formData.append('language', language);
-
             try {
+                // Register the request before sending the audio, so it shows up at once
+                // and the server starts transcribing as soon as the last chunk lands
+                formMessage.className = 'message success';
+                formMessage.innerText = 'Preparing upload...';
+                formMessage.style.display = 'block';
+                const upload = await startUpload(audioFile);
+
+                const formData = new FormData();
+                formData.append('upload_id', upload.upload_id);
+                formData.append('contact', contact);
+                formData.append('language', language);
+
                 const response = await fetch('/submit_audio_query', {
                     method: 'POST',
                     body: formData
@@ -155,81 +162,194 @@
                 const data = await response.json();
 
                 if (response.ok) {
+                    await sendChunks(audioFile, upload, progress => {
+                        formMessage.innerText = `Uploading audio... ${Math.round(progress * 100)}%`;
+                    });
                     formMessage.className = 'message success';
                     formMessage.innerText = data.message + " (Check your VS Code terminal for simulated SMS/WhatsApp messages)";
                     // Do NOT clear audio file input or contact/language to allow quick re-testing
-                    fetchRequests(); // Refresh the list of requests
+                    // The new request arrives through the update stream
                 } else {
                     formMessage.className = 'message error';
                     formMessage.innerText = data.message || 'An error occurred during submission.';
                 }
             } catch (error) {
                 formMessage.className = 'message error';
-                formMessage.innerText = 'Network error or server unavailable. Please try again.';
+                formMessage.innerText = error.message || 'Network error or server unavailable. Please try again.';
                 console.error('Error submitting audio query:', error);
             }
             formMessage.style.display = 'block';
         });
 
+        // --- Chunked, resumable uploads ---
+        // Files go up in small chunks; after a dropped connection only the chunk in
+        // flight is resent, and a file the server already has is not sent at all.
+        const CHUNK_SIZE = 256 * 1024;
+        const MAX_RETRIES = 8;
+
+        async function sha256Hex(file) {
+            const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+            return Array.from(new Uint8Array(digest)).map(byte => byte.toString(16).padStart(2, '0')).join('');
+        }
+
+        async function startUpload(file) {
+            const response = await fetch('/uploads', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ filename: file.name, size: file.size, sha256: await sha256Hex(file) })
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error(data.message || 'Could not start the upload.');
+            }
+            return data;
+        }
+
+        async function sendChunks(file, upload, onProgress) {
+            let failures = 0;
+            while (!upload.complete) {
+                onProgress(upload.offset / upload.size);
+                let response;
+                try {
+                    response = await fetch(`/uploads/${upload.upload_id}`, {
+                        method: 'PATCH',
+                        headers: { 'Upload-Offset': String(upload.offset) },
+                        body: file.slice(upload.offset, upload.offset + CHUNK_SIZE)
+                    });
+                } catch (error) {
+                    // Connection dropped: wait, then ask the server how much it kept
+                    if (++failures > MAX_RETRIES) {
+                        throw new Error('Upload interrupted. Please check your connection and submit again.');
+                    }
+                    await new Promise(resolve => setTimeout(resolve, Math.min(30000, 1000 * 2 ** failures)));
+                    try {
+                        upload = await (await fetch(`/uploads/${upload.upload_id}`)).json();
+                    } catch (ignored) {
+                        // Still offline; the next attempt will find out
+                    }
+                    continue;
+                }
+
+                const data = await response.json();
+                if (response.ok) {
+                    upload = data;
+                    failures = 0;
+                } else if ((response.status === 409 || response.status === 422) && data.offset !== null) {
+                    upload.offset = data.offset; // Resume where the server says it is
+                } else {
+                    throw new Error(data.message || 'Upload failed.');
+                }
+            }
+            onProgress(1);
+        }
+
+        function renderRequest(req) {
+            const item = document.createElement('div');
+            item.className = 'request-item';
+            item.id = `request_${req.id}`;
+            item.dataset.id = req.id;
+            item.dataset.version = req.version;
+            let statusText = req.status;
+            let statusClass = '';
+
+            if (req.status === 'Pending') {
+                statusClass = 'status-pending';
+                statusText += ' <span class="spinner"></span>';
+            } else if (req.status === 'Pending - Image Requested') {
+                statusClass = 'status-image-requested';
+                statusText += ' <span class="spinner"></span>';
+            } else if (req.status === 'Image Received - Analyzing') {
+                statusClass = 'status-image-received';
+                statusText += ' <span class="spinner"></span>';
+            } else if (req.status.startsWith('Completed')) {
+                statusClass = 'status-completed';
+            }
+
+            item.innerHTML = `
+                <div class="request-id-display">ID: ${req.id}</div>
+                <p><strong>Transcribed Problem:</strong> ${req.problem}</p>
+                <p><strong>Contact:</strong> ${req.contact}</p>
+                <p><strong>Language:</strong> ${req.language.toUpperCase()}</p>
+                <p><strong>Status:</strong> <span class="${statusClass}">${statusText}</span></p>
+                <p><strong>Submitted:</strong> ${req.submitted_at}</p>
+                ${req.solution_sent ? `<p><strong>Simulated Response:</strong> ${req.solution_sent}</p>` : ''}
+                ${req.completed_at ? `<p><strong>Completed At:</strong> ${req.completed_at}</p>` : ''}
+                ${req.requires_image && !req.image_uploaded ? `
+                    <div class="upload-section" id="uploadSection_${req.id}">
+                        <p><strong>Image requested!</strong> To get precise guidance, please upload a clear photo of your crop/problem:</p>
+                        <input type="file" id="imageUpload_${req.id}" accept="image/*" required>
+                        <button onclick="uploadImage(${req.id})">Upload Image for Analysis</button>
+                        <div id="uploadMessage_${req.id}" class="message" style="display:none;"></div>
+                    </div>
+                ` : ''}
+            `;
+            return item;
+        }
+
+        // Highest request list version on screen; the server only sends what changed after it
+        let listVersion = 0;
+
+        // Replace one request in place, or insert it keeping newest first
+        function upsertRequest(req) {
+            listVersion = Math.max(listVersion, req.version);
+            const requestsContainer = document.getElementById('requestsContainer');
+            const existing = document.getElementById(`request_${req.id}`);
+            if (existing && Number(existing.dataset.version) >= req.version) {
+                return; // Already showing this change or a newer one
+            }
+            const item = renderRequest(req);
+
+            if (existing) {
+                // Keep the image upload section as is, with the picked file and upload progress
+                const uploadSection = existing.querySelector(`#uploadSection_${req.id}`);
+                const newUploadSection = item.querySelector(`#uploadSection_${req.id}`);
+                if (uploadSection && newUploadSection) {
+                    newUploadSection.replaceWith(uploadSection);
+                }
+                existing.replaceWith(item);
+                return;
+            }
+
+            const placeholder = requestsContainer.querySelector(':scope > p');
+            if (placeholder) {
+                placeholder.remove();
+            }
+            const newer = Array.from(requestsContainer.children).find(child => Number(child.dataset.id) < req.id);
+            requestsContainer.insertBefore(item, newer || null);
+        }
+
         async function fetchRequests() {
             try {
-                const response = await fetch('/get_requests');
+                const headers = listVersion ? { 'If-None-Match': `"${listVersion}"` } : {};
+                const response = await fetch(`/get_requests?since=${listVersion}`, { headers, cache: 'no-store' });
+                if (response.status === 304) {
+                    return; // Nothing changed since the version on screen
+                }
                 const requests = await response.json();
                 const requestsContainer = document.getElementById('requestsContainer');
-                requestsContainer.innerHTML = ''; // Clear previous list
 
-                if (requests.length === 0) {
+                if (requests.length === 0 && listVersion === 0) {
                     requestsContainer.innerHTML = '<p>No requests submitted yet. Upload an audio problem above!</p>';
                     return;
                 }
 
-                requests.sort((a, b) => b.id - a.id); // Newest first
-
-                requests.forEach(req => {
-                    const item = document.createElement('div');
-                    item.className = 'request-item';
-                    let statusText = req.status;
-                    let statusClass = '';
-
-                    if (req.status === 'Pending') {
-                        statusClass = 'status-pending';
-                        statusText += ' <span class="spinner"></span>';
-                    } else if (req.status === 'Pending - Image Requested') {
-                        statusClass = 'status-image-requested';
-                        statusText += ' <span class="spinner"></span>';
-                    } else if (req.status === 'Image Received - Analyzing') {
-                        statusClass = 'status-image-received';
-                        statusText += ' <span class="spinner"></span>';
-                    } else if (req.status.startsWith('Completed')) {
-                        statusClass = 'status-completed';
-                    }
-
-                    item.innerHTML = `
-                        <div class="request-id-display">ID: ${req.id}</div>
-                        <p><strong>Transcribed Problem:</strong> ${req.problem}</p>
-                        <p><strong>Contact:</strong> ${req.contact}</p>
-                        <p><strong>Language:</strong> ${req.language.toUpperCase()}</p>
-                        <p><strong>Status:</strong> <span class="${statusClass}">${statusText}</span></p>
-                        <p><strong>Submitted:</strong> ${req.submitted_at}</p>
-                        ${req.solution_sent ? `<p><strong>Simulated Response:</strong> ${req.solution_sent}</p>` : ''}
-                        ${req.completed_at ? `<p><strong>Completed At:</strong> ${req.completed_at}</p>` : ''}
-                        ${req.requires_image && !req.image_uploaded ? `
-                            <div class="upload-section" id="uploadSection_${req.id}">
-                                <p><strong>Image requested!</strong> To get precise guidance, please upload a clear photo of your crop/problem:</p>
-                                <input type="file" id="imageUpload_${req.id}" accept="image/*" required>
-                                <button onclick="uploadImage(${req.id})">Upload Image for Analysis</button>
-                                <div id="uploadMessage_${req.id}" class="message" style="display:none;"></div>
-                            </div>
-                        ` : ''}
-                    `;
-                    requestsContainer.appendChild(item);
-                });
+                requests.forEach(upsertRequest);
             } catch (error) {
                 console.error('Error fetching requests:', error);
-                document.getElementById('requestsContainer').innerHTML = '<p class="error">Could not load requests.</p>';
+                if (listVersion === 0) {
+                    document.getElementById('requestsContainer').innerHTML = '<p class="error">Could not load requests.</p>';
+                }
             }
         }
 
+        // Status changes are pushed by the server as they happen instead of polling.
+        // On every (re)connect only the requests changed while disconnected are fetched.
+        function listenForUpdates() {
+            const source = new EventSource('/events');
+            source.onopen = fetchRequests;
+            source.onmessage = event => upsertRequest(JSON.parse(event.data));
+        }
+
         async function uploadImage(requestId) {
             const imageInput = document.getElementById(`imageUpload_${requestId}`);
             const uploadMessage = document.getElementById(`uploadMessage_${requestId}`);
@@ -243,10 +363,12 @@
             }
 
             const imageFile = imageInput.files[0];
-            const formData = new FormData();
-            formData.append('image', imageFile);
 
             try {
+                const upload = await startUpload(imageFile);
+                const formData = new FormData();
+                formData.append('upload_id', upload.upload_id);
+
                 const response = await fetch(`/upload_image_for_request/${requestId}`, {
                     method: 'POST',
                     body: formData
@@ -255,23 +377,26 @@
 
                 if (response.ok) {
                     uploadMessage.className = 'message success';
-                    uploadMessage.innerText = data.message;
-                    document.getElementById(`uploadSection_${requestId}`).classList.add('hidden');
-                    fetchRequests();
+                    uploadMessage.style.display = 'block';
+                    await sendChunks(imageFile, upload, progress => {
+                        uploadMessage.innerText = `Uploading image... ${Math.round(progress * 100)}%`;
+                    });
+                    uploadMessage.innerText = 'Image received. Analyzing your crop now.';
+                    // The section may already be gone if the analysis update arrived first
+                    document.getElementById(`uploadSection_${requestId}`)?.classList.add('hidden');
                 } else {
                     uploadMessage.className = 'message error';
                     uploadMessage.innerText = data.message || 'Error uploading image.';
                 }
             } catch (error) {
                 uploadMessage.className = 'message error';
-                uploadMessage.innerText = 'Network error during upload. Please check your connection.';
+                uploadMessage.innerText = error.message || 'Network error during upload. Please check your connection.';
                 console.error('Upload error:', error);
             }
             uploadMessage.style.display = 'block';
         }
 
-        document.addEventListener('DOMContentLoaded', fetchRequests);
-        setInterval(fetchRequests, 5000);
+        document.addEventListener('DOMContentLoaded', listenForUpdates);
     </script>
 </body>
 </html>
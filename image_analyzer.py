@@ -5,20 +5,29 @@ crop recommendations based on visual assessment.
 
 import streamlit as st
 from PIL import Image
+import numpy as np
 import io
 import base64
 
+# Zone classes used by the field segmentation label raster
+ZONE_LABELS = ['bare_soil', 'crop', 'weeds', 'water_logged']
+BARE_SOIL, CROP, WEEDS, WATER_LOGGED = range(len(ZONE_LABELS))
+
 class ImageAnalyzer:
     def __init__(self):
         self.supported_formats = ['jpg', 'jpeg', 'png', 'bmp']
+        # Default segmentation grid (rows, columns) and working resolution
+        self.segmentation_grid = (8, 8)
+        self.segmentation_size = 256
         
-    def analyze_land_image(self, image, language='English'):
+    def analyze_land_image(self, image, language='English', segment=False):
         """
         Analyze uploaded land image and provide crop recommendations.
         
         Args:
             image: PIL Image object
             language: User's preferred language
+            segment: Also split the field into zones and classify each one
             
         Returns:
             dict: Analysis results with recommendations
@@ -34,7 +43,7 @@ class ImageAnalyzer:
         # Generate recommendations based on analysis
         recommendations = self._generate_image_recommendations(analysis, language)
         
-        return {
+        result = {
             'image_info': {
                 'width': width,
                 'height': height,
@@ -43,6 +52,109 @@ class ImageAnalyzer:
             'land_analysis': analysis,
             'recommendations': recommendations
         }
+        
+        if segment:
+            result['segmentation'] = self.segment_field(image)
+        
+        return result
+    
+    def segment_field(self, image, grid=None):
+        """
+        Split the field image into a grid of zones and classify each zone.
+        
+        Args:
+            image: PIL Image object
+            grid: (rows, columns) of zones, defaults to self.segmentation_grid
+            
+        Returns:
+            dict: Label raster (uint8, one cell per zone) with per-zone
+                  features and per-class statistics
+        """
+        
+        rows, cols = grid or self.segmentation_grid
+        # Zones need at least two pixels a side for the texture gradients
+        rows = max(1, min(rows, self.segmentation_size // 2))
+        cols = max(1, min(cols, self.segmentation_size // 2))
+        pixels = self._prepare_pixels(image, rows, cols)
+        features = self._zone_features(pixels, rows, cols)
+        labels = self._classify_zones(features)
+        
+        zone_count = rows * cols
+        counts = np.bincount(labels.ravel(), minlength=len(ZONE_LABELS))
+        class_stats = {}
+        for class_id, name in enumerate(ZONE_LABELS):
+            mask = labels == class_id
+            class_stats[name] = {
+                'zones': int(counts[class_id]),
+                'fraction': round(float(counts[class_id]) / zone_count, 3),
+                'mean_greenness': round(float(features['greenness'][mask].mean()), 3) if counts[class_id] else None
+            }
+        
+        return {
+            'grid': (rows, cols),
+            'labels': ZONE_LABELS,
+            'label_raster': labels,
+            'zone_features': {name: np.round(values, 3) for name, values in features.items()},
+            'class_stats': class_stats
+        }
+    
+    def _prepare_pixels(self, image, rows, cols):
+        """Downscale the image to a grid-aligned float RGB array in [0, 1]."""
+        
+        # Work at a fixed resolution so cost does not grow with photo size
+        cell_h = max(1, self.segmentation_size // rows)
+        cell_w = max(1, self.segmentation_size // cols)
+        # Nearest-neighbour sampling keeps the fine texture that smoothing would erase
+        resized = image.convert('RGB').resize((cell_w * cols, cell_h * rows), Image.NEAREST)
+        return np.asarray(resized, dtype=np.float32) / 255.0
+    
+    def _zone_features(self, pixels, rows, cols):
+        """Compute colour and texture features for every zone at once."""
+        
+        height, width, _ = pixels.shape
+        cells = pixels.reshape(rows, height // rows, cols, width // cols, 3)
+        
+        r, g, b = (cells[..., channel] for channel in range(3))
+        total = r + g + b + 1e-6
+        
+        # Excess green index on chromatic coordinates highlights vegetation
+        greenness = (2 * g - r - b) / total
+        # Blue excess marks standing water and waterlogged patches
+        wetness = (2 * b - r - g) / total
+        brightness = cells.mean(axis=-1)
+        
+        # Texture: mean absolute gradient of brightness inside each zone
+        grad_y = np.abs(np.diff(brightness, axis=1)).mean(axis=(1, 3))
+        grad_x = np.abs(np.diff(brightness, axis=3)).mean(axis=(1, 3))
+        
+        return {
+            'greenness': greenness.mean(axis=(1, 3)),
+            'patchiness': greenness.std(axis=(1, 3)),
+            'wetness': wetness.mean(axis=(1, 3)),
+            'brightness': brightness.mean(axis=(1, 3)),
+            'texture': grad_x + grad_y
+        }
+    
+    def _classify_zones(self, features):
+        """Assign a zone class to each grid cell from its features."""
+        
+        greenness = features['greenness']
+        wetness = features['wetness']
+        brightness = features['brightness']
+        texture = features['texture']
+        patchiness = features['patchiness']
+        
+        labels = np.full(greenness.shape, BARE_SOIL, dtype=np.uint8)
+        vegetated = greenness > 0.05
+        # Crops grow in rows with an even canopy; weeds form patchy, rough cover
+        labels[vegetated] = CROP
+        labels[vegetated & ((patchiness > 0.25) | (texture > 0.15))] = WEEDS
+        # Dark, blue-tinted, smooth zones are treated as water-logged; green
+        # cover over standing water (e.g. a flooded paddy) stays a crop zone
+        waterlogged = ~vegetated & ((wetness > 0.03) | ((brightness < 0.25) & (texture < 0.05)))
+        labels[waterlogged] = WATER_LOGGED
+        
+        return labels
     
     def _simulate_image_analysis(self, image):
         """
@@ -81,135 +193,247 @@ class ImageAnalyzer:
     def _generate_image_recommendations(self, analysis, language):
         """Generate crop recommendations based on image analysis."""
         
-        recommendations = {
-            'English': {
-                'suitable_crops': [
-                    "Tomatoes - Good for this land type",
-                    "Onions - Easy to grow and profitable",
-                    "Leafy greens - Quick harvest"
-                ],
-                'daily_care': [
-                    "Water plants early morning (6-8 AM)",
-                    "Check for pests in evening",
-                    "Remove weeds weekly"
-                ],
-                'water_schedule': "2-3 liters per day for small garden",
-                'fertilizer_tips': [
-                    "Use organic compost monthly",
-                    "Apply NPK fertilizer every 2 weeks",
-                    "Add cow dung manure before planting"
-                ],
-                'expected_yield': "Good yield expected with proper care",
-                'improvement_tips': [
-                    "Improve soil drainage if needed",
-                    "Add mulch to retain moisture",
-                    "Use companion planting"
-                ]
-            },
-            'Hindi': {
-                'suitable_crops': [
-                    "टमाटर - इस जमीन के लिए अच्छा",
-                    "प्याज - उगाना आसान और मुनाफा अच्छा",
-                    "पत्तेदार सब्जियां - जल्दी तैयार हो जाती हैं"
-                ],
-                'daily_care': [
-                    "सुबह 6-8 बजे पानी दें",
-                    "शाम को कीड़े-मकोड़े देखें",
-                    "हफ्ते में एक बार घास हटाएं"
-                ],
-                'water_schedule': "छोटे बगीचे के लिए रोज 2-3 लिटर पानी",
-                'fertilizer_tips': [
-                    "महीने में एक बार जैविक खाद डालें",
-                    "2 हफ्ते में NPK खाद दें",
-                    "बुवाई से पहले गोबर की खाद मिलाएं"
-                ],
-                'expected_yield': "अच्छी देखभाल से अच्छी फसल मिलेगी",
-                'improvement_tips': [
-                    "जरूरत हो तो पानी निकासी सुधारें",
-                    "नमी बनाए रखने के लिए मल्चिंग करें",
-                    "साथी पौधे लगाएं"
-                ]
-            },
-            'Tamil': {
-                'suitable_crops': [
-                    "தக்காளி - இந்த நிலத்திற்கு நல்லது",
-                    "வெங்காயம் - வளர்ப்பது எளிது, லாபம் நல்லது",
-                    "கீரை வகைகள் - விரைவில் அறுவடை"
-                ],
-                'daily_care': [
-                    "காலை 6-8 மணிக்கு தண்ணீர் ஊற்றவும்",
-                    "மாலையில் பூச்சிகள் இருக்கிறதா பார்க்கவும்",
-                    "வாரம் ஒரு முறை களை எடுக்கவும்"
-                ],
-                'water_schedule': "சிறிய தோட்டத்திற்கு தினமும் 2-3 லிட்டர் தண்ணீர்",
-                'fertilizer_tips': [
-                    "மாதம் ஒரு முறை இயற்கை உரம் இடவும்",
-                    "2 வாரத்திற்கு ஒரு முறை NPK உரம் போடவும்",
-                    "விதைப்பதற்கு முன் எருவுரம் கலக்கவும்"
-                ],
-                'expected_yield': "நல்ல பராமரிப்பில் நல்ல மகசூல் கிடைக்கும்",
-                'improvement_tips': [
-                    "தேவைப்பட்டால் நீர் வடிகால் மேம்படுத்தவும்",
-                    "ஈரப்பதம் தக்கவைக்க மல்ச்சிங் செய்யவும்",
-                    "துணை செடிகள் நடவும்"
-                ]
-            },
-            'Telugu': {
-                'suitable_crops': [
-                    "టమాటా - ఈ భూమికి మంచిది",
-                    "ఉల్లిపాయలు - పెంచడం సులభం, లాభం బాగుంది",
-                    "కూరగాయలు - త్వరగా పండుతాయి"
-                ],
-                'daily_care': [
-                    "ఉదయం 6-8 గంటలకు నీరు పోయండి",
-                    "సాయంత్రం కీటకాలు ఉన్నాయా చూడండి",
-                    "వారానికి ఒకసారి కలుపు మొక్కలు తీయండి"
-                ],
-                'water_schedule': "చిన్న తోట కోసం రోజుకు 2-3 లీటర్లు నీరు",
-                'fertilizer_tips': [
-                    "నెలకు ఒకసారి సేంద్రీయ ఎరువులు వేయండి",
-                    "2 వారాలకు ఒకసారి NPK ఎరువు వేయండి",
-                    "విత్తనాలు వేయడానికి ముందు గోమూత్రం కలపండి"
-                ],
-                'expected_yield': "మంచి సంరక్షణతో మంచి దిగుబడి వస్తుంది",
-                'improvement_tips': [
-                    "అవసరమైతే నీటి వాలు మెరుగుపరచండి",
-                    "తేమను నిలుపుకోవడానికి మల్చింగ్ చేయండి",
-                    "సహచర మొక్కలను నాటండి"
-                ]
-            }
-        }
+        templates = _COMPILED_TEMPLATES.get(language, _COMPILED_TEMPLATES['English'])
+        return _render(templates['recommendations'], self._template_fields(analysis, language))
+    
+    def get_visual_assessment(self, image, language='English', analysis=None):
+        """
+        Provide visual assessment of the land image.
+        
+        Args:
+            image: PIL Image object
+            language: User's preferred language
+            analysis: Precomputed land analysis, reused to avoid analysing twice
+            
+        Returns:
+            dict: Localized assessment sentences
+        """
+        
+        if analysis is None:
+            analysis = self._simulate_image_analysis(image)
         
-        return recommendations.get(language, recommendations['English'])
+        templates = _COMPILED_TEMPLATES.get(language, _COMPILED_TEMPLATES['English'])
+        return _render(templates['assessment'], self._template_fields(analysis, language))
     
-    def get_visual_assessment(self, image, language='English'):
-        """Provide visual assessment of the land image."""
-        
-        assessments = {
-            'English': {
-                'land_quality': "Land looks healthy and suitable for farming",
-                'soil_observation': "Soil appears to have good texture",
-                'water_access': "Consider water source accessibility",
-                'sunlight': "Good sunlight exposure observed"
-            },
-            'Hindi': {
-                'land_quality': "जमीन स्वस्थ और खेती के लिए उपयुक्त लगती है",
-                'soil_observation': "मिट्टी की बनावट अच्छी दिखती है",
-                'water_access': "पानी के स्रोत की पहुंच पर विचार करें",
-                'sunlight': "अच्छी धूप मिलती दिखती है"
-            },
-            'Tamil': {
-                'land_quality': "நிலம் ஆரோக்கியமாகவும் விவசாயத்திற்கு ஏற்றதாகவும் தெரிகிறது",
-                'soil_observation': "மண்ணின் அமைப்பு நல்லதாக தெரிகிறது",
-                'water_access': "நீர் ஆதார அணுகலை கருத்தில் கொள்ளுங்கள்",
-                'sunlight': "நல்ல சூரிய ஒளி கிடைப்பது தெரிகிறது"
-            },
-            'Telugu': {
-                'land_quality': "భూమి ఆరోగ్యకరంగా మరియు వ్యవసాయానికి అనుకూలంగా కనిపిస్తుంది",
-                'soil_observation': "మట్టి ఆకృతి బాగుంది",
-                'water_access': "నీటి వనరుల అందుబాటును పరిగణించండి",
-                'sunlight': "మంచి సూర్యకాంతి లభిస్తుంది"
-            }
-        }
+    def _template_fields(self, analysis, language):
+        """Map land analysis values to the localized fields used by the templates."""
+        
+        names = _VALUE_NAMES.get(language, _VALUE_NAMES['English'])
+        score = analysis['suitability_score']
+        
+        if score >= 8:
+            outlook = 'high'
+        elif score >= 5:
+            outlook = 'medium'
+        else:
+            outlook = 'low'
         
-        return assessments.get(language, assessments['English'])
\ No newline at end of file
+        return {
+            'land_size': names.get(analysis['land_size'], analysis['land_size']),
+            'land_type': names.get(analysis['land_type'], analysis['land_type']),
+            'soil_condition': names.get(analysis['soil_condition'], analysis['soil_condition']),
+            'drainage': names.get(analysis['drainage'], analysis['drainage']),
+            'sunlight': names.get(analysis['sunlight'], analysis['sunlight']),
+            'score': score,
+            'outlook': names[outlook],
+            'water_litres': _WATER_LITRES.get(analysis['land_size'], '2-3')
+        }
+
+
+def _compile(node):
+    """Turn a nested template tree into bound format functions."""
+    
+    if isinstance(node, dict):
+        return {key: _compile(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return tuple(_compile(item) for item in node)
+    return node.format_map
+
+
+def _render(node, fields):
+    """Fill a compiled template tree with analysis fields."""
+    
+    if isinstance(node, dict):
+        return {key: _render(value, fields) for key, value in node.items()}
+    if isinstance(node, tuple):
+        return [_render(item, fields) for item in node]
+    return node(fields)
+
+
+# Daily water estimate by estimated land size
+_WATER_LITRES = {
+    'Small': '2-3',
+    'Small to Medium': '20-30',
+    'Medium to Large': '200-300'
+}
+
+# Localized names for the values produced by the land analysis
+_VALUE_NAMES = {
+    'English': {
+        'Small': 'small', 'Small to Medium': 'small to medium', 'Medium to Large': 'medium to large',
+        'Farm Land': 'farm land', 'Garden/Small Farm': 'garden or small farm', 'Home Garden': 'home garden',
+        'Good': 'good', 'Fair': 'fair', 'Poor': 'poor', 'Adequate': 'adequate', 'Low': 'low', 'Partial': 'partial',
+        'high': 'Good yield expected with proper care',
+        'medium': 'Moderate yield expected, improve the weak areas first',
+        'low': 'Low yield likely until land conditions improve'
+    },
+    'Hindi': {
+        'Small': 'छोटा', 'Small to Medium': 'छोटा से मध्यम', 'Medium to Large': 'मध्यम से बड़ा',
+        'Farm Land': 'खेत', 'Garden/Small Farm': 'बगीचा या छोटा खेत', 'Home Garden': 'घर का बगीचा',
+        'Good': 'अच्छी', 'Fair': 'ठीक', 'Poor': 'कमजोर', 'Adequate': 'पर्याप्त', 'Low': 'कम', 'Partial': 'आंशिक',
+        'high': 'अच्छी देखभाल से अच्छी फसल मिलेगी',
+        'medium': 'मध्यम फसल की उम्मीद, पहले कमजोर हिस्सों को सुधारें',
+        'low': 'जमीन सुधरने तक फसल कम रह सकती है'
+    },
+    'Tamil': {
+        'Small': 'சிறிய', 'Small to Medium': 'சிறிய முதல் நடுத்தர', 'Medium to Large': 'நடுத்தர முதல் பெரிய',
+        'Farm Land': 'விவசாய நிலம்', 'Garden/Small Farm': 'தோட்டம் அல்லது சிறிய பண்ணை', 'Home Garden': 'வீட்டுத் தோட்டம்',
+        'Good': 'நல்ல', 'Fair': 'சராசரி', 'Poor': 'மோசமான', 'Adequate': 'போதுமான', 'Low': 'குறைந்த', 'Partial': 'பகுதி',
+        'high': 'நல்ல பராமரிப்பில் நல்ல மகசூல் கிடைக்கும்',
+        'medium': 'நடுத்தர மகசூல் எதிர்பார்க்கலாம், முதலில் பலவீனமான பகுதிகளை மேம்படுத்துங்கள்',
+        'low': 'நிலம் மேம்படும் வரை மகசூல் குறைவாக இருக்கலாம்'
+    },
+    'Telugu': {
+        'Small': 'చిన్న', 'Small to Medium': 'చిన్న నుండి మధ్యస్థ', 'Medium to Large': 'మధ్యస్థ నుండి పెద్ద',
+        'Farm Land': 'వ్యవసాయ భూమి', 'Garden/Small Farm': 'తోట లేదా చిన్న పొలం', 'Home Garden': 'ఇంటి తోట',
+        'Good': 'మంచి', 'Fair': 'సాధారణ', 'Poor': 'బలహీన', 'Adequate': 'సరిపడా', 'Low': 'తక్కువ', 'Partial': 'పాక్షిక',
+        'high': 'మంచి సంరక్షణతో మంచి దిగుబడి వస్తుంది',
+        'medium': 'మధ్యస్థ దిగుబడి ఆశించవచ్చు, ముందుగా బలహీన ప్రాంతాలను మెరుగుపరచండి',
+        'low': 'భూమి మెరుగుపడే వరకు దిగుబడి తక్కువగా ఉండవచ్చు'
+    }
+}
+
+# Per-language templates, filled from the land analysis by _template_fields
+_ASSESSMENT_TEMPLATES = {
+    'English': {
+        'recommendations': {
+            'suitable_crops': [
+                "Tomatoes - Good for {land_type}",
+                "Onions - Easy to grow and profitable",
+                "Leafy greens - Quick harvest"
+            ],
+            'daily_care': [
+                "Water plants early morning (6-8 AM)",
+                "Check for pests in evening",
+                "Remove weeds weekly"
+            ],
+            'water_schedule': "{water_litres} liters per day for {land_size} {land_type}",
+            'fertilizer_tips': [
+                "Use organic compost monthly",
+                "Apply NPK fertilizer every 2 weeks",
+                "Add cow dung manure before planting"
+            ],
+            'expected_yield': "{outlook} (suitability {score}/10)",
+            'improvement_tips': [
+                "Drainage is {drainage} - improve it if water stands after rain",
+                "Add mulch to retain moisture",
+                "Use companion planting"
+            ]
+        },
+        'assessment': {
+            'land_quality': "Land looks like {land_size} {land_type}, suitability {score}/10",
+            'soil_observation': "Soil condition appears {soil_condition}",
+            'water_access': "Drainage looks {drainage}; consider water source accessibility",
+            'sunlight': "Sunlight exposure observed is {sunlight}"
+        }
+    },
+    'Hindi': {
+        'recommendations': {
+            'suitable_crops': [
+                "टमाटर - {land_type} के लिए अच्छा",
+                "प्याज - उगाना आसान और मुनाफा अच्छा",
+                "पत्तेदार सब्जियां - जल्दी तैयार हो जाती हैं"
+            ],
+            'daily_care': [
+                "सुबह 6-8 बजे पानी दें",
+                "शाम को कीड़े-मकोड़े देखें",
+                "हफ्ते में एक बार घास हटाएं"
+            ],
+            'water_schedule': "{land_size} {land_type} के लिए रोज {water_litres} लिटर पानी",
+            'fertilizer_tips': [
+                "महीने में एक बार जैविक खाद डालें",
+                "2 हफ्ते में NPK खाद दें",
+                "बुवाई से पहले गोबर की खाद मिलाएं"
+            ],
+            'expected_yield': "{outlook} (उपयुक्तता {score}/10)",
+            'improvement_tips': [
+                "पानी निकासी {drainage} है - बारिश के बाद पानी रुके तो सुधारें",
+                "नमी बनाए रखने के लिए मल्चिंग करें",
+                "साथी पौधे लगाएं"
+            ]
+        },
+        'assessment': {
+            'land_quality': "जमीन {land_size} {land_type} लगती है, उपयुक्तता {score}/10",
+            'soil_observation': "मिट्टी की स्थिति {soil_condition} दिखती है",
+            'water_access': "पानी निकासी {drainage} लगती है; पानी के स्रोत की पहुंच पर विचार करें",
+            'sunlight': "धूप {sunlight} मिलती दिखती है"
+        }
+    },
+    'Tamil': {
+        'recommendations': {
+            'suitable_crops': [
+                "தக்காளி - {land_type} பகுதிக்கு நல்லது",
+                "வெங்காயம் - வளர்ப்பது எளிது, லாபம் நல்லது",
+                "கீரை வகைகள் - விரைவில் அறுவடை"
+            ],
+            'daily_care': [
+                "காலை 6-8 மணிக்கு தண்ணீர் ஊற்றவும்",
+                "மாலையில் பூச்சிகள் இருக்கிறதா பார்க்கவும்",
+                "வாரம் ஒரு முறை களை எடுக்கவும்"
+            ],
+            'water_schedule': "{land_size} {land_type} பகுதிக்கு தினமும் {water_litres} லிட்டர் தண்ணீர்",
+            'fertilizer_tips': [
+                "மாதம் ஒரு முறை இயற்கை உரம் இடவும்",
+                "2 வாரத்திற்கு ஒரு முறை NPK உரம் போடவும்",
+                "விதைப்பதற்கு முன் எருவுரம் கலக்கவும்"
+            ],
+            'expected_yield': "{outlook} (பொருத்தம் {score}/10)",
+            'improvement_tips': [
+                "நீர் வடிகால் {drainage} நிலையில் உள்ளது - மழைக்குப் பின் நீர் தேங்கினால் மேம்படுத்தவும்",
+                "ஈரப்பதம் தக்கவைக்க மல்ச்சிங் செய்யவும்",
+                "துணை செடிகள் நடவும்"
+            ]
+        },
+        'assessment': {
+            'land_quality': "நிலம் {land_size} {land_type} போல் தெரிகிறது, பொருத்தம் {score}/10",
+            'soil_observation': "மண்ணின் நிலை {soil_condition} ஆக தெரிகிறது",
+            'water_access': "நீர் வடிகால் {drainage} ஆக உள்ளது; நீர் ஆதார அணுகலை கருத்தில் கொள்ளுங்கள்",
+            'sunlight': "{sunlight} சூரிய ஒளி கிடைப்பது தெரிகிறது"
+        }
+    },
+    'Telugu': {
+        'recommendations': {
+            'suitable_crops': [
+                "టమాటా - {land_type}కి మంచిది",
+                "ఉల్లిపాయలు - పెంచడం సులభం, లాభం బాగుంది",
+                "కూరగాయలు - త్వరగా పండుతాయి"
+            ],
+            'daily_care': [
+                "ఉదయం 6-8 గంటలకు నీరు పోయండి",
+                "సాయంత్రం కీటకాలు ఉన్నాయా చూడండి",
+                "వారానికి ఒకసారి కలుపు మొక్కలు తీయండి"
+            ],
+            'water_schedule': "{land_size} {land_type} కోసం రోజుకు {water_litres} లీటర్లు నీరు",
+            'fertilizer_tips': [
+                "నెలకు ఒకసారి సేంద్రీయ ఎరువులు వేయండి",
+                "2 వారాలకు ఒకసారి NPK ఎరువు వేయండి",
+                "విత్తనాలు వేయడానికి ముందు గోమూత్రం కలపండి"
+            ],
+            'expected_yield': "{outlook} (అనుకూలత {score}/10)",
+            'improvement_tips': [
+                "నీటి వాలు {drainage}గా ఉంది - వర్షం తర్వాత నీరు నిలిస్తే మెరుగుపరచండి",
+                "తేమను నిలుపుకోవడానికి మల్చింగ్ చేయండి",
+                "సహచర మొక్కలను నాటండి"
+            ]
+        },
+        'assessment': {
+            'land_quality': "భూమి {land_size} {land_type}గా కనిపిస్తుంది, అనుకూలత {score}/10",
+            'soil_observation': "మట్టి స్థితి {soil_condition}గా ఉంది",
+            'water_access': "నీటి వాలు {drainage}గా ఉంది; నీటి వనరుల అందుబాటును పరిగణించండి",
+            'sunlight': "{sunlight} సూర్యకాంతి లభిస్తుంది"
+        }
+    }
+}
+
+# Compiled once at import so each call only fills in the analysis fields
+_COMPILED_TEMPLATES = _compile(_ASSESSMENT_TEMPLATES)
@@ -0,0 +1,181 @@
+"""
+Persistent local job queue backed by SQLite, with a thread worker pool.
+Jobs survive restarts: anything still marked running when the process died
+is put back on the queue by recover().
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobQueue:
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self.connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection().execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)")
+
+    def connection(self):
+        """
+        Connection for the calling thread, in autocommit mode with WAL so readers
+        never block the workers. Other tables kept in the same database file
+        (e.g. the requests the jobs belong to) use it too.
+        """
+
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def enqueue(self, kind, payload):
+        """Add a job and return its id."""
+
+        now = time.time()
+        cursor = self.connection().execute(
+            "INSERT INTO jobs (kind, payload, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), QUEUED, now, now)
+        )
+        return cursor.lastrowid
+
+    def claim(self):
+        """
+        Atomically take the oldest queued job.
+
+        Returns:
+            dict: The job with its decoded payload, or None if the queue is empty
+        """
+
+        row = self.connection().execute(
+            """
+            UPDATE jobs SET state = ?, attempts = attempts + 1, updated_at = ?
+            WHERE id = (SELECT id FROM jobs WHERE state = ? ORDER BY id LIMIT 1)
+            RETURNING id, kind, payload, attempts
+            """,
+            (RUNNING, time.time(), QUEUED)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'id': row['id'], 'kind': row['kind'], 'payload': json.loads(row['payload']), 'attempts': row['attempts']}
+
+    def complete(self, job_id):
+        self._set_state(job_id, DONE)
+
+    def fail(self, job_id, error):
+        """
+        Record a failure, retrying the job until max_attempts is reached.
+
+        Returns:
+            bool: True if the job has given up and will not run again
+        """
+
+        attempts = self.connection().execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()['attempts']
+        final = attempts >= self.max_attempts
+        self._set_state(job_id, FAILED if final else QUEUED, error)
+        return final
+
+    def recover(self):
+        """Requeue jobs left running by a previous process."""
+
+        return self.connection().execute(
+            "UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?", (QUEUED, time.time(), RUNNING)
+        ).rowcount
+
+    def pending_count(self):
+        return self.connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    def _set_state(self, job_id, state, error=None):
+        self.connection().execute(
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+            (state, error, time.time(), job_id)
+        )
+
+
+class WorkerPool:
+    def __init__(self, queue, handlers, workers=4, poll_interval=1.0, on_failure=None):
+        """
+        Args:
+            queue: JobQueue to take jobs from
+            handlers: Dict of job kind -> callable(payload)
+            workers: Number of worker threads
+            poll_interval: Seconds an idle worker sleeps unless notified
+            on_failure: Optional callable(job, error) for jobs that ran out of retries
+        """
+
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.on_failure = on_failure
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self.queue.recover()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'job-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self.notify(all_workers=True)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind, payload):
+        """Enqueue a job and wake an idle worker for it."""
+
+        job_id = self.queue.enqueue(kind, payload)
+        self.notify()
+        return job_id
+
+    def notify(self, all_workers=False):
+        with self._wakeup:
+            if all_workers:
+                self._wakeup.notify_all()
+            else:
+                self._wakeup.notify()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            job = self.queue.claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            try:
+                self.handlers[job['kind']](job['payload'])
+            except Exception as error:
+                if self.queue.fail(job['id'], repr(error)) and self.on_failure:
+                    self.on_failure(job, error)
+            else:
+                self.queue.complete(job['id'])
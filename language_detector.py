@@ -0,0 +1,160 @@
+"""
+Script-based language detection for farmer voice/text input.
+Languages are told apart by the Unicode block of their letters, which is
+cheap enough to run over whole batches of SMS and IVR transcripts at once.
+"""
+
+import numpy as np
+
+# Unicode blocks mapped to the languages the voice processor supports
+SCRIPT_BLOCKS = [
+    ('English', 0x0041, 0x005A),
+    ('English', 0x0061, 0x007A),
+    ('Hindi', 0x0900, 0x097F),
+    ('Tamil', 0x0B80, 0x0BFF),
+    ('Telugu', 0x0C00, 0x0C7F),
+    ('Kannada', 0x0C80, 0x0CFF)
+]
+
+SCRIPT_LANGUAGES = ['English', 'Hindi', 'Tamil', 'Telugu', 'Kannada']
+
+# Sorted block edges for np.searchsorted: code points in [edge[2k], edge[2k+1])
+# belong to block k, everything else falls in a gap and is ignored
+_EDGES = np.array([edge for _, start, end in SCRIPT_BLOCKS for edge in (start, end + 1)], dtype=np.uint32)
+_BLOCK_LANGUAGE = np.array([SCRIPT_LANGUAGES.index(language) for language, _, _ in SCRIPT_BLOCKS])
+
+
+def _code_points(text):
+    """Unicode code points of the text as a NumPy array."""
+
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def classify_code_points(text, code_points=None):
+    """
+    Classify every character of the text by script.
+
+    Returns:
+        np.ndarray: Index into SCRIPT_LANGUAGES per character, -1 for digits,
+                    spaces, punctuation and other scripts
+    """
+
+    if code_points is None:
+        code_points = _code_points(text)
+    slot = np.searchsorted(_EDGES, code_points, side='right')
+    # Odd slots fall inside a block, even slots in the gaps between blocks
+    inside = (slot % 2) == 1
+    languages = np.full(code_points.shape, -1, dtype=np.int64)
+    languages[inside] = _BLOCK_LANGUAGE[slot[inside] // 2]
+    return languages
+
+
+def detect_languages(texts, default='English'):
+    """
+    Detect the dominant script language of each text in one vectorized pass.
+
+    Args:
+        texts: List of input strings
+        default: Language for texts with no recognised letters, may be None
+
+    Returns:
+        list: One language name per text
+    """
+
+    if not texts:
+        return []
+
+    lengths = np.array([len(text) for text in texts])
+    languages = classify_code_points(''.join(texts))
+
+    # Count letters of each script per text using offsets into the joined string
+    owners = np.repeat(np.arange(len(texts)), lengths)
+    known = languages >= 0
+    cells = owners[known] * len(SCRIPT_LANGUAGES) + languages[known]
+    counts = np.bincount(cells, minlength=len(texts) * len(SCRIPT_LANGUAGES)).reshape(len(texts), -1)
+
+    # Native scripts win over Latin letters, which often carry code-mixed crop names
+    native = counts[:, 1:]
+    dominant = np.where(native.max(axis=1) > 0, native.argmax(axis=1) + 1, 0)
+    detected = np.where(counts.sum(axis=1) > 0, dominant, -1)
+
+    return [SCRIPT_LANGUAGES[index] if index >= 0 else default for index in detected]
+
+
+def detect_language(text, default='English'):
+    """Detect the dominant script language of a single text."""
+
+    return detect_languages([text], default)[0]
+
+
+def segment_languages(texts, default='English'):
+    """
+    Split each text into runs of tokens written in the same script.
+
+    Every whitespace-separated token is classified by the majority script of
+    its letters in one vectorized pass over the whole batch. Tokens without
+    letters (numbers, punctuation) join the next lettered token of the same
+    text, since quantities come before their units, or else the previous one.
+
+    Args:
+        texts: List of input strings
+        default: Language for texts with no recognised letters, may be None
+
+    Returns:
+        list: Per text, a list of (language, segment) tuples in text order
+    """
+
+    segments = [[] for _ in texts]
+    if not texts:
+        return segments
+
+    # Newlines end tokens, so no token spans two texts
+    joined = '\n'.join(texts)
+    code_points = _code_points(joined)
+    if not len(code_points):
+        return segments
+    languages = classify_code_points(joined, code_points)
+
+    is_space = (code_points == 32) | ((code_points >= 9) & (code_points <= 13))
+    previous_space = np.concatenate(([True], is_space[:-1]))
+    next_space = np.concatenate((is_space[1:], [True]))
+    token_starts = np.flatnonzero(~is_space & previous_space)
+    token_ends = np.flatnonzero(~is_space & next_space) + 1
+    token_count = len(token_starts)
+    if not token_count:
+        return segments
+
+    # Majority script per token
+    token_of_char = np.cumsum(~is_space & previous_space) - 1
+    letters = (languages >= 0) & ~is_space
+    cells = token_of_char[letters] * len(SCRIPT_LANGUAGES) + languages[letters]
+    counts = np.bincount(cells, minlength=token_count * len(SCRIPT_LANGUAGES)).reshape(token_count, -1)
+    token_language = np.where(counts.sum(axis=1) > 0, counts.argmax(axis=1), -1)
+
+    text_starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]])
+    token_text = np.searchsorted(text_starts, token_starts, side='right') - 1
+
+    # Fill tokens without letters from the next lettered token in the same text,
+    # then from the previous one, then with the default language
+    positions = np.arange(token_count)
+    has_script = token_language >= 0
+    next_lettered = np.minimum.accumulate(np.where(has_script, positions, token_count)[::-1])[::-1]
+    previous_lettered = np.maximum.accumulate(np.where(has_script, positions, -1))
+    use_next = (next_lettered < token_count) & (token_text[np.minimum(next_lettered, token_count - 1)] == token_text)
+    use_previous = ~use_next & (previous_lettered >= 0) & (token_text[np.maximum(previous_lettered, 0)] == token_text)
+    filled = np.full(token_count, SCRIPT_LANGUAGES.index(default) if default in SCRIPT_LANGUAGES else -1)
+    filled[use_next] = token_language[next_lettered[use_next]]
+    filled[use_previous] = token_language[previous_lettered[use_previous]]
+
+    # A segment starts at the first token of a text or where the language changes
+    boundary = np.ones(token_count, dtype=bool)
+    boundary[1:] = (token_text[1:] != token_text[:-1]) | (filled[1:] != filled[:-1])
+    segment_starts = np.flatnonzero(boundary)
+    segment_ends = np.append(segment_starts[1:], token_count) - 1
+
+    for first, last in zip(segment_starts, segment_ends):
+        language = SCRIPT_LANGUAGES[filled[first]] if filled[first] >= 0 else default
+        segment = joined[token_starts[first]:token_ends[last]]
+        segments[token_text[first]].append((language, segment))
+
+    return segments
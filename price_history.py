@@ -0,0 +1,412 @@
+"""
+Local price history store and batch price forecasts.
+Each mandi (market) and crop series is kept as one daily NumPy array on disk
+and memory-mapped on read, so building the crop x market price matrix does
+not parse or copy files. Forecasts for every series come from one vectorized
+Holt (double exponential smoothing) pass and are cached for the day.
+Prices ingested by another process (e.g. the CLI below) are picked up on the
+next read, by watching the index file.
+
+Ingest a CSV with date, market, crop and price (per quintal) columns:
+    python price_history.py ingest prices.csv
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import re
+import threading
+import warnings
+import numpy as np
+
+# (alpha, beta) pairs tried for every series; the one with the lowest
+# one-step-ahead error is used for its forecast
+SMOOTHING_GRID = [(alpha, beta) for alpha in (0.1, 0.3, 0.5, 0.8) for beta in (0.02, 0.1, 0.3)]
+
+# Days of history the forecasts are fitted on
+FIT_DAYS = 365
+
+# A series whose last price is older than this is left out of forecasts
+STALE_AFTER_DAYS = 60
+
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def series_key(market, crop):
+    return f'{market.strip().lower()}|{crop.strip().lower()}'
+
+
+def _stamp(path):
+    """Identity of a file's current contents, or None if it does not exist."""
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _forward_fill(values):
+    """Carry the last observed price over gaps, per row; leading gaps stay NaN."""
+
+    observed = ~np.isnan(values)
+    positions = np.where(observed, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(positions, axis=1, out=positions)
+    filled = values[np.arange(values.shape[0])[:, None], positions]
+    filled[~np.maximum.accumulate(observed, axis=1)] = np.nan
+    return filled
+
+
+def rolling_stats(values, window):
+    """
+    Rolling mean, standard deviation, minimum and maximum over the last
+    `window` days of every series at once, ignoring missing days.
+
+    Args:
+        values: Array of shape (series, days), NaN where there is no price
+        window: Window length in days
+
+    Returns:
+        dict: 'mean', 'std', 'min' and 'max' arrays shaped like values; the
+              first window - 1 days and windows without prices are NaN
+    """
+
+    values = np.asarray(values, dtype=float)
+    observed = ~np.isnan(values)
+    padded = np.zeros((values.shape[0], 1))
+    zeroed = np.where(observed, values, 0.0)
+    cumulative = np.concatenate([padded, np.cumsum(zeroed, axis=1)], axis=1)
+    squares = np.concatenate([padded, np.cumsum(zeroed ** 2, axis=1)], axis=1)
+    counts = np.concatenate([padded, np.cumsum(observed, axis=1)], axis=1)
+
+    stats = {name: np.full(values.shape, np.nan) for name in ('mean', 'std', 'min', 'max')}
+    if window > values.shape[1]:
+        return stats
+
+    sums = cumulative[:, window:] - cumulative[:, :-window]
+    square_sums = squares[:, window:] - squares[:, :-window]
+    count = counts[:, window:] - counts[:, :-window]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / count
+        variance = np.maximum(square_sums / count - mean ** 2, 0.0)
+    stats['mean'][:, window - 1:] = mean
+    stats['std'][:, window - 1:] = np.sqrt(variance)
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        stats['min'][:, window - 1:] = np.nanmin(windows, axis=2)
+        stats['max'][:, window - 1:] = np.nanmax(windows, axis=2)
+    return stats
+
+
+def holt_forecast(values, horizon, grid=SMOOTHING_GRID):
+    """
+    Forecast every series with Holt's linear exponential smoothing.
+
+    All series and all smoothing parameter pairs are updated together, one
+    day at a time, so the cost grows with the number of days rather than
+    with the number of series.
+
+    Args:
+        values: Array of shape (series, days), NaN where there is no price
+        horizon: Days ahead to forecast
+
+    Returns:
+        dict: 'forecast', 'lower' and 'upper' arrays of shape (series, horizon),
+              and per-series 'alpha', 'beta' and 'trend' (price change per day).
+              Series with fewer than two prices are NaN.
+    """
+
+    filled = _forward_fill(np.asarray(values, dtype=float))
+    # Start each series at its first price; days before it add no error
+    first = np.argmax(~np.isnan(filled), axis=1)
+    filled = np.where(np.isnan(filled), filled[np.arange(filled.shape[0]), first][:, None], filled)
+
+    alphas = np.array([alpha for alpha, _ in grid])[:, None]
+    betas = np.array([beta for _, beta in grid])[:, None]
+    level = np.repeat(filled[None, :, 0], len(grid), axis=0)
+    trend = np.zeros_like(level)
+    squared_error = np.zeros_like(level)
+    for day in range(1, filled.shape[1]):
+        error = filled[:, day] - (level + trend)
+        squared_error += error ** 2
+        level = level + trend + alphas * error
+        trend = trend + alphas * betas * error
+
+    best = np.argmin(squared_error, axis=0)
+    columns = np.arange(filled.shape[0])
+    level, trend = level[best, columns], trend[best, columns]
+    fitted_days = np.maximum(filled.shape[1] - 1 - first, 1)
+    residual = np.sqrt(squared_error[best, columns] / fitted_days)
+
+    steps = np.arange(1, horizon + 1)
+    forecast = level[:, None] + trend[:, None] * steps
+    spread = 1.96 * residual[:, None] * np.sqrt(steps)
+    too_short = np.count_nonzero(~np.isnan(values), axis=1) < 2
+    forecast[too_short] = np.nan
+    return {
+        'forecast': forecast,
+        'lower': forecast - spread,
+        'upper': forecast + spread,
+        'alpha': alphas[best, 0],
+        'beta': betas[best, 0],
+        'trend': np.where(too_short, np.nan, trend)
+    }
+
+
+class PriceHistory:
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory: Store location; defaults to $SYNAPSE_PRICE_HISTORY or ./price_history
+        """
+
+        self.directory = directory or os.environ.get('SYNAPSE_PRICE_HISTORY', 'price_history')
+        self.index_path = os.path.join(self.directory, 'index.json')
+        self._lock = threading.Lock()
+        self._arrays = {}
+        self._forecasts = {}
+        self._index = {}
+        self._index_stamp = None
+        self._file_stamps = {}
+        # Bumped whenever series change; _changed holds the version each series last changed at
+        self.version = 0
+        self._changed = {}
+        self.refresh()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    def refresh(self):
+        """
+        Reload the index if it changed on disk since it was last read, and
+        forget the mapped arrays of series whose files were rewritten.
+
+        Returns:
+            bool: True if any series changed
+        """
+
+        stamp = _stamp(self.index_path)
+        if stamp == self._index_stamp:
+            return False
+        with self._lock:
+            if stamp == self._index_stamp:
+                return False
+            index = self._read_index()
+            changed = []
+            for key, entry in index.items():
+                file_stamp = _stamp(os.path.join(self.directory, entry['file']))
+                if self._index.get(key) != entry or self._file_stamps.get(entry['file']) != file_stamp:
+                    changed.append(key)
+                    self._arrays.pop(entry['file'], None)
+                    self._file_stamps[entry['file']] = file_stamp
+            self._index = index
+            # Stamped before reading, so a write in between is read again next time
+            self._index_stamp = stamp
+            self._mark_changed(changed)
+        return bool(changed)
+
+    def _mark_changed(self, keys):
+        if not keys:
+            return
+        self.version += 1
+        for key in keys:
+            self._changed[key] = self.version
+        self._forecasts.clear()
+
+    def changed_since(self, version):
+        """
+        (market, crop) of the series that changed after a version, or of every
+        series when version is None.
+        """
+
+        self.refresh()
+        return {
+            (entry['market'], entry['crop']) for key, entry in self._index.items()
+            if version is None or self._changed.get(key, 0) > version
+        }
+
+    def keys(self):
+        """(market, crop) of every stored series."""
+
+        self.refresh()
+        return [(entry['market'], entry['crop']) for entry in self._index.values()]
+
+    def series(self, market, crop):
+        """
+        Daily prices of one series, memory-mapped read-only.
+
+        Returns:
+            tuple: (first date, np.ndarray of prices with NaN for missing days), or None
+        """
+
+        self.refresh()
+        entry = self._index.get(series_key(market, crop))
+        if entry is None:
+            return None
+        return datetime.date.fromordinal(entry['start']), self._array(entry)
+
+    def _array(self, entry):
+        array = self._arrays.get(entry['file'])
+        if array is None:
+            array = np.load(os.path.join(self.directory, entry['file']), mmap_mode='r')
+            self._arrays[entry['file']] = array
+        return array
+
+    def ingest(self, rows):
+        """
+        Merge price rows into the store; a later price for the same day replaces the earlier one.
+
+        Args:
+            rows: Iterable of dicts with 'date' (YYYY-MM-DD), 'market', 'crop' and 'price'
+
+        Returns:
+            int: Number of series written
+        """
+
+        updates = {}
+        for row in rows:
+            key = series_key(row['market'], row['crop'])
+            day = datetime.date.fromisoformat(row['date'].strip()).toordinal()
+            updates.setdefault(key, (row['market'].strip(), row['crop'].strip().lower(), {}))[2][day] = float(row['price'])
+
+        # Merge onto whatever other processes have written so far
+        self.refresh()
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for key, (market, crop, prices) in updates.items():
+                entry = self._index.get(key) or {
+                    'market': market, 'crop': crop, 'start': min(prices),
+                    'file': _SLUG.sub('_', key).strip('_') + '.npy'
+                }
+                existing = self._array(entry) if key in self._index else np.empty(0, dtype=np.float32)
+                start = min(entry['start'], min(prices))
+                end = max(entry['start'] + len(existing), max(prices) + 1)
+
+                merged = np.full(end - start, np.nan, dtype=np.float32)
+                merged[entry['start'] - start:entry['start'] - start + len(existing)] = existing
+                days = np.fromiter(prices, dtype=np.int64, count=len(prices))
+                merged[days - start] = np.fromiter(prices.values(), dtype=np.float32, count=len(prices))
+
+                # Write then rename, so readers always map a complete file
+                path = os.path.join(self.directory, entry['file'])
+                partial_path = f'{path}.{os.getpid()}.tmp.npy'
+                np.save(partial_path, merged)
+                os.replace(partial_path, path)
+                self._arrays.pop(entry['file'], None)
+                self._file_stamps[entry['file']] = _stamp(path)
+                self._index[key] = dict(entry, start=start)
+
+            partial_index = f'{self.index_path}.{os.getpid()}.tmp'
+            with open(partial_index, 'w', encoding='utf-8') as handle:
+                json.dump(self._index, handle, indent=1)
+            os.replace(partial_index, self.index_path)
+            self._index_stamp = _stamp(self.index_path)
+            self._mark_changed(list(updates))
+        return len(updates)
+
+    def ingest_csv(self, path):
+        """Ingest a CSV file with date, market, crop and price columns."""
+
+        with open(path, newline='', encoding='utf-8') as handle:
+            rows = ({name.strip().lower(): value for name, value in row.items()} for row in csv.DictReader(handle))
+            return self.ingest(row for row in rows if row.get('price'))
+
+    def matrix(self, days=FIT_DAYS, end=None):
+        """
+        Align every series on a common daily window.
+
+        Args:
+            days: Window length
+            end: Last date of the window; defaults to the latest stored price
+
+        Returns:
+            tuple: (list of (market, crop), last date, array of shape (series, days))
+        """
+
+        self.refresh()
+        entries = list(self._index.values())
+        if end is None:
+            end_day = max((entry['start'] + len(self._array(entry)) - 1 for entry in entries), default=0)
+        else:
+            end_day = end.toordinal()
+        first_day = end_day - days + 1
+
+        values = np.full((len(entries), days), np.nan)
+        for row, entry in enumerate(entries):
+            array = self._array(entry)
+            lo = max(first_day, entry['start'])
+            hi = min(end_day + 1, entry['start'] + len(array))
+            if lo < hi:
+                values[row, lo - first_day:hi - first_day] = array[lo - entry['start']:hi - entry['start']]
+        last = datetime.date.fromordinal(end_day) if entries else None
+        return [(entry['market'], entry['crop']) for entry in entries], last, values
+
+    def forecast_all(self, horizon=30, days=FIT_DAYS):
+        """
+        Forecast every series in one batch, cached until the date changes or
+        new prices are ingested, here or by another process.
+
+        Returns:
+            dict: 'keys', 'as_of' (last price date), 'last' (latest price per
+                  series) and the arrays from holt_forecast; series without a
+                  price in the last STALE_AFTER_DAYS are left out
+        """
+
+        self.refresh()
+        cache_key = (datetime.date.today(), self.version, horizon, days)
+        result = self._forecasts.get(cache_key)
+        if result is not None:
+            return result
+
+        keys, as_of, values = self.matrix(days)
+        last = _forward_fill(values)[:, -1] if keys else np.empty(0)
+        fresh = ~np.isnan(_forward_fill(values[:, -STALE_AFTER_DAYS:])[:, -1]) if keys else np.empty(0, dtype=bool)
+        result = holt_forecast(values[fresh], horizon) if keys else {}
+        result.update({
+            'keys': [key for key, keep in zip(keys, fresh) if keep],
+            'as_of': as_of,
+            'last': last[fresh]
+        })
+
+        with self._lock:
+            # Only today's forecasts are worth keeping
+            self._forecasts = {key: value for key, value in self._forecasts.items() if key[0] == cache_key[0]}
+            self._forecasts[cache_key] = result
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local crop price history store.")
+    parser.add_argument('--store', help="Store directory (default: $SYNAPSE_PRICE_HISTORY or ./price_history)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest = commands.add_parser('ingest', help="Add prices from CSV files with date, market, crop and price columns")
+    ingest.add_argument('files', nargs='+')
+    forecast = commands.add_parser('forecast', help="Print price forecasts for every stored series")
+    forecast.add_argument('--horizon', type=int, default=30)
+    forecast.add_argument('--crop')
+    arguments = parser.parse_args()
+
+    store = PriceHistory(arguments.store)
+    if arguments.command == 'ingest':
+        for path in arguments.files:
+            print(f"{path}: {store.ingest_csv(path)} series updated")
+        return
+
+    result = store.forecast_all(arguments.horizon)
+    print(f"Prices as of {result['as_of']}, forecast {arguments.horizon} days ahead (per quintal)")
+    for row, (market, crop) in enumerate(result['keys']):
+        if arguments.crop and crop != arguments.crop.lower():
+            continue
+        print(f"{crop:<15} {market:<20} {result['last'][row]:>10.0f} -> {result['forecast'][row, -1]:>10.0f} "
+              f"({result['lower'][row, -1]:.0f} to {result['upper'][row, -1]:.0f})")
+
+
+if __name__ == '__main__':
+    main()
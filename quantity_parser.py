@@ -0,0 +1,154 @@
+"""
+Quantity parsing shared by all voice input languages.
+Handles native-script digits, number words, lakh/crore notation and converts
+land areas to acres and money amounts to rupees.
+"""
+
+import re
+
+# Devanagari, Tamil, Telugu and Kannada digits mapped to ASCII
+NATIVE_DIGITS = str.maketrans({
+    chr(zero + offset): str(offset)
+    for zero in (0x0966, 0x0BE6, 0x0C66, 0x0CE6)
+    for offset in range(10)
+})
+
+# Acres per unit of land area. Bigha varies by state; the North Indian
+# (UP/Bihar) size is used as a reasonable default.
+ACRES_PER_UNIT = {
+    'acre': 1.0,
+    'hectare': 2.47105,
+    'bigha': 0.625,
+    'guntha': 0.025,
+    'cent': 0.01,
+    'sq_ft': 1 / 43560,
+    'sq_m': 1 / 4046.856
+}
+
+# Multipliers at or above this value close a group ("2 lakh 50 thousand")
+GROUP_MULTIPLIER = 1000
+
+NUMBER_WORDS = {
+    'English': {
+        'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+        'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'fifteen': 15,
+        'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70,
+        'eighty': 80, 'ninety': 90, 'half': 0.5, 'quarter': 0.25
+    },
+    'Hindi': {
+        'एक': 1, 'दो': 2, 'तीन': 3, 'चार': 4, 'पांच': 5, 'पाँच': 5, 'छह': 6, 'सात': 7,
+        'आठ': 8, 'नौ': 9, 'दस': 10, 'बीस': 20, 'पचास': 50, 'आधा': 0.5, 'डेढ़': 1.5, 'ढाई': 2.5
+    },
+    'Tamil': {
+        'ஒன்று': 1, 'ஒரு': 1, 'இரண்டு': 2, 'மூன்று': 3, 'நான்கு': 4, 'ஐந்து': 5, 'ஆறு': 6,
+        'ஏழு': 7, 'எட்டு': 8, 'ஒன்பது': 9, 'பத்து': 10, 'இருபது': 20, 'ஐம்பது': 50, 'அரை': 0.5
+    },
+    'Telugu': {
+        'ఒకటి': 1, 'ఒక': 1, 'రెండు': 2, 'మూడు': 3, 'నాలుగు': 4, 'ఐదు': 5, 'ఆరు': 6,
+        'ఏడు': 7, 'ఎనిమిది': 8, 'తొమ్మిది': 9, 'పది': 10, 'ఇరవై': 20, 'యాభై': 50, 'అర': 0.5
+    },
+    'Kannada': {
+        'ಒಂದು': 1, 'ಎರಡು': 2, 'ಮೂರು': 3, 'ನಾಲ್ಕು': 4, 'ಐದು': 5, 'ಆರು': 6, 'ಏಳು': 7,
+        'ಎಂಟು': 8, 'ಒಂಬತ್ತು': 9, 'ಹತ್ತು': 10, 'ಇಪ್ಪತ್ತು': 20, 'ಐವತ್ತು': 50, 'ಅರ್ಧ': 0.5
+    }
+}
+
+MULTIPLIER_WORDS = {
+    'English': {
+        'hundred': 100, 'thousand': 1000, 'k': 1000, 'lakh': 100000, 'lakhs': 100000,
+        'lac': 100000, 'lacs': 100000, 'crore': 10000000, 'crores': 10000000
+    },
+    'Hindi': {'सौ': 100, 'हजार': 1000, 'हज़ार': 1000, 'लाख': 100000, 'करोड़': 10000000},
+    'Tamil': {'நூறு': 100, 'ஆயிரம்': 1000, 'லட்சம்': 100000, 'கோடி': 10000000},
+    'Telugu': {'వంద': 100, 'వెయ్యి': 1000, 'వేలు': 1000, 'లక్ష': 100000, 'లక్షలు': 100000, 'కోటి': 10000000, 'కోట్లు': 10000000},
+    'Kannada': {'ನೂರು': 100, 'ಸಾವಿರ': 1000, 'ಲಕ್ಷ': 100000, 'ಕೋಟಿ': 10000000}
+}
+
+# Word characters including Indic vowel signs, which \w does not cover
+WORD_CHAR = r'[\w\u0900-\u0D7F]'
+_DIGITS = r'\d+(?:,\d+)*(?:\.\d+)?'
+
+
+def _alternation(words, leading_guard=True):
+    """Guarded alternation that only matches whole words, longest first."""
+
+    body = '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+    guard = r'(?<!{0})'.format(WORD_CHAR) if leading_guard else ''
+    return r'{0}(?:{1})(?!{2})'.format(guard, body, WORD_CHAR)
+
+
+def to_acres(value, unit):
+    """Convert a land area in the given canonical unit to acres."""
+
+    return value * ACRES_PER_UNIT.get(unit, 1.0)
+
+
+class QuantityParser:
+    def __init__(self, language='English'):
+        # English words are always accepted since code-mixed speech is common
+        self.numbers = dict(NUMBER_WORDS['English'])
+        self.numbers.update(NUMBER_WORDS.get(language, {}))
+        self.multipliers = dict(MULTIPLIER_WORDS['English'])
+        self.multipliers.update(MULTIPLIER_WORDS.get(language, {}))
+
+        number = _alternation(self.numbers)
+        fraction = _alternation(word for word, value in self.numbers.items() if value < 1)
+        # Multipliers may follow digits directly, as in "50k" or "2lakh"
+        multiplier = _alternation(self.multipliers, leading_guard=False)
+        small_multiplier = _alternation(
+            (word for word, value in self.multipliers.items() if value < GROUP_MULTIPLIER), leading_guard=False
+        )
+        joiner = r'[\s-]+(?:and[\s-]+(?:a[\s-]+)?)?'
+
+        # Number words chain into compounds ("twenty five", "one hundred and
+        # twenty", "two and a half"); digits only take a spoken fraction
+        # ("2 and a half") and never join other digits or number words
+        word_part = r'{0}(?:[\s-]*{1})*'.format(number, small_multiplier)
+        value = r'(?:{0}(?:{1}{0})*|{2}(?:[\s-]+and[\s-]+(?:a[\s-]+)?{3})?)'.format(
+            word_part, joiner, _DIGITS, fraction
+        )
+        group = r'{0}(?:[\s-]*{1})*'.format(value, multiplier)
+        scaled_group = r'{0}(?:[\s-]*{1})+'.format(value, multiplier)
+
+        # Regex fragment (no capture groups) for embedding in larger patterns.
+        # Groups only chain when each one ends in a multiplier ("2 lakh 50
+        # thousand"), so a bare number after a scaled one ("2 lakh and 3
+        # acres") starts a new quantity.
+        self.pattern = r'(?:{0}(?:{1}{0})+|{2})'.format(scaled_group, joiner, group)
+        self._token = re.compile(r'({0})|({1})|({2})'.format(_DIGITS, number, multiplier))
+        self._group_multiplier = re.compile(_alternation(
+            (word for word, value in self.multipliers.items() if value >= GROUP_MULTIPLIER and word != 'k'),
+            leading_guard=False
+        ))
+
+    def parse(self, text):
+        """
+        Parse a quantity matched by self.pattern into a number.
+
+        Args:
+            text: Matched quantity, e.g. "2.5", "२", "two and a half", "5 lakh"
+
+        Returns:
+            float: Numeric value with multipliers applied
+        """
+
+        total = 0.0
+        current = 0.0
+        for digits, word, multiplier in self._token.findall(text):
+            if digits:
+                current += float(digits.translate(NATIVE_DIGITS).replace(',', ''))
+            elif word:
+                current += self.numbers[word]
+            else:
+                scale = self.multipliers[multiplier]
+                if scale >= GROUP_MULTIPLIER:
+                    total += (current or 1) * scale
+                    current = 0.0
+                else:
+                    current = (current or 1) * scale
+        return total + current
+
+    def is_money_scale(self, text):
+        """True if the quantity uses thousand/lakh/crore wording typical of money."""
+
+        return self._group_multiplier.search(text) is not None
@@ -0,0 +1,170 @@
+"""
+Offline speech-to-text for farmer voice notes.
+Uses a CPU int8-quantized Whisper model (faster-whisper) loaded once per
+process, and transcribes audio in overlapping chunks streamed from disk so
+long recordings show partial transcripts early and use little memory.
+"""
+
+import subprocess
+import threading
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Whisper language codes for the languages the voice processor supports
+WHISPER_LANGUAGES = {
+    'English': 'en',
+    'Hindi': 'hi',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Kannada': 'kn'
+}
+
+# One model per (size, compute type) per process, shared by all transcribers
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(model_size='base', compute_type='int8', download_root=None):
+    """
+    Load a quantized Whisper model, reusing the one already loaded in this process.
+
+    Raises:
+        ImportError: If faster-whisper is not installed
+    """
+
+    key = (model_size, compute_type)
+    with _models_lock:
+        if key not in _models:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError as error:
+                raise ImportError(
+                    "Offline speech recognition needs faster-whisper: pip install faster-whisper"
+                ) from error
+            _models[key] = WhisperModel(
+                model_size, device='cpu', compute_type=compute_type, download_root=download_root
+            )
+        return _models[key]
+
+
+def stream_audio_chunks(path, chunk_seconds=30, overlap_seconds=2):
+    """
+    Decode an audio file with ffmpeg and yield overlapping mono 16 kHz chunks.
+
+    Only one chunk plus the overlap is held in memory at a time, whatever the
+    length of the recording.
+
+    Yields:
+        tuple: (offset in seconds, float32 samples, is_last_chunk)
+    """
+
+    chunk_samples = int(chunk_seconds * SAMPLE_RATE)
+    overlap_samples = int(overlap_seconds * SAMPLE_RATE)
+    step_samples = chunk_samples - overlap_samples
+
+    command = [
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', path,
+        '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def read_samples(count):
+        data = process.stdout.read(count * 2)
+        return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+    try:
+        offset = 0
+        current = read_samples(chunk_samples)
+        if not len(current) and process.wait() != 0:
+            raise RuntimeError("Could not decode audio file: " + process.stderr.read().decode(errors='replace'))
+        while len(current):
+            # Read one step ahead so the final chunk can be flagged
+            following = read_samples(step_samples)
+            is_last = len(following) == 0
+            yield offset / SAMPLE_RATE, current, is_last
+            if is_last:
+                break
+            current = np.concatenate((current[step_samples:], following))
+            offset += step_samples
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+        process.kill()
+        process.wait()
+
+
+class SpeechTranscriber:
+    def __init__(self, model_size='base', compute_type='int8', chunk_seconds=30, overlap_seconds=2,
+                 download_root=None):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.download_root = download_root
+
+    @property
+    def model(self):
+        return load_model(self.model_size, self.compute_type, self.download_root)
+
+    def warm_up(self):
+        """Load the model and run one short pass so the first request is not slow."""
+
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        segments, _ = self.model.transcribe(silence, language='en', beam_size=1)
+        list(segments)
+
+    def transcribe_stream(self, path, language=None):
+        """
+        Transcribe an audio file chunk by chunk, yielding partial transcripts.
+
+        Segments in the overlap between two chunks are kept by whichever chunk
+        has the segment's midpoint on its side of the overlap centre, so no
+        words are duplicated or dropped at chunk edges.
+
+        Args:
+            path: Path to an audio file in any format ffmpeg can decode
+            language: Voice processor language name, or None to auto-detect
+
+        Yields:
+            dict: Chunk timing, the chunk's new text and the transcript so far
+        """
+
+        whisper_language = WHISPER_LANGUAGES.get(language)
+        half_overlap = self.overlap_seconds / 2
+        parts = []
+
+        for index, (offset, samples, is_last) in enumerate(
+            stream_audio_chunks(path, self.chunk_seconds, self.overlap_seconds)
+        ):
+            duration = len(samples) / SAMPLE_RATE
+            keep_from = half_overlap if index > 0 else 0.0
+            keep_until = duration if is_last else duration - half_overlap
+
+            segments, info = self.model.transcribe(
+                samples, language=whisper_language, beam_size=1, vad_filter=True
+            )
+            chunk_text = ' '.join(
+                segment.text.strip() for segment in segments
+                if keep_from <= (segment.start + segment.end) / 2 < keep_until
+            ).strip()
+
+            if chunk_text:
+                parts.append(chunk_text)
+            yield {
+                'chunk': index,
+                'start': round(offset + keep_from, 2),
+                'end': round(offset + keep_until, 2),
+                'text': chunk_text,
+                'transcript': ' '.join(parts),
+                'detected_language': info.language,
+                'is_final': is_last
+            }
+
+    def transcribe(self, path, language=None):
+        """Transcribe a whole audio file and return the final transcript."""
+
+        transcript = ''
+        for partial in self.transcribe_stream(path, language):
+            transcript = partial['transcript']
+        return transcript
@@ -0,0 +1,124 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from budget_optimizer import AllocationOptimizer
+
+
+def optimizer():
+    return AllocationOptimizer(
+        crops=['Rice', 'Wheat', 'Cotton'],
+        profit_per_acre=[30000.0, 20000.0, 10000.0],
+        cost_per_acre=[20000.0, 10000.0, 5000.0],
+        water_per_acre=[30.0, 20.0, 12.0],
+        labour_per_acre=[40.0, 25.0, 60.0],
+        risk_per_acre=[5000.0, 3000.0, 4000.0],
+        soil_preferences=[['Clay'], ['Loamy', 'Clay'], ['Black']]
+    )
+
+
+def test_unlimited_plants_the_most_profitable_crop():
+    result = optimizer().solve([10.0])
+    assert result['acres_by_crop'] == {'Rice': 10.0, 'Wheat': 0.0, 'Cotton': 0.0}
+    assert result['profit'] == pytest.approx(300000.0)
+    assert result['fallow_acres'] == pytest.approx(0.0)
+
+
+def test_budget_prefers_profit_per_rupee():
+    result = optimizer().solve([10.0], budget=100000.0)
+    # Wheat earns 2 per rupee against Rice's 1.5, and the budget covers all the land
+    assert result['acres_by_crop']['Wheat'] == pytest.approx(10.0)
+    assert result['profit'] == pytest.approx(200000.0)
+    assert result['usage']['budget'] <= 100000.0 + 1e-6
+    assert result['binding'] == ['budget']
+
+
+def test_land_and_budget_mix():
+    result = optimizer().solve([10.0], budget=150000.0)
+    # 5 acres of Rice and 5 of Wheat use all the land and the whole budget
+    assert result['acres_by_crop']['Rice'] == pytest.approx(5.0)
+    assert result['acres_by_crop']['Wheat'] == pytest.approx(5.0)
+    assert result['profit'] == pytest.approx(250000.0)
+    assert result['usage']['budget'] == pytest.approx(150000.0)
+    assert result['fallow_acres'] == pytest.approx(0.0)
+
+
+def brute_force_profit(model, acres, limits):
+    """Best profit over every vertex of a one-plot program, each from its set of tight constraints."""
+
+    crops = len(model.crops)
+    rows = np.vstack([np.ones(crops), model.usage_per_acre.T, -np.eye(crops)])
+    bounds = np.concatenate([[acres], limits, np.zeros(crops)])
+    best = 0.0
+    for tight in itertools.combinations(range(len(rows)), crops):
+        try:
+            point = np.linalg.solve(rows[list(tight)], bounds[list(tight)])
+        except np.linalg.LinAlgError:
+            continue
+        if np.all(rows @ point <= bounds + 1e-6):
+            best = max(best, float(point @ model.profit_per_acre))
+    return best
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    model = AllocationOptimizer(
+        ['A', 'B', 'C', 'D'], rng.uniform(5000, 40000, 4), rng.uniform(5000, 30000, 4),
+        rng.uniform(10, 30, 4), rng.uniform(20, 60, 4), rng.uniform(1000, 8000, 4), [['Loamy']] * 4
+    )
+    limits = np.array([rng.uniform(50000, 200000), rng.uniform(100, 250), rng.uniform(200, 500), rng.uniform(20000, 60000)])
+    result = model.solve([10.0], budget=limits[0], water=limits[1], labour=limits[2], risk=limits[3])
+    assert result['profit'] == pytest.approx(brute_force_profit(model, 10.0, limits))
+    for name, limit in zip(['budget', 'water', 'labour', 'risk'], limits):
+        assert result['usage'][name] <= limit + 1e-6
+
+
+def test_many_plots_match_their_soil_totals():
+    soils = ['Clay', 'Loamy', 'Black'] * 100
+    acres = np.linspace(0.5, 3.0, len(soils))
+    many = optimizer().solve(acres, soils, budget=2000000.0)
+    grouped = optimizer().solve([acres[0::3].sum(), acres[1::3].sum(), acres[2::3].sum()],
+                                ['Clay', 'Loamy', 'Black'], budget=2000000.0)
+    assert many['profit'] == pytest.approx(grouped['profit'])
+    assert np.all(many['allocation'].sum(axis=1) <= acres + 1e-9)
+
+
+def test_soils_limit_crops_to_their_plots():
+    result = optimizer().solve([4.0, 6.0], plot_soils=['Loamy', 'Black'])
+    allocation = result['allocation']
+    assert allocation[0].tolist() == [0.0, 4.0, 0.0]
+    assert allocation[1].tolist() == [0.0, 0.0, 6.0]
+
+
+def test_crop_bounds_and_share():
+    result = optimizer().solve([10.0], max_crop_share=0.6, crop_bounds={'Cotton': (2.0, 3.0)})
+    acres = result['acres_by_crop']
+    assert acres['Cotton'] == pytest.approx(2.0)
+    assert acres['Rice'] == pytest.approx(6.0)
+    assert acres['Wheat'] == pytest.approx(2.0)
+    assert result['unmet_minimums'] == []
+
+
+def test_unmet_minimum_is_reported():
+    result = optimizer().solve([10.0], budget=5000.0, crop_bounds={'Rice': (1.0, 10.0)})
+    assert result['unmet_minimums'] == ['Rice']
+    assert np.all(result['allocation'] >= 0.0)
+
+
+def test_warm_start_matches_cold_solve():
+    warm = optimizer()
+    warm.solve([10.0], budget=150000.0)
+    again = warm.solve([10.0], budget=140000.0)
+    cold = optimizer().solve([10.0], budget=140000.0)
+    assert again['profit'] == pytest.approx(cold['profit'])
+    assert again['pivots'] < cold['pivots']
+
+
+def test_warm_start_after_share_change():
+    model = optimizer()
+    for share in (0.5, 0.3, 0.8, 0.5):
+        warm = model.solve([10.0], budget=150000.0, max_crop_share=share)
+        cold = optimizer().solve([10.0], budget=150000.0, max_crop_share=share)
+        assert warm['profit'] == pytest.approx(cold['profit'])
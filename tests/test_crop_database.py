@@ -0,0 +1,19 @@
+import pytest
+
+from crop_database import find_crop, get_crop_database
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Tomato', 'Tomatoes'),
+    ('potato', 'Potatoes'),
+    ('sweet potato', 'Sweet Potatoes'),
+    ('Rice', 'Rice'),
+    ('tomatoes', 'Tomatoes')
+])
+def test_find_crop_accepts_singular_names(name, expected):
+    assert find_crop(get_crop_database(), name)['name'] == expected
+
+
+def test_find_crop_unknown():
+    assert find_crop(get_crop_database(), 'dragonfruit') is None
+    assert find_crop(get_crop_database(), '') is None
@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+pytest.importorskip('streamlit')
+
+from economic_advisor import EconomicAdvisor
+from price_history import PriceHistory
+
+LOCATION = 'Chennai, Tamil Nadu'
+
+
+def names(alternatives):
+    return [crop['name'] for crop in alternatives['high_value'] + alternatives['medium_value']]
+
+
+def test_outside_ingest_reranks_alternatives(tmp_path):
+    advisor = EconomicAdvisor(price_history_dir=str(tmp_path))
+    before = advisor.get_alternative_crops('Rice', LOCATION, 'English')
+    assert names(before)[0] != 'Onion'
+
+    # Prices written by another store instance, as the CLI would
+    today = datetime.date.today()
+    PriceHistory(str(tmp_path)).ingest(
+        {'date': (today - datetime.timedelta(days=day)).isoformat(), 'market': 'Chennai', 'crop': 'Onion', 'price': 5000}
+        for day in range(30)
+    )
+    after = advisor.get_alternative_crops('Rice', LOCATION, 'English')
+    assert names(after)[0] == 'Onion'
+    assert after['high_value'][0]['margin'] > before['high_value'][0]['margin']
+
+
+def test_unchanged_store_keeps_ranking(tmp_path):
+    advisor = EconomicAdvisor(price_history_dir=str(tmp_path))
+    first = advisor.get_alternative_crops('Rice', LOCATION, 'English')
+    version = advisor.price_history.version
+    assert advisor.get_alternative_crops('Rice', LOCATION, 'English') == first
+    assert advisor.price_history.version == version
+
+
+def test_alternatives_use_localized_names(tmp_path):
+    advisor = EconomicAdvisor(price_history_dir=str(tmp_path))
+    english = advisor.get_alternative_crops('Rice', LOCATION, 'English')
+    hindi = advisor.get_alternative_crops('Rice', LOCATION, 'Hindi')
+    assert [crop['margin'] for crop in hindi['high_value']] == [crop['margin'] for crop in english['high_value']]
+    for crop in hindi['high_value'] + hindi['safe_options']:
+        assert not crop['name'].isascii()
+    # Languages without a table keep the catalogue names
+    assert advisor.get_alternative_crops('Rice', LOCATION, 'Kannada') == english
@@ -0,0 +1,25 @@
+from gazetteer import Gazetteer
+
+
+def test_exact_and_default():
+    gazetteer = Gazetteer()
+    assert gazetteer.resolve('Coimbatore')['state'] == 'Tamil Nadu'
+    assert gazetteer.resolve('somewhere unknown', default_state='Kerala') == {
+        'state': 'Kerala', 'district': None, 'place': None, 'match': 'default'
+    }
+
+
+def test_unknown_kind_from_csv(tmp_path):
+    path = tmp_path / 'places.csv'
+    path.write_text('name,district,state,kind\nAlampatti,Madurai,Tamil Nadu,hamlet\n', encoding='utf-8')
+    gazetteer = Gazetteer()
+    assert gazetteer.load_csv(str(path)) == 1
+    assert gazetteer.resolve('Alampatti')['district'] == 'Madurai'
+
+
+def test_fuzzy_match_among_many_places():
+    gazetteer = Gazetteer()
+    for number in range(5000):
+        gazetteer.add(f'Halli {number}', 'Mandya', 'Karnataka')
+    result = gazetteer.resolve('near coimbatre')
+    assert (result['state'], result['match']) == ('Tamil Nadu', 'fuzzy')
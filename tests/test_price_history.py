@@ -0,0 +1,51 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from price_history import PriceHistory, holt_forecast, rolling_stats
+
+TODAY = datetime.date.today()
+
+
+def price_rows(market, crop, prices):
+    """One row per day ending today, oldest first."""
+
+    return [
+        {'date': (TODAY - datetime.timedelta(days=len(prices) - 1 - day)).isoformat(),
+         'market': market, 'crop': crop, 'price': price}
+        for day, price in enumerate(prices)
+    ]
+
+
+def test_rolling_stats():
+    stats = rolling_stats(np.array([[1.0, 2.0, 3.0, 4.0]]), 2)
+    assert stats['mean'][0, -1] == pytest.approx(3.5)
+    assert stats['max'][0, -1] == 4.0
+
+
+def test_holt_forecast_follows_a_linear_trend():
+    result = holt_forecast(np.arange(100.0)[None, :], 10)
+    assert result['forecast'][0, -1] == pytest.approx(109.0, abs=0.5)
+    assert result['trend'][0] == pytest.approx(1.0, abs=0.05)
+
+
+def test_series_round_trip(tmp_path):
+    store = PriceHistory(str(tmp_path))
+    store.ingest(price_rows('Koyambedu', 'Tomato', [1000.0, 1100.0, 1200.0]))
+    start, prices = store.series('koyambedu', 'tomato')
+    assert start == TODAY - datetime.timedelta(days=2)
+    assert prices.tolist() == [1000.0, 1100.0, 1200.0]
+
+
+def test_ingest_from_another_process_is_seen(tmp_path):
+    reader = PriceHistory(str(tmp_path))
+    writer = PriceHistory(str(tmp_path))
+    writer.ingest(price_rows('Koyambedu', 'Tomato', [1000.0] * 30))
+    assert reader.forecast_all()['last'].tolist() == [1000.0]
+
+    version = reader.version
+    writer.ingest(price_rows('Koyambedu', 'Tomato', [5000.0]))
+    assert reader.forecast_all()['last'].tolist() == [5000.0]
+    assert reader.changed_since(version) == {('Koyambedu', 'tomato')}
+    assert reader.series('Koyambedu', 'Tomato')[1][-1] == 5000.0
@@ -0,0 +1,69 @@
+import re
+
+import pytest
+
+from entity_extractor import EntityExtractor
+from quantity_parser import QuantityParser
+
+
+@pytest.fixture(scope='module')
+def english():
+    return EntityExtractor('English')
+
+
+def parse_whole(parser, text):
+    match = re.fullmatch(parser.pattern, text)
+    assert match is not None, text
+    return parser.parse(text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2.5', 2.5),
+    ('1,50,000', 150000),
+    ('two and a half', 2.5),
+    ('2 and a half', 2.5),
+    ('twenty five', 25),
+    ('one hundred and twenty', 120),
+    ('one lakh fifty thousand', 150000),
+    ('2 lakh 50 thousand', 250000),
+    ('50k', 50000),
+    ('2lakh', 200000),
+])
+def test_compound_quantities(text, expected):
+    assert parse_whole(QuantityParser(), text) == pytest.approx(expected)
+
+
+def test_native_digits_and_words():
+    parser = QuantityParser('Hindi')
+    assert parse_whole(parser, '२') == 2
+    assert parse_whole(parser, 'डेढ़ लाख') == 150000
+
+
+@pytest.mark.parametrize('text', ['2 lakh and 3', '2,50,000 and 10', 'ten 2', '5 2'])
+def test_separate_quantities_do_not_join(text):
+    assert re.fullmatch(QuantityParser().pattern, text) is None
+
+
+def test_budget_then_land(english):
+    assert english.extract('2 lakh and 3 acre') == {'budget': 200000.0, 'land_size': 3.0, 'land_unit': 'acre'}
+
+
+def test_prefixed_budget_then_hectares(english):
+    details = english.extract('₹ 2,50,000 and 10 hectares')
+    assert details['budget'] == 250000
+    assert details['land_size'] == pytest.approx(24.7105)
+    assert details['land_unit'] == 'hectare'
+
+
+def test_number_word_then_digits(english):
+    assert english.extract('ten 2 acres') == {'land_size': 2.0, 'land_unit': 'acre'}
+
+
+def test_land_then_budget(english):
+    details = english.extract('5 acres and 2 lakh rupees')
+    assert (details['land_size'], details['budget']) == (5.0, 200000.0)
+
+
+def test_hindi_budget_and_land():
+    details = EntityExtractor('Hindi').extract('२ लाख और ३ एकड़')
+    assert (details['budget'], details['land_size']) == (200000.0, 3.0)
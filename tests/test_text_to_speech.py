@@ -0,0 +1,48 @@
+import threading
+
+import numpy as np
+
+from text_to_speech import SpeechSynthesizer, split_phrases
+
+
+def fake_engine(calls):
+    def engine(text, language):
+        calls.append((text, language))
+        return np.full(len(text), len(calls), dtype=np.int16)
+    return engine
+
+
+def test_split_phrases():
+    assert split_phrases("Water daily. • Add compost\nHarvest: week 12") == ['Water daily.', 'Add compost', 'Harvest:', 'week 12']
+
+
+def test_clips_are_synthesized_once(tmp_path):
+    calls = []
+    synthesizer = SpeechSynthesizer(str(tmp_path), fake_engine(calls))
+    first = synthesizer.clip('Water daily.')
+    assert synthesizer.clip('Water daily.') is first
+    # A new synthesizer reads the clip back from the disk cache
+    again = SpeechSynthesizer(str(tmp_path), fake_engine(calls)).clip('Water daily.')
+    assert again.tolist() == first.tolist()
+    assert calls == [('Water daily.', 'English')]
+
+
+def test_memory_cache_is_bounded_under_threads(tmp_path):
+    calls = []
+    synthesizer = SpeechSynthesizer(str(tmp_path), fake_engine(calls), memory_clips=8)
+    errors = []
+
+    def speak(worker):
+        try:
+            for phrase in range(200):
+                synthesizer.clip(f'phrase {(phrase * 7 + worker) % 40}')
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=speak, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(synthesizer._clips) <= 8
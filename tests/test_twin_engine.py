@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from twin_engine import NUTRITION_LEVELS, SENSOR_WALKS, STATE_FIELDS, bounded_walk, growth_stage, simulate
+
+
+def loop_walk(start, steps, low, high, observed=None):
+    """Day-by-day reference for bounded_walk."""
+
+    values = np.empty_like(steps, dtype=float)
+    for row in range(steps.shape[0]):
+        x = start[row]
+        for day in range(steps.shape[1]):
+            if observed is not None and not np.isnan(observed[row, day]):
+                x = observed[row, day]
+            else:
+                x = min(max(x + steps[row, day], low), high)
+            values[row, day] = x
+    return values
+
+
+def start_state(twins):
+    return {
+        'days_since_planting': np.zeros(twins, dtype=int),
+        'height_cm': np.zeros(twins),
+        'health_score': np.full(twins, 100.0),
+        'soil_moisture': np.full(twins, 60.0),
+        'temperature_c': np.full(twins, 25.0),
+        'humidity_percent': np.full(twins, 60.0),
+        'nutrition': np.zeros(twins, dtype=int)
+    }
+
+
+def test_growth_stage():
+    assert growth_stage(0) == 'Seedling'
+    assert growth_stage(10) == 'Vegetative'
+    assert growth_stage(45) == 'Flowering'
+    assert growth_stage(200) == 'Fruiting/Harvest'
+
+
+@pytest.mark.parametrize('days', [1, 2, 7, 64, 100])
+def test_bounded_walk_matches_loop(days):
+    rng = np.random.default_rng(days)
+    start = rng.uniform(30, 90, size=5)
+    steps = rng.uniform(-10, 10, size=(5, days))
+    np.testing.assert_allclose(bounded_walk(start, steps, 30, 90), loop_walk(start, steps, 30, 90))
+
+
+def test_bounded_walk_holds_observed_values():
+    rng = np.random.default_rng(1)
+    start = np.array([50.0, 50.0])
+    steps = rng.uniform(-5, 5, size=(2, 20))
+    observed = np.full((2, 20), np.nan)
+    observed[0, 5] = 85.0
+    observed[1, 10:] = 40.0
+    walk = bounded_walk(start, steps, 30, 90, observed)
+    np.testing.assert_allclose(walk, loop_walk(start, steps, 30, 90, observed))
+    assert walk[0, 5] == 85.0
+    assert np.all(walk[1, 10:] == 40.0)
+
+
+def test_simulate_shapes_and_bounds():
+    state, daily = simulate(start_state(3), 30, rng=np.random.default_rng(0), trajectory=True)
+    assert set(state) == set(STATE_FIELDS) == set(daily)
+    assert state['days_since_planting'].tolist() == [30, 30, 30]
+    assert daily['days_since_planting'][0].tolist() == list(range(1, 31))
+    for field, (low, high, _) in SENSOR_WALKS.items():
+        assert daily[field].shape == (3, 30)
+        assert np.all((daily[field] >= low) & (daily[field] <= high))
+    assert np.all(np.diff(daily['height_cm'], axis=1) > 0)
+    assert np.all((daily['health_score'] >= 0) & (daily['health_score'] <= 100))
+    assert np.all((daily['nutrition'] >= 0) & (daily['nutrition'] < len(NUTRITION_LEVELS)))
+    np.testing.assert_array_equal(daily['height_cm'][:, -1], state['height_cm'])
+
+
+def test_simulate_holds_inputs():
+    state, daily = simulate(start_state(2), 10, rng=np.random.default_rng(0), trajectory=True,
+                            inputs={'soil_moisture': 70.0, 'nutrition': np.array([2, -1])})
+    assert np.all(daily['soil_moisture'] == 70.0)
+    assert np.all(daily['nutrition'][0] == 2)
+    assert state['nutrition'][0] == 2
+
+
+def test_simulate_zero_days_keeps_state():
+    state, daily = simulate(start_state(2), 0)
+    assert daily is None
+    assert state['days_since_planting'].tolist() == [0, 0]
@@ -0,0 +1,85 @@
+import numpy as np
+
+from twin_engine import STATE_FIELDS
+from twin_history import TwinHistory
+
+
+def daily_rows(twins, first_day, days):
+    """Samples whose values encode the day, so queries are easy to check."""
+
+    day = np.arange(first_day, first_day + days)[None, :].repeat(twins, axis=0)
+    daily = {field: day.astype(float) for field in STATE_FIELDS}
+    daily['days_since_planting'] = day
+    daily['nutrition'] = (day % 4)
+    return day * 100.0, daily
+
+
+def append_days(history, twin_ids, first_day, days):
+    times, daily = daily_rows(len(twin_ids), first_day, days)
+    history.append(twin_ids, times, daily)
+
+
+def test_query_spans_chunks_and_tail(tmp_path):
+    history = TwinHistory(str(tmp_path), chunk_days=8)
+    for first_day in range(1, 31, 5):
+        append_days(history, ['a', 'b'], first_day, 5)
+    result = history.query('a')
+    assert result['days_since_planting'] == list(range(1, 31))
+    assert result['height_cm'] == [float(day) for day in range(1, 31)]
+    assert result['time'] == [day * 100.0 for day in range(1, 31)]
+    assert result['nutrition_level'][:4] == ['Low N', 'Low P', 'Low K', 'Optimal']
+    assert len(history._chunks[history._keys['a']]) >= 2
+    history.close()
+
+
+def test_query_range(tmp_path):
+    history = TwinHistory(str(tmp_path), chunk_days=8)
+    append_days(history, ['a'], 1, 40)
+    result = history.query('a', start=10, end=19)
+    assert result['days_since_planting'] == list(range(10, 20))
+    assert history.query('a', start=100)['days_since_planting'] == []
+    history.close()
+
+
+def test_query_step_averages_buckets(tmp_path):
+    history = TwinHistory(str(tmp_path), chunk_days=8)
+    append_days(history, ['a'], 1, 10)
+    result = history.query('a', step=4)
+    assert result['days_since_planting'] == [1, 5, 9]
+    assert result['height_cm'] == [2.5, 6.5, 9.5]
+    # Time and nutrition come from the last day of each bucket
+    assert result['time'] == [400.0, 800.0, 1000.0]
+    assert result['nutrition_level'] == ['Optimal', 'Optimal', 'Low P']
+    history.close()
+
+
+def test_reload_replays_journal(tmp_path):
+    history = TwinHistory(str(tmp_path), chunk_days=8)
+    append_days(history, ['a', 'b'], 1, 13)
+    expected = history.query('b')
+    history.close()
+
+    reopened = TwinHistory(str(tmp_path), chunk_days=8)
+    assert reopened.query('b') == expected
+    assert reopened.query('a')['days_since_planting'] == list(range(1, 14))
+    reopened.close()
+
+
+def test_remove_forgets_twin(tmp_path):
+    history = TwinHistory(str(tmp_path), chunk_days=4)
+    append_days(history, ['a'], 1, 10)
+    history.remove('a')
+    assert history.query('a') is None
+    append_days(history, ['a'], 1, 2)
+    assert history.query('a')['days_since_planting'] == [1, 2]
+    history.close()
+
+    reopened = TwinHistory(str(tmp_path), chunk_days=4)
+    assert reopened.query('a')['days_since_planting'] == [1, 2]
+    reopened.close()
+
+
+def test_unknown_twin(tmp_path):
+    history = TwinHistory(str(tmp_path))
+    assert history.query('missing') is None
+    history.close()
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from twin_history import TwinHistory
+from twin_registry import INITIAL_STATE, TwinRegistry
+from twin_telemetry import TelemetryBuffer
+
+
+def registry(tmp_path, seed=0, history=None):
+    return TwinRegistry(str(tmp_path / 'twins.db'), rng=np.random.default_rng(seed), history=history)
+
+
+def test_register_and_reload(tmp_path):
+    twins = registry(tmp_path)
+    first = twins.register('f1/p1', farm_id='f1', plot_id='p1', crop='Rice')
+    assert first['days_since_planting'] == 0
+    assert first['height_cm'] == INITIAL_STATE['height_cm']
+    assert twins.register('f1/p1')['version'] == first['version']
+    twins.register('f2/p1', farm_id='f2', plot_id='p1', nutrition_level='Low K')
+    twins.advance(3, ['f1/p1'])
+
+    reloaded = registry(tmp_path)
+    assert reloaded.snapshot.ids == ('f1/p1', 'f2/p1')
+    assert reloaded.get('f1/p1')['days_since_planting'] == 3
+    assert reloaded.get('f1/p1')['height_cm'] == twins.get('f1/p1')['height_cm']
+    assert reloaded.get('f2/p1')['nutrition_level'] == 'Low K'
+    assert [twin['twin_id'] for twin in reloaded.list('f2')] == ['f2/p1']
+
+
+def test_advance_subset(tmp_path):
+    twins = registry(tmp_path)
+    for twin_id in ('a', 'b', 'c'):
+        twins.register(twin_id)
+    snapshot, advanced, daily = twins.advance(5, ['c', 'a'], trajectory=True)
+    assert advanced == ['c', 'a']
+    assert [snapshot.get(twin_id)['days_since_planting'] for twin_id in ('a', 'b', 'c')] == [5, 0, 5]
+    assert daily['height_cm'].shape == (2, 5)
+    assert snapshot.get('b')['height_cm'] == INITIAL_STATE['height_cm']
+
+
+def test_snapshots_are_immutable_versions(tmp_path):
+    twins = registry(tmp_path)
+    twins.register('a')
+    before = twins.snapshot
+    after, _, _ = twins.advance(2)
+    assert after.version == before.version + 1
+    assert before.get('a')['days_since_planting'] == 0
+    with pytest.raises(ValueError):
+        before.columns['height_cm'][0] = 1.0
+
+
+def test_advance_due_carries_over_part_days(tmp_path):
+    twins = registry(tmp_path)
+    twins.register('a')
+    start = twins.snapshot.columns['last_updated'][0]
+
+    # 2.5 days due: two advance, the half day waits for the next call
+    _, advanced = twins.advance_due(10.0, now=start + 25.0)
+    assert advanced == ['a']
+    assert twins.get('a')['days_since_planting'] == 2
+    assert twins.snapshot.columns['last_updated'][0] == start + 20.0
+    assert twins.advance_due(10.0, now=start + 29.0)[1] == []
+    twins.advance_due(10.0, now=start + 30.0)
+    assert twins.get('a')['days_since_planting'] == 3
+
+
+def test_advance_due_caps_catch_up(tmp_path):
+    twins = registry(tmp_path)
+    twins.register('a')
+    twins.register('b')
+    start = twins.snapshot.columns['last_updated']
+
+    twins.advance_due(1.0, now=start.max() + 100.0, max_days=30)
+    assert [twins.get(twin_id)['days_since_planting'] for twin_id in ('a', 'b')] == [30, 30]
+    # The rest is caught up over later calls
+    for _ in range(3):
+        twins.advance_due(1.0, now=start.max() + 100.0, max_days=30)
+    assert twins.get('a')['days_since_planting'] == 100
+
+
+def test_advance_due_applies_telemetry(tmp_path):
+    twins = registry(tmp_path)
+    twins.register('a')
+    start = twins.snapshot.columns['last_updated'][0]
+    telemetry = TelemetryBuffer()
+    telemetry.ingest_records([{'twin_id': 'a', 'timestamp': start + 25.0, 'soil_moisture': 42}])
+    twins.advance_due(10.0, now=start + 30.0, telemetry=telemetry)
+    assert twins.get('a')['soil_moisture'] == 42
+
+
+def test_history_records_every_day(tmp_path):
+    history = TwinHistory(str(tmp_path / 'history'))
+    twins = registry(tmp_path, history=history)
+    twins.register('a')
+    twins.advance(4, ['a'])
+    samples = history.query('a')
+    assert samples['days_since_planting'] == [0, 1, 2, 3, 4]
+    assert samples['height_cm'][-1] == twins.get('a')['height_cm']
+    twins.remove('a')
+    assert 'a' not in twins
+    assert history.query('a') is None
+    history.close()
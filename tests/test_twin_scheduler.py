@@ -0,0 +1,52 @@
+import time
+
+import numpy as np
+
+from twin_registry import TwinRegistry
+from twin_scheduler import TwinScheduler
+
+
+def registry(tmp_path):
+    twins = TwinRegistry(str(tmp_path / 'twins.db'), rng=np.random.default_rng(0))
+    twins.register('a')
+    twins.register('b')
+    return twins
+
+
+def test_tick_advances_due_twins(tmp_path):
+    twins = registry(tmp_path)
+    scheduler = TwinScheduler(twins, seconds_per_day=10.0, max_catch_up_days=5)
+    start = twins.snapshot.columns['last_updated'].max()
+    assert scheduler.tick(now=start + 5.0) == 0
+    assert scheduler.tick(now=start + 100.0) == 2
+    # Catch-up after downtime is spread over ticks
+    assert twins.get('a')['days_since_planting'] == 5
+    assert scheduler.ticks == 2
+
+
+def test_restart_catches_up_from_saved_state(tmp_path):
+    twins = registry(tmp_path)
+    start = twins.snapshot.columns['last_updated'].max()
+    TwinScheduler(twins, seconds_per_day=10.0).tick(now=start + 30.0)
+
+    restarted = TwinRegistry(str(tmp_path / 'twins.db'), rng=np.random.default_rng(1))
+    TwinScheduler(restarted, seconds_per_day=10.0).tick(now=start + 60.0)
+    assert restarted.get('a')['days_since_planting'] == 6
+
+
+def test_background_thread_keeps_ticking(tmp_path):
+    twins = registry(tmp_path)
+    scheduler = TwinScheduler(twins, seconds_per_day=0.05, tick_interval=0.01)
+    scheduler.start()
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while twins.get('a')['days_since_planting'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+    assert twins.get('a')['days_since_planting'] >= 3
+    assert scheduler.last_error is None
+    ticks = scheduler.ticks
+    time.sleep(0.05)
+    assert scheduler.ticks == ticks
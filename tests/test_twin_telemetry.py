@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+
+from twin_telemetry import TelemetryBuffer
+
+
+@pytest.fixture(scope='module')
+def client(tmp_path_factory):
+    import Twin
+    app = Twin.create_app(str(tmp_path_factory.mktemp('twin_data')), start_scheduler=False)
+    Twin.registry.register('f1/p1')
+    return app.test_client()
+
+
+def test_ring_keeps_the_latest_readings():
+    buffer = TelemetryBuffer(capacity=4)
+    buffer.add(['a'] * 6, ['soil_moisture'] * 6, np.arange(6.0), np.arange(6.0) * 10)
+    buffer.add(['a'] * 3, ['soil_moisture'] * 3, np.arange(6.0, 9.0), np.arange(6.0, 9.0) * 10)
+    means = buffer.daily_means(['a'], [0.0], 9, 1.0)['soil_moisture'][0]
+    # Only the last four readings (days 5-8) survive
+    assert np.isnan(means[:5]).all()
+    assert means[5:].tolist() == [50.0, 60.0, 70.0, 80.0]
+    assert buffer.readings == 9
+
+
+def test_daily_means_buckets_readings():
+    buffer = TelemetryBuffer()
+    buffer.ingest_records([
+        {'twin_id': 'a', 'timestamp': 100, 'soil_moisture': 60, 'temperature_c': 20},
+        {'twin_id': 'a', 'timestamp': 150, 'soil_moisture': 70},
+        {'twin_id': 'a', 'timestamp': 320, 'soil_moisture': 40},
+        {'twin_id': 'b', 'timestamp': 120, 'soil_moisture': 55}
+    ])
+    inputs = buffer.daily_means(['a', 'b', 'c'], [100.0, 100.0, 100.0], 3, 100.0)
+    assert set(inputs) == {'soil_moisture', 'temperature_c'}
+    moisture = inputs['soil_moisture']
+    assert moisture[0, 0] == 65.0
+    assert np.isnan(moisture[0, 1])
+    assert moisture[0, 2] == 40.0
+    assert moisture[1, 0] == 55.0
+    # A twin with no readings runs free on every day
+    assert np.isnan(moisture[2]).all()
+    assert inputs['temperature_c'][0, 0] == 20.0
+
+
+def test_ingest_rejects_bad_records():
+    buffer = TelemetryBuffer()
+    accepted, rejected = buffer.ingest_records(
+        [{'twin_id': 'a', 'soil_moisture': 60}, {'soil_moisture': 60}, {'twin_id': 'x', 'soil_moisture': 'wet'}],
+        known={'a', 'x'}
+    )
+    assert (accepted, rejected) == (1, 2)
+
+
+def test_messages_accept_text_and_parsed_payloads():
+    buffer = TelemetryBuffer()
+    accepted, rejected = buffer.ingest_messages([
+        ('twins/a/soil_moisture', '65'),
+        ('twins/a/soil_moisture', b'{"value": 66, "timestamp": 5}'),
+        ('twins/a/temperature_c', 22.5),
+        ('twins/a/humidity_percent', {'value': 60, 'timestamp': 5}),
+        ('twins/a/wind', 3),
+        ('sensors/a/soil_moisture', 1)
+    ], now=5.0)
+    assert (accepted, rejected) == (4, 2)
+    inputs = buffer.daily_means(['a'], [0.0], 1, 10.0)
+    assert inputs['soil_moisture'][0, 0] == 65.5
+    assert inputs['temperature_c'][0, 0] == 22.5
+    assert inputs['humidity_percent'][0, 0] == 60.0
+
+
+def test_telemetry_route_messages(client):
+    response = client.post('/telemetry', json={'messages': [
+        {'topic': 'twins/f1/p1/soil_moisture', 'payload': '65'},
+        {'topic': 'twins/f1/p1/soil_moisture', 'payload': 64},
+        {'topic': 'twins/f1/p1/temperature_c', 'payload': {'value': 22}},
+        {'topic': 'twins/unknown/soil_moisture', 'payload': 50}
+    ]})
+    assert response.status_code == 200
+    assert response.json == {'accepted': 3, 'rejected': 1}
+
+
+def test_telemetry_route_json_lines(client):
+    lines = '\n'.join(json.dumps(record) for record in [
+        {'twin_id': 'f1/p1', 'soil_moisture': 61, 'humidity_percent': 55},
+        {'twin_id': 'demo', 'temperature_c': 24.5},
+        {'twin_id': 'unknown', 'soil_moisture': 50}
+    ])
+    response = client.post('/telemetry', data=lines, content_type='application/x-ndjson')
+    assert response.json == {'accepted': 3, 'rejected': 1}
+
+
+def test_telemetry_route_bad_body(client):
+    response = client.post('/telemetry', json={'readings': []})
+    assert response.status_code == 400
@@ -0,0 +1,162 @@
+"""
+Offline text-to-speech for farmer responses.
+Responses are split into phrases and each phrase is synthesized once with
+espeak-ng, then kept in a content-addressed cache keyed on (language, text).
+Headers, care schedules and tips repeat across responses, so most responses
+are assembled from cached clips without running the synthesizer at all.
+"""
+
+import hashlib
+import io
+import os
+import re
+import subprocess
+import threading
+import wave
+import numpy as np
+from language_detector import detect_languages
+
+SAMPLE_RATE = 22050
+
+# espeak-ng voices for the languages the voice processor supports
+ESPEAK_VOICES = {
+    'English': 'en',
+    'Hindi': 'hi',
+    'Tamil': 'ta',
+    'Telugu': 'te',
+    'Kannada': 'kn'
+}
+
+# Pause inserted between cached phrases when they are joined
+PHRASE_GAP_SECONDS = 0.25
+
+# Phrases end at sentence punctuation (including the Devanagari danda),
+# colons, semicolons and line breaks; bullets are not spoken
+_PHRASE_BREAK = re.compile(r'(?<=[.!?।:;])\s+|\n+')
+_BULLET = re.compile(r'^[\s•*\-–]+')
+
+
+def split_phrases(text):
+    """Split a response into the phrases that are cached and spoken separately."""
+
+    phrases = (_BULLET.sub('', part).strip() for part in _PHRASE_BREAK.split(text))
+    return [phrase for phrase in phrases if phrase]
+
+
+def synthesize_espeak(text, language='English'):
+    """
+    Synthesize one phrase with espeak-ng.
+
+    Returns:
+        np.ndarray: Mono int16 samples at SAMPLE_RATE
+
+    Raises:
+        RuntimeError: If espeak-ng is not installed or fails
+    """
+
+    command = ['espeak-ng', '-v', ESPEAK_VOICES.get(language, 'en'), '-s', '150', '--stdout', text]
+    try:
+        result = subprocess.run(command, capture_output=True, check=True)
+    except FileNotFoundError as error:
+        raise RuntimeError("Offline speech synthesis needs espeak-ng: apt install espeak-ng") from error
+    except subprocess.CalledProcessError as error:
+        raise RuntimeError("espeak-ng failed: " + error.stderr.decode(errors='replace')) from error
+
+    with wave.open(io.BytesIO(result.stdout)) as clip:
+        samples = np.frombuffer(clip.readframes(clip.getnframes()), dtype=np.int16)
+        rate = clip.getframerate()
+    if rate != SAMPLE_RATE:
+        # Keep every cached clip at one rate so clips can be joined directly
+        positions = np.linspace(0, len(samples) - 1, int(len(samples) * SAMPLE_RATE / rate))
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+class SpeechSynthesizer:
+    def __init__(self, cache_dir=None, engine=synthesize_espeak, memory_clips=2048):
+        """
+        Args:
+            cache_dir: Directory for cached clips, shared by all processes
+            engine: Callable(text, language) returning int16 samples at SAMPLE_RATE
+            memory_clips: Number of clips also kept in memory
+        """
+
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.cache', 'synapse', 'tts')
+        self.engine = engine
+        self.memory_clips = memory_clips
+        self._clips = {}
+        # Guards self._clips, which the job worker threads share; synthesis
+        # and file reads happen outside it
+        self._clips_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(text, language):
+        return hashlib.sha256(f'{language}\x00{text}'.encode('utf-8')).hexdigest()
+
+    def clip(self, text, language='English'):
+        """Samples for one phrase, synthesized only if it is not cached yet."""
+
+        key = self.cache_key(text, language)
+        with self._clips_lock:
+            samples = self._clips.get(key)
+        if samples is not None:
+            return samples
+
+        path = os.path.join(self.cache_dir, key[:2], key + '.pcm')
+        if os.path.exists(path):
+            samples = np.fromfile(path, dtype=np.int16)
+        else:
+            samples = self.engine(text, language)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a clip
+            partial_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            samples.tofile(partial_path)
+            os.replace(partial_path, path)
+
+        with self._clips_lock:
+            if key not in self._clips and len(self._clips) >= self.memory_clips:
+                self._clips.pop(next(iter(self._clips)))
+            self._clips[key] = samples
+        return samples
+
+    def prerender(self, phrases, language='English'):
+        """Render phrases ahead of time so responses using them need no synthesis."""
+
+        for text in phrases:
+            self._phrase_clips(text, language)
+
+    def _phrase_clips(self, text, language):
+        """
+        Clips for each phrase of a text. Each phrase is voiced by the language
+        of its script, so an English crop tip inside a Tamil response is read
+        with the English voice and shares its cached clip with English responses.
+        """
+
+        phrases = split_phrases(text)
+        languages = detect_languages(phrases, default=language)
+        return [self.clip(phrase, phrase_language) for phrase, phrase_language in zip(phrases, languages)]
+
+    def speak(self, text, language='English'):
+        """
+        Render a response as WAV audio by joining cached phrase clips.
+
+        Args:
+            text: Response text
+            language: Language for phrases without letters, e.g. bare numbers
+
+        Returns:
+            bytes: WAV file contents
+        """
+
+        gap = np.zeros(int(PHRASE_GAP_SECONDS * SAMPLE_RATE), dtype=np.int16)
+        parts = []
+        for clip in self._phrase_clips(text, language):
+            parts.extend((clip, gap))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as output:
+            output.setnchannels(1)
+            output.setsampwidth(2)
+            output.setframerate(SAMPLE_RATE)
+            output.writeframes(np.concatenate(parts[:-1]).tobytes() if parts else b'')
+        return buffer.getvalue()
@@ -0,0 +1,186 @@
+"""
+Vectorized growth model for crop digital twins.
+Any number of twins is simulated over any number of days in one pass: the
+daily noise is drawn up front, the growth factor is a sum of condition
+masks, height is a cumulative sum, and the bounded sensor and health walks
+come from a prefix scan of clamp functions instead of a day-by-day loop.
+"""
+
+import numpy as np
+
+NUTRITION_LEVELS = ['Optimal', 'Low N', 'Low P', 'Low K']
+
+# Days since planting at which each growth stage starts
+GROWTH_STAGES = [(0, 'Seedling'), (10, 'Vegetative'), (30, 'Flowering'), (60, 'Fruiting/Harvest')]
+
+# Lower bound, upper bound and largest daily step of each sensor's random walk
+SENSOR_WALKS = {
+    'soil_moisture': (30, 90, 5),
+    'temperature_c': (15, 35, 1.0),
+    'humidity_percent': (40, 80, 3)
+}
+
+# Daily chance that optimal nutrition runs low
+NUTRIENT_DEPLETION_CHANCE = 0.1
+
+# State columns, one array entry per twin
+STATE_FIELDS = ['days_since_planting', 'height_cm', 'health_score', 'soil_moisture', 'temperature_c',
+                'humidity_percent', 'nutrition']
+
+
+def growth_stage(days_since_planting):
+    """Growth stage name for a number of days since planting."""
+
+    stage = GROWTH_STAGES[0][1]
+    for first_day, name in GROWTH_STAGES:
+        if days_since_planting >= first_day:
+            stage = name
+    return stage
+
+
+def bounded_walk(start, steps, low, high, observed=None):
+    """
+    Every day's value of x = clip(x + step, low, high), for all rows at once.
+
+    One day is the clamp function f(x) = clip(x + shift, lower, upper), and
+    composing two clamp functions gives another one, so the running
+    compositions come from a prefix scan in log2(days) vectorized steps.
+    A day with an observed value is the constant function clip(x, v, v).
+
+    Args:
+        start: Value before the first day, shape (rows,)
+        steps: Daily steps, shape (rows, days)
+        low: Lower bound, a scalar or one per row with shape (rows, 1)
+        high: Upper bound, a scalar or one per row with shape (rows, 1)
+        observed: Optional values of shape (rows, days), NaN where not observed
+
+    Returns:
+        np.ndarray: Values at the end of each day, shape (rows, days)
+    """
+
+    shift = np.array(steps, dtype=float)
+    lower = np.broadcast_to(np.asarray(low, dtype=float), shift.shape).copy()
+    upper = np.broadcast_to(np.asarray(high, dtype=float), shift.shape).copy()
+    if observed is not None:
+        known = ~np.isnan(observed)
+        shift[known] = 0.0
+        lower[known] = observed[known]
+        upper[known] = observed[known]
+
+    offset = 1
+    while offset < shift.shape[1]:
+        # Day i so far covers (i - offset, i]; prepend the functions ending at i - offset
+        outer_lower, outer_upper, outer_shift = lower[:, offset:], upper[:, offset:], shift[:, offset:]
+        composed_lower = np.minimum(np.maximum(lower[:, :-offset] + outer_shift, outer_lower), outer_upper)
+        composed_upper = np.minimum(np.maximum(upper[:, :-offset] + outer_shift, outer_lower), outer_upper)
+        composed_shift = shift[:, :-offset] + outer_shift
+        lower[:, offset:], upper[:, offset:], shift[:, offset:] = composed_lower, composed_upper, composed_shift
+        offset *= 2
+
+    return np.minimum(np.maximum(np.asarray(start, dtype=float)[:, None] + shift, lower), upper)
+
+
+def _daily_inputs(value, twins, days):
+    """Broadcast a scalar, per-twin or per-day input to (twins, days), NaN meaning not set."""
+
+    if value is None:
+        return None
+    return np.broadcast_to(np.asarray(value, dtype=float).reshape((twins, -1) if np.ndim(value) else ()), (twins, days))
+
+
+def simulate(state, days, rng=None, inputs=None, trajectory=False):
+    """
+    Advance twins by a number of days.
+
+    Args:
+        state: Dict of STATE_FIELDS arrays, one entry per twin; nutrition is
+               an index into NUTRITION_LEVELS
+        days: Days to simulate
+        rng: numpy Generator for the daily noise
+        inputs: Optional dict of controlled or measured conditions:
+                'soil_moisture', 'temperature_c' and 'humidity_percent' as a
+                scalar, one value per twin or one per twin and day, with NaN
+                where the walk should run free; 'nutrition' as one
+                NUTRITION_LEVELS index per twin, -1 to keep the current level
+        trajectory: Also return every day's values
+
+    Returns:
+        tuple: (new state dict, dict of (twins, days) arrays per field or None)
+    """
+
+    rng = rng or np.random.default_rng()
+    inputs = inputs or {}
+    twins = len(state['height_cm'])
+    if days <= 0:
+        return {field: np.array(state[field]) for field in STATE_FIELDS}, None
+
+    # Sensor walks, held at the input value on days where one is given; all
+    # sensors are stacked into one scan with per-row bounds
+    fields = list(SENSOR_WALKS)
+    steps, observed = [], []
+    for field, (low, high, step) in SENSOR_WALKS.items():
+        if isinstance(step, int):
+            steps.append(rng.integers(-step, step + 1, size=(twins, days)))
+        else:
+            steps.append(rng.uniform(-step, step, size=(twins, days)))
+        given = _daily_inputs(inputs.get(field), twins, days)
+        observed.append(np.full((twins, days), np.nan) if given is None else given)
+    bounds = np.repeat(np.array([SENSOR_WALKS[field][:2] for field in fields], dtype=float), twins, axis=0)
+    walks = bounded_walk(
+        np.concatenate([np.asarray(state[field], dtype=float) for field in fields]),
+        np.concatenate(steps), bounds[:, :1], bounds[:, 1:],
+        np.concatenate(observed) if any(inputs.get(field) is not None for field in fields) else None
+    )
+    daily = dict(zip(fields, np.split(walks, len(fields))))
+
+    # Nutrition stays optimal until the first day it runs low
+    nutrition = np.array(state['nutrition'], dtype=int)
+    given = np.asarray(inputs.get('nutrition', -1), dtype=int)
+    nutrition = np.where(given >= 0, given, nutrition)
+    depleted = rng.random((twins, days)) < NUTRIENT_DEPLETION_CHANCE
+    first_depletion = np.where(depleted.any(axis=1), depleted.argmax(axis=1), days)
+    optimal = (nutrition == 0)[:, None] & (np.arange(days) <= first_depletion[:, None])
+    deficiency = rng.integers(1, len(NUTRITION_LEVELS), size=twins)
+    final_nutrition = np.where((nutrition == 0) & (first_depletion < days), deficiency, nutrition)
+
+    moisture_ok = (daily['soil_moisture'] >= 50) & (daily['soil_moisture'] <= 80)
+    temperature_ok = (daily['temperature_c'] >= 20) & (daily['temperature_c'] <= 30)
+    humidity_ok = (daily['humidity_percent'] >= 50) & (daily['humidity_percent'] <= 70)
+    growth_factor = (1.0 + np.where(moisture_ok, 0.2, -0.1) + np.where(temperature_ok, 0.3, -0.1)
+                     + 0.1 * humidity_ok + np.where(optimal, 0.2, -0.2))
+    growth_factor = np.maximum(growth_factor, 0.1)
+
+    height = np.asarray(state['height_cm'], dtype=float)[:, None] + np.cumsum(
+        rng.uniform(0.5, 1.5, size=(twins, days)) * growth_factor, axis=1
+    )
+
+    # Poor conditions cost 1-5 health points a day, good ones add 0-2, otherwise -1 to 1
+    noise = rng.random((twins, days))
+    health_change = np.where(
+        growth_factor < 0.8, -(1 + np.floor(noise * 5)),
+        np.where(growth_factor > 1.2, np.floor(noise * 3), np.floor(noise * 3) - 1)
+    )
+    health = bounded_walk(state['health_score'], health_change, 0, 100)
+
+    new_state = {
+        'days_since_planting': np.asarray(state['days_since_planting']) + days,
+        'height_cm': height[:, -1],
+        'health_score': health[:, -1],
+        'soil_moisture': daily['soil_moisture'][:, -1],
+        'temperature_c': daily['temperature_c'][:, -1],
+        'humidity_percent': daily['humidity_percent'][:, -1],
+        'nutrition': final_nutrition
+    }
+    if not trajectory:
+        return new_state, None
+
+    return new_state, {
+        'days_since_planting': np.asarray(state['days_since_planting'])[:, None] + np.arange(1, days + 1),
+        'height_cm': height,
+        'health_score': health,
+        'soil_moisture': daily['soil_moisture'],
+        'temperature_c': daily['temperature_c'],
+        'humidity_percent': daily['humidity_percent'],
+        'nutrition': np.where((nutrition == 0)[:, None] & (np.arange(days) < first_depletion[:, None]),
+                              0, final_nutrition[:, None])
+    }
@@ -0,0 +1,243 @@
+"""
+Append-only history of crop digital twin state, one sample per simulated day.
+New samples go to a shared journal file and an in-memory tail per twin;
+when a twin's tail reaches a full chunk it is written as a compressed file
+of NumPy columns and never changed again. Range queries open only the
+chunks that overlap the requested days, and decompressed chunks are cached.
+"""
+
+import functools
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from twin_engine import NUTRITION_LEVELS, STATE_FIELDS
+
+# One journal record per twin and day; 'twin' is the twin's key in the index
+RECORD = np.dtype([('twin', np.int64), ('time', np.float64)] + [
+    (field, np.int64 if field in ('days_since_planting', 'nutrition') else np.float64) for field in STATE_FIELDS
+])
+COLUMNS = ['time'] + STATE_FIELDS
+
+# Journal records kept before it is rewritten with just the unchunked tails,
+# once at least half of it is already in chunks
+JOURNAL_COMPACT_RECORDS = 1_000_000
+
+
+@functools.lru_cache(maxsize=256)
+def _load_chunk(path):
+    """Columns of a chunk file; chunks never change, so they are cached by path."""
+
+    with np.load(path) as chunk:
+        columns = {column: chunk[column] for column in COLUMNS}
+    for values in columns.values():
+        values.flags.writeable = False
+    return columns
+
+
+class TwinHistory:
+    def __init__(self, directory, chunk_days=256):
+        """
+        Args:
+            directory: Folder for the journal, twin index and chunk files
+            chunk_days: Samples per compressed chunk
+        """
+
+        self.directory = directory
+        self.chunk_days = chunk_days
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'chunks'), exist_ok=True)
+        self._index_path = os.path.join(directory, 'twins.json')
+        self._journal_path = os.path.join(directory, 'journal.bin')
+
+        index = {'next_key': 0, 'twins': {}}
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        self._next_key = index['next_key']
+        self._keys = index['twins']
+        self._chunks = {key: self._list_chunks(key) for key in self._keys.values()}
+        self._tails = {key: [] for key in self._keys.values()}
+        self._tail_sizes = dict.fromkeys(self._keys.values(), 0)
+
+        # Replay journal records that did not make it into a chunk yet
+        records = np.fromfile(self._journal_path, dtype=RECORD) if os.path.exists(self._journal_path) else np.zeros(0, RECORD)
+        for key in self._tails:
+            chunked = self._chunks[key][-1][1] if self._chunks[key] else -1
+            mine = records[(records['twin'] == key) & (records['days_since_planting'] > chunked)]
+            if len(mine):
+                self._tails[key].append(mine)
+                self._tail_sizes[key] = len(mine)
+        self._journal_records = len(records)
+        self._journal = open(self._journal_path, 'ab')
+
+    def _chunk_directory(self, key):
+        return os.path.join(self.directory, 'chunks', str(key))
+
+    def _list_chunks(self, key):
+        """(first day, last day, path) of each chunk file, in day order."""
+
+        directory = self._chunk_directory(key)
+        if not os.path.isdir(directory):
+            return []
+        chunks = []
+        for name in os.listdir(directory):
+            if name.endswith('.npz'):
+                first, last = name[:-4].split('-')
+                chunks.append((int(first), int(last), os.path.join(directory, name)))
+        return sorted(chunks)
+
+    def _save_index(self):
+        temporary = self._index_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'next_key': self._next_key, 'twins': self._keys}, f)
+        os.replace(temporary, self._index_path)
+
+    def append(self, twin_ids, times, daily):
+        """
+        Record samples for several twins.
+
+        Args:
+            twin_ids: Twins the rows belong to
+            times: Unix time of each sample, shape (twins, days)
+            daily: Dict of STATE_FIELDS arrays of shape (twins, days)
+        """
+
+        times = np.asarray(times, dtype=float)
+        twins, days = times.shape
+        if twins == 0 or days == 0:
+            return
+        with self._lock:
+            new = [twin_id for twin_id in twin_ids if twin_id not in self._keys]
+            for twin_id in new:
+                key = self._keys[twin_id] = self._next_key
+                self._next_key += 1
+                self._chunks[key], self._tails[key], self._tail_sizes[key] = [], [], 0
+            if new:
+                self._save_index()
+
+            keys = [self._keys[twin_id] for twin_id in twin_ids]
+            records = np.empty((twins, days), dtype=RECORD)
+            records['twin'] = np.array(keys)[:, None]
+            records['time'] = times
+            for field in STATE_FIELDS:
+                records[field] = daily[field]
+            self._journal.write(records.tobytes())
+            self._journal.flush()
+            self._journal_records += records.size
+
+            for key, rows in zip(keys, records):
+                self._tails[key].append(rows)
+                self._tail_sizes[key] += days
+                if self._tail_sizes[key] >= self._chunk_target(key):
+                    self._write_chunk(key)
+            if self._journal_records > max(JOURNAL_COMPACT_RECORDS, 2 * sum(self._tail_sizes.values())):
+                self._compact_journal()
+
+    def _chunk_target(self, key):
+        """
+        Samples at which a twin's tail becomes a chunk. A twin's first chunk is
+        shortened by an amount that depends on its key, so twins registered
+        together do not all compress their chunks on the same tick.
+        """
+
+        if self._chunks[key]:
+            return self.chunk_days
+        half = max(self.chunk_days // 2, 1)
+        return self.chunk_days - key % half
+
+    def _write_chunk(self, key):
+        records = np.concatenate(self._tails[key])
+        directory = self._chunk_directory(key)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{records['days_since_planting'][0]}-{records['days_since_planting'][-1]}.npz")
+        with open(path + '.tmp', 'wb') as f:
+            np.savez_compressed(f, **{column: records[column] for column in COLUMNS})
+        os.replace(path + '.tmp', path)
+        self._chunks[key].append((int(records['days_since_planting'][0]), int(records['days_since_planting'][-1]), path))
+        self._tails[key], self._tail_sizes[key] = [], 0
+
+    def _compact_journal(self):
+        """Rewrite the journal with only the samples not yet in a chunk."""
+
+        tails = [part for tail in self._tails.values() for part in tail]
+        records = np.concatenate(tails) if tails else np.zeros(0, RECORD)
+        self._journal.close()
+        records.tofile(self._journal_path + '.tmp')
+        os.replace(self._journal_path + '.tmp', self._journal_path)
+        self._journal = open(self._journal_path, 'ab')
+        self._journal_records = len(records)
+
+    def remove(self, twin_id):
+        """Forget a twin's history; a twin registered later with the same id starts afresh."""
+
+        with self._lock:
+            key = self._keys.pop(twin_id, None)
+            if key is None:
+                return
+            self._save_index()
+            self._chunks.pop(key)
+            self._tails.pop(key)
+            self._tail_sizes.pop(key)
+            shutil.rmtree(self._chunk_directory(key), ignore_errors=True)
+
+    def query(self, twin_id, start=None, end=None, step=1):
+        """
+        Samples of one twin between two days since planting, optionally downsampled.
+
+        Args:
+            twin_id: Twin to read
+            start: First day since planting, or None for the beginning
+            end: Last day since planting, or None for the latest
+            step: Days per returned point; each point averages its days and
+                  keeps the last nutrition level
+
+        Returns:
+            dict: Column lists ('days_since_planting', 'time', the state
+                  fields and 'nutrition_level'), or None for an unknown twin
+        """
+
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        with self._lock:
+            key = self._keys.get(twin_id)
+            if key is None:
+                return None
+            paths = [path for first, last, path in self._chunks[key] if last >= start and first <= end]
+            tail = list(self._tails[key])
+
+        parts = [_load_chunk(path) for path in paths]
+        if tail:
+            records = np.concatenate(tail)
+            parts.append({column: records[column] for column in COLUMNS})
+        if parts:
+            columns = {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+        else:
+            columns = {column: np.zeros(0, dtype=RECORD[column]) for column in COLUMNS}
+
+        # Days only increase, so the range is a slice
+        days = columns['days_since_planting']
+        first, last = np.searchsorted(days, start, 'left'), np.searchsorted(days, end, 'right')
+        columns = {column: values[first:last] for column, values in columns.items()}
+
+        if step > 1 and len(columns['time']):
+            days = columns['days_since_planting']
+            bucket = (days - days[0]) // step
+            starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+            ends = np.append(starts[1:], len(bucket)) - 1
+            sizes = np.diff(np.append(starts, len(bucket)))
+            columns = {
+                column: (values[ends] if column in ('time', 'nutrition') else np.add.reduceat(values, starts) / sizes)
+                for column, values in columns.items()
+            }
+            columns['days_since_planting'] = days[starts]
+
+        result = {column: np.round(values, 2).tolist() for column, values in columns.items() if column != 'nutrition'}
+        result['days_since_planting'] = columns['days_since_planting'].astype(int).tolist()
+        result['nutrition_level'] = [NUTRITION_LEVELS[level] for level in columns['nutrition'].astype(int).tolist()]
+        return result
+
+    def close(self):
+        with self._lock:
+            self._journal.close()
@@ -0,0 +1,308 @@
+"""
+Registry of crop digital twins, one per farm plot or crop.
+Twin state is held as one NumPy column per field (structure of arrays), so
+every registered twin advances together in a single vectorized engine step.
+State is published as immutable, versioned snapshots: writers build a new
+snapshot and swap it in, readers never lock. State is persisted to SQLite
+so twins survive restarts.
+"""
+
+import datetime
+import sqlite3
+import threading
+import time
+import numpy as np
+from twin_engine import NUTRITION_LEVELS, STATE_FIELDS, growth_stage, simulate
+
+# State of a newly planted twin
+INITIAL_STATE = {
+    'days_since_planting': 0,
+    'height_cm': 0.5,
+    'health_score': 100,
+    'soil_moisture': 70,
+    'temperature_c': 25,
+    'humidity_percent': 60,
+    'nutrition': 0
+}
+
+COLUMNS = STATE_FIELDS + ['last_updated']
+
+
+class TwinSnapshot:
+    """
+    Immutable state of every twin at one version. Writers never change a
+    published snapshot; they build a new one and swap it in, so readers
+    holding a snapshot always see one consistent state without locking.
+    """
+
+    def __init__(self, version, ids, info, columns, rows=None):
+        self.version = version
+        self.ids = ids
+        self.info = info
+        self.columns = columns
+        for values in columns.values():
+            values.flags.writeable = False
+        self.rows = rows if rows is not None else {twin_id: row for row, twin_id in enumerate(ids)}
+
+    def __contains__(self, twin_id):
+        return twin_id in self.rows
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, twin_id):
+        """Display fields of one twin, or None if it is not registered."""
+
+        row = self.rows.get(twin_id)
+        return None if row is None else self._fields(row)
+
+    def list(self, farm_id=None):
+        """Display fields of every twin, or of one farm's twins."""
+
+        return [self._fields(row) for row in range(len(self.ids)) if farm_id is None or self.info[row]['farm_id'] == farm_id]
+
+    def _fields(self, row):
+        days = int(self.columns['days_since_planting'][row])
+        return {
+            'twin_id': self.ids[row],
+            **self.info[row],
+            'growth_stage': growth_stage(days),
+            'days_since_planting': days,
+            'height_cm': round(float(self.columns['height_cm'][row]), 2),
+            'health_score': int(self.columns['health_score'][row]),
+            'soil_moisture': int(self.columns['soil_moisture'][row]),
+            'temperature_c': round(float(self.columns['temperature_c'][row]), 1),
+            'humidity_percent': int(self.columns['humidity_percent'][row]),
+            'nutrition_level': NUTRITION_LEVELS[int(self.columns['nutrition'][row])],
+            'last_updated': datetime.datetime.fromtimestamp(self.columns['last_updated'][row]).strftime("%Y-%m-%d %H:%M:%S"),
+            'version': self.version
+        }
+
+
+class TwinRegistry:
+    def __init__(self, path, rng=None, history=None):
+        """
+        Args:
+            path: SQLite database file for twin state
+            rng: numpy Generator for the simulation noise
+            history: Optional TwinHistory that records every simulated day
+        """
+
+        self.path = path
+        self.rng = rng or np.random.default_rng()
+        self.history = history
+        # Serializes writers only; readers take self.snapshot and never block
+        self._lock = threading.Lock()
+
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS twins (
+                id TEXT PRIMARY KEY,
+                farm_id TEXT,
+                plot_id TEXT,
+                crop TEXT,
+                days_since_planting INTEGER NOT NULL,
+                height_cm REAL NOT NULL,
+                health_score REAL NOT NULL,
+                soil_moisture REAL NOT NULL,
+                temperature_c REAL NOT NULL,
+                humidity_percent REAL NOT NULL,
+                nutrition INTEGER NOT NULL,
+                last_updated REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS twins_farm ON twins (farm_id)")
+        self.snapshot = self._load()
+
+    def _load(self):
+        rows = self._connection.execute("SELECT * FROM twins ORDER BY rowid").fetchall()
+        return TwinSnapshot(
+            0,
+            tuple(row['id'] for row in rows),
+            tuple({'farm_id': row['farm_id'], 'plot_id': row['plot_id'], 'crop': row['crop']} for row in rows),
+            {column: np.array([row[column] for row in rows], dtype=_dtype(column)) for column in COLUMNS}
+        )
+
+    def _publish(self, ids, info, columns, rows=None):
+        """Swap in a new snapshot; a single attribute assignment, so readers see the old or the new one whole."""
+
+        self.snapshot = TwinSnapshot(self.snapshot.version + 1, ids, info, columns, rows)
+        return self.snapshot
+
+    def register(self, twin_id, farm_id=None, plot_id=None, crop=None, **state):
+        """
+        Add a twin, or return the existing one with this id.
+
+        Args:
+            twin_id: Unique id, e.g. "<farm>/<plot>"
+            farm_id: Farm the plot belongs to
+            plot_id: Plot within the farm
+            crop: Crop grown on the plot
+            **state: Starting values overriding INITIAL_STATE; nutrition may be
+                     given as a level name via nutrition_level
+
+        Returns:
+            dict: The twin's fields
+        """
+
+        with self._lock:
+            current = self.snapshot
+            if twin_id not in current:
+                values = dict(INITIAL_STATE, last_updated=time.time())
+                if 'nutrition_level' in state:
+                    state['nutrition'] = NUTRITION_LEVELS.index(state.pop('nutrition_level'))
+                values.update((field, state[field]) for field in STATE_FIELDS if field in state)
+                current = self._publish(
+                    current.ids + (twin_id,),
+                    current.info + ({'farm_id': farm_id, 'plot_id': plot_id, 'crop': crop},),
+                    {column: np.append(current.columns[column], np.array([values[column]], dtype=_dtype(column)))
+                     for column in COLUMNS}
+                )
+                self._save(current, np.array([len(current) - 1]))
+                if self.history is not None:
+                    self.history.append([twin_id], [[values['last_updated']]], {field: [[values[field]]] for field in STATE_FIELDS})
+        return current.get(twin_id)
+
+    def remove(self, twin_id):
+        """Delete a twin."""
+
+        with self._lock:
+            current = self.snapshot
+            row = current.rows[twin_id]
+            self._publish(
+                current.ids[:row] + current.ids[row + 1:],
+                current.info[:row] + current.info[row + 1:],
+                {column: np.delete(values, row) for column, values in current.columns.items()}
+            )
+            self._connection.execute("DELETE FROM twins WHERE id = ?", (twin_id,))
+            if self.history is not None:
+                self.history.remove(twin_id)
+
+    def __contains__(self, twin_id):
+        return twin_id in self.snapshot
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def get(self, twin_id):
+        """Display fields of one twin from the current snapshot, or None."""
+
+        return self.snapshot.get(twin_id)
+
+    def list(self, farm_id=None):
+        """Display fields of every twin, or of one farm's twins, from the current snapshot."""
+
+        return self.snapshot.list(farm_id)
+
+    def advance(self, days=1, twin_ids=None, inputs=None, trajectory=False):
+        """
+        Advance twins in one vectorized engine step, publish and persist them.
+
+        Args:
+            days: Days to simulate
+            twin_ids: Twins to advance, or None for every registered twin
+            inputs: Engine inputs (see twin_engine.simulate), aligned with twin_ids
+            trajectory: Also return every day's values
+
+        Returns:
+            tuple: (snapshot with the advanced state, advanced twin ids,
+                    daily trajectory dict or None)
+        """
+
+        with self._lock:
+            current = self.snapshot
+            if twin_ids is None:
+                rows = np.arange(len(current))
+            else:
+                rows = np.array([current.rows[twin_id] for twin_id in twin_ids], dtype=int)
+            if len(rows) == 0:
+                return current, [], None
+
+            now = time.time()
+            columns = {column: values.copy() for column, values in current.columns.items()}
+            daily = self._step(columns, rows, days, np.full((len(rows), max(days, 0)), now), inputs, trajectory)
+            columns['last_updated'][rows] = now
+            current = self._publish(current.ids, current.info, columns, current.rows)
+            self._save(current, rows)
+            return current, [current.ids[row] for row in rows], daily
+
+    def advance_due(self, seconds_per_day, now=None, max_days=None, telemetry=None):
+        """
+        Advance every twin by the whole simulated days elapsed since it was
+        last updated, on a clock of seconds_per_day real seconds per day.
+        Twins due the same number of days advance together, and the leftover
+        part of a day carries over to the next call.
+
+        Args:
+            seconds_per_day: Real seconds per simulated day
+            now: Current time, defaults to time.time()
+            max_days: Most days any twin advances in this call, so catching
+                      up after downtime is spread over several calls
+            telemetry: Optional TelemetryBuffer whose daily means drive the
+                       sensor values on the days they cover
+
+        Returns:
+            tuple: (current snapshot, advanced twin ids)
+        """
+
+        now = time.time() if now is None else now
+        with self._lock:
+            current = self.snapshot
+            last_updated = current.columns['last_updated']
+            due = np.floor((now - last_updated) / seconds_per_day).astype(int)
+            if max_days is not None:
+                due = np.minimum(due, max_days)
+            rows = np.flatnonzero(due > 0)
+            if len(rows) == 0:
+                return current, []
+
+            columns = {column: values.copy() for column, values in current.columns.items()}
+            for days in np.unique(due[rows]).tolist():
+                group = rows[due[rows] == days]
+                inputs = None
+                if telemetry is not None:
+                    inputs = telemetry.daily_means([current.ids[row] for row in group.tolist()], last_updated[group],
+                                                   days, seconds_per_day)
+                times = last_updated[group, None] + np.arange(1, days + 1) * seconds_per_day
+                self._step(columns, group, days, times, inputs)
+            columns['last_updated'][rows] = last_updated[rows] + due[rows] * seconds_per_day
+            current = self._publish(current.ids, current.info, columns, current.rows)
+            self._save(current, rows)
+            return current, [current.ids[row] for row in rows]
+
+    def _step(self, columns, rows, days, times, inputs=None, trajectory=False):
+        """Simulate rows of the copied columns in place, recording each day in the history; times are the days' sample times."""
+
+        state = {field: columns[field][rows] for field in STATE_FIELDS}
+        new_state, daily = simulate(state, days, self.rng, inputs, trajectory or self.history is not None)
+        for field in STATE_FIELDS:
+            columns[field][rows] = new_state[field]
+        if self.history is not None and daily is not None:
+            self.history.append([self.snapshot.ids[row] for row in rows.tolist()], times, daily)
+        return daily if trajectory else None
+
+    def _save(self, snapshot, rows):
+        # Whole columns convert to Python values in one tolist() each
+        rows = rows.tolist()
+        values = zip(
+            [snapshot.ids[row] for row in rows],
+            *([snapshot.info[row][key] for row in rows] for key in ('farm_id', 'plot_id', 'crop')),
+            *(snapshot.columns[column][rows].tolist() for column in COLUMNS)
+        )
+        # An upsert keeps each twin's rowid, so twins reload in registration order
+        self._connection.execute("BEGIN")
+        self._connection.executemany(
+            f"INSERT INTO twins (id, farm_id, plot_id, crop, {', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 4))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in COLUMNS)}",
+            values
+        )
+        self._connection.execute("COMMIT")
+
+
+def _dtype(column):
+    return int if column in ('days_since_planting', 'nutrition') else float
@@ -0,0 +1,74 @@
+"""
+Background clock for the crop digital twins.
+A single thread ticks at a fixed rate and advances every registered twin
+by the simulated days that have elapsed, in one batched step, using any
+sensor telemetry received for those days. Progress is measured from each
+twin's persisted last update, so after a restart the twins catch up on the
+days they missed. A tick that overruns does not queue the ticks it missed;
+the next tick simply finds more days due.
+"""
+
+import threading
+import time
+
+
+class TwinScheduler:
+    def __init__(self, registry, seconds_per_day=60.0, tick_interval=1.0, max_catch_up_days=30, telemetry=None):
+        """
+        Args:
+            registry: TwinRegistry whose twins are advanced
+            seconds_per_day: Real seconds per simulated day
+            tick_interval: Seconds between ticks
+            max_catch_up_days: Most days a twin advances in one tick, so a long
+                               catch-up is spread over several ticks
+            telemetry: Optional TelemetryBuffer feeding measured sensor values
+        """
+
+        self.registry = registry
+        self.seconds_per_day = seconds_per_day
+        self.tick_interval = tick_interval
+        self.max_catch_up_days = max_catch_up_days
+        self.telemetry = telemetry
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.last_error = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='twin-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def tick(self, now=None):
+        """Advance every twin that has whole simulated days due; returns how many advanced."""
+
+        _, advanced = self.registry.advance_due(self.seconds_per_day, now, self.max_catch_up_days, self.telemetry)
+        self.ticks += 1
+        return len(advanced)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                self.tick()
+            except Exception as error:
+                # Keep the clock running; the twins are retried on the next tick
+                self.last_error = repr(error)
+
+            next_tick += self.tick_interval
+            now = time.monotonic()
+            if next_tick < now:
+                # Overran: drop the missed ticks instead of running them back to back
+                missed = int((now - next_tick) // self.tick_interval) + 1
+                self.skipped_ticks += missed
+                next_tick += missed * self.tick_interval
+            self._stopping.wait(next_tick - now)
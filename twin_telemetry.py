@@ -0,0 +1,220 @@
+"""
+Sensor telemetry for the crop digital twins.
+Readings are written in batches into a ring buffer per twin and sensor,
+held together in one NumPy array so a batch is a few vectorized writes.
+For simulation, the readings are averaged into one bucket per simulated
+day, and the buckets become the engine's sensor inputs, NaN where a day has
+no readings so the walk runs free on those days.
+"""
+
+import json
+import threading
+import time
+import numpy as np
+from twin_engine import SENSOR_WALKS
+
+SENSORS = list(SENSOR_WALKS)
+SENSOR_INDEX = {sensor: index for index, sensor in enumerate(SENSORS)}
+
+# MQTT-style topics are twins/<twin id>/<sensor>
+TOPIC_PREFIX = 'twins/'
+
+
+def parse_json_lines(text):
+    """Records from a JSON lines body, parsed in one call."""
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    return json.loads('[' + ','.join(lines) + ']') if lines else []
+
+
+class TelemetryBuffer:
+    def __init__(self, capacity=128):
+        """
+        Args:
+            capacity: Readings kept per twin and sensor; older ones are overwritten
+        """
+
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._slots = {}
+        # Row slot * len(SENSORS) + sensor holds one ring; unused cells have a NaN time
+        self._times = np.full((0, capacity), np.nan)
+        self._values = np.zeros((0, capacity), dtype=np.float32)
+        self._written = np.zeros(0, dtype=np.int64)
+        self.readings = 0
+
+    def _slot(self, twin_id):
+        slot = self._slots.get(twin_id)
+        if slot is None:
+            slot = self._slots[twin_id] = len(self._slots)
+            rows = (slot + 1) * len(SENSORS)
+            if rows > len(self._written):
+                # Grow geometrically so new twins rarely copy the buffers
+                grown = max(rows, 2 * len(self._written), 64 * len(SENSORS))
+                times = np.full((grown, self.capacity), np.nan)
+                times[:len(self._times)] = self._times
+                values = np.zeros((grown, self.capacity), dtype=np.float32)
+                values[:len(self._values)] = self._values
+                written = np.zeros(grown, dtype=np.int64)
+                written[:len(self._written)] = self._written
+                self._times, self._values, self._written = times, values, written
+        return slot
+
+    def add(self, twin_ids, sensors, timestamps, values):
+        """
+        Write a batch of readings.
+
+        Args:
+            twin_ids: Twin of each reading
+            sensors: Sensor name of each reading, one of SENSORS
+            timestamps: Unix time of each reading
+            values: Reading values
+        """
+
+        if not len(twin_ids):
+            return
+        sensor_index = np.array([SENSOR_INDEX[sensor] for sensor in sensors])
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=np.float32)
+
+        with self._lock:
+            slots = np.array([self._slot(twin_id) for twin_id in twin_ids])
+            ring = slots * len(SENSORS) + sensor_index
+
+            # Each reading's rank among the batch's readings for the same ring
+            order = np.argsort(ring, kind='stable')
+            ring = ring[order]
+            starts = np.flatnonzero(np.concatenate([[True], ring[1:] != ring[:-1]]))
+            sizes = np.diff(np.append(starts, len(ring)))
+            rank = np.arange(len(ring)) - np.repeat(starts, sizes)
+
+            # Only the last `capacity` readings of a ring survive the batch
+            keep = rank >= np.repeat(sizes, sizes) - self.capacity
+            position = (self._written[ring] + rank) % self.capacity
+            self._times[ring[keep], position[keep]] = timestamps[order][keep]
+            self._values[ring[keep], position[keep]] = values[order][keep]
+            self._written[ring[starts]] += sizes
+            self.readings += len(ring)
+
+    def ingest_records(self, records, known=None, now=None):
+        """
+        Add readings from records such as
+        {"twin_id": "f1/p2", "timestamp": 1718000000, "soil_moisture": 64, "temperature_c": 27.5}.
+        A missing timestamp means now; any subset of SENSORS may be given.
+
+        Args:
+            records: Iterable of record dicts
+            known: Optional container of accepted twin ids
+            now: Time for readings without a timestamp, defaults to time.time()
+
+        Returns:
+            tuple: (readings accepted, records rejected)
+        """
+
+        now = time.time() if now is None else now
+        twin_ids, sensors, timestamps, values = [], [], [], []
+        rejected = 0
+        for record in records:
+            try:
+                twin_id = record['twin_id']
+                if known is not None and twin_id not in known:
+                    raise KeyError(twin_id)
+                timestamp = float(record.get('timestamp', now))
+                readings = [(sensor, float(record[sensor])) for sensor in SENSORS if record.get(sensor) is not None]
+            except (KeyError, TypeError, ValueError, AttributeError):
+                rejected += 1
+                continue
+            for sensor, value in readings:
+                twin_ids.append(twin_id)
+                sensors.append(sensor)
+                timestamps.append(timestamp)
+                values.append(value)
+        self.add(twin_ids, sensors, timestamps, values)
+        return len(values), rejected
+
+    def ingest_messages(self, messages, known=None, now=None):
+        """
+        Add readings from MQTT-style (topic, payload) messages. The topic is
+        twins/<twin id>/<sensor>; the payload is the value, or an object with
+        "value" and optionally "timestamp", either as JSON text or already parsed.
+
+        Args:
+            messages: Iterable of (topic, payload) pairs; payloads may be bytes,
+                      str, numbers or dicts
+            known: Optional container of accepted twin ids
+            now: Time for readings without a timestamp, defaults to time.time()
+
+        Returns:
+            tuple: (readings accepted, messages rejected)
+        """
+
+        now = time.time() if now is None else now
+        twin_ids, sensors, timestamps, values = [], [], [], []
+        rejected = 0
+        for topic, payload in messages:
+            try:
+                twin_id, sensor = topic[len(TOPIC_PREFIX):].rsplit('/', 1)
+                if not topic.startswith(TOPIC_PREFIX) or sensor not in SENSOR_INDEX:
+                    raise ValueError(topic)
+                if known is not None and twin_id not in known:
+                    raise KeyError(twin_id)
+                # Payloads from a JSON request body arrive already parsed
+                if isinstance(payload, (str, bytes, bytearray)):
+                    payload = json.loads(payload)
+                if isinstance(payload, dict):
+                    value, timestamp = float(payload['value']), float(payload.get('timestamp', now))
+                else:
+                    value, timestamp = float(payload), now
+            except (KeyError, TypeError, ValueError):
+                rejected += 1
+                continue
+            twin_ids.append(twin_id)
+            sensors.append(sensor)
+            timestamps.append(timestamp)
+            values.append(value)
+        self.add(twin_ids, sensors, timestamps, values)
+        return len(values), rejected
+
+    def daily_means(self, twin_ids, start, days, seconds_per_day):
+        """
+        Mean reading of each sensor per simulated day, as engine inputs.
+
+        Args:
+            twin_ids: Twins to summarize
+            start: Unix time each twin's first day starts, one per twin
+            days: Number of days
+            seconds_per_day: Real seconds per simulated day
+
+        Returns:
+            dict: Sensor -> (twins, days) array of means, NaN on days without
+                  readings; sensors with no readings at all are left out
+        """
+
+        with self._lock:
+            slots = np.array([self._slots.get(twin_id, -1) for twin_id in twin_ids], dtype=int)
+            present = np.flatnonzero(slots >= 0)
+            if len(present) == 0:
+                return {}
+            rings = (slots[present, None] * len(SENSORS) + np.arange(len(SENSORS))).reshape(-1)
+            times = self._times[rings].reshape(len(present), len(SENSORS), self.capacity)
+            values = self._values[rings].reshape(len(present), len(SENSORS), self.capacity)
+
+        # NaN times (unused cells) fail both comparisons
+        bucket = np.floor((times - np.asarray(start, dtype=float)[present, None, None]) / seconds_per_day)
+        valid = (bucket >= 0) & (bucket < days)
+        if not valid.any():
+            return {}
+        cell = (np.arange(len(present))[:, None, None] * len(SENSORS) + np.arange(len(SENSORS))[None, :, None]) * days
+        index = (cell + np.where(valid, bucket, 0).astype(int))[valid]
+        size = len(present) * len(SENSORS) * days
+        counts = np.bincount(index, minlength=size).reshape(len(present), len(SENSORS), days)
+        sums = np.bincount(index, weights=values[valid], minlength=size).reshape(len(present), len(SENSORS), days)
+
+        inputs = {}
+        for position, sensor in enumerate(SENSORS):
+            if counts[:, position].any():
+                means = np.full((len(twin_ids), days), np.nan)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    means[present] = sums[:, position] / counts[:, position]
+                inputs[sensor] = means
+        return inputs
@@ -4,276 +4,416 @@ and converting text to speech for farmer-friendly interaction.
 """
 
 import streamlit as st
-import re
+import asyncio
+import pandas as pd
+from entity_extractor import EntityExtractor
+from language_detector import detect_languages, segment_languages
+from speech_to_text import SpeechTranscriber
+from text_to_speech import SpeechSynthesizer
+from crop_database import get_crop_database
+
+# Fields extracted from every message, in column order for batch output
+FARMING_FIELDS = [
+    'land_size', 'land_unit', 'land_type', 'crop_preference', 'location',
+    'soil_type', 'season', 'budget', 'water_availability'
+]
+
+# Section headers of the farmer response, per language
+RESPONSE_HEADERS = {
+    'English': {
+        'greeting': "Based on your input, here are my recommendations:",
+        'crop_suggestion': "Recommended crops for your land:",
+        'care_schedule': "Daily care schedule:",
+        'water_info': "Water requirements:",
+        'fertilizer_info': "Fertilizer recommendations:",
+        'yield_info': "Expected yield:",
+        'tips': "Additional tips:"
+    },
+    'Hindi': {
+        'greeting': "आपकी जानकारी के आधार पर मेरे सुझाव:",
+        'crop_suggestion': "आपकी जमीन के लिए सुझाई गई फसलें:",
+        'care_schedule': "रोज की देखभाल:",
+        'water_info': "पानी की जरूरत:",
+        'fertilizer_info': "खाद की सलाह:",
+        'yield_info': "अपेक्षित उत्पादन:",
+        'tips': "अतिरिक्त सलाह:"
+    },
+    'Tamil': {
+        'greeting': "உங்கள் தகவலின் அடிப்படையில் எனது பரிந்துரைகள்:",
+        'crop_suggestion': "உங்கள் நிலத்திற்கு பரிந்துரைக்கப்பட்ட பயிர்கள்:",
+        'care_schedule': "தினசரி பராமரிப்பு:",
+        'water_info': "நீர் தேவைகள்:",
+        'fertilizer_info': "உர பரிந்துரைகள்:",
+        'yield_info': "எதிர்பார்க்கப்படும் மகசூல்:",
+        'tips': "கூடுதல் குறிப்புகள்:"
+    },
+    'Telugu': {
+        'greeting': "మీ సమాచారం ఆధారంగా నా సిఫార్సులు:",
+        'crop_suggestion': "మీ భూమికి సిఫార్సు చేయబడిన పంటలు:",
+        'care_schedule': "రోజువారీ సంరక్షణ:",
+        'water_info': "నీటి అవసరాలు:",
+        'fertilizer_info': "ఎరువుల సిఫార్సులు:",
+        'yield_info': "ఊహించిన దిగుబడి:",
+        'tips': "అదనపు సలహాలు:"
+    }
+}
+
+# Slots needed before crop recommendations can be made, in the order they are asked
+REQUIRED_SLOTS = ['land_size', 'soil_type', 'season', 'budget']
+
+# Slots filled with less confidence than this are read back for confirmation
+CONFIRM_BELOW = 0.75
+
+# Questions asked for missing slots, and the read-back for uncertain ones
+CLARIFYING_QUESTIONS = {
+    'English': {
+        'land_size': "How much land do you have? (for example: 2 acres)",
+        'soil_type': "What type of soil do you have? (clay, sandy, loamy, black or red)",
+        'season': "In which season do you want to plant?",
+        'budget': "How much money can you spend on cultivation? (₹)",
+        'crop_preference': "Which crop would you like to grow?",
+        'water_availability': "What is your water source? (canal, borewell, well or rain-fed)",
+        'confirm': "Did you say {value}?"
+    },
+    'Hindi': {
+        'land_size': "आपके पास कितनी जमीन है? (जैसे: 2 एकड़)",
+        'soil_type': "आपकी मिट्टी किस प्रकार की है? (चिकनी, रेतीली, दोमट, काली या लाल)",
+        'season': "आप किस मौसम में बुवाई करना चाहते हैं?",
+        'budget': "आप खेती पर कितना पैसा खर्च कर सकते हैं? (₹)",
+        'crop_preference': "आप कौन सी फसल उगाना चाहते हैं?",
+        'water_availability': "आपके पानी का स्रोत क्या है? (नहर, बोरवेल, कुआं या बारानी)",
+        'confirm': "क्या आपने {value} कहा?"
+    },
+    'Tamil': {
+        'land_size': "உங்களிடம் எவ்வளவு நிலம் உள்ளது? (உதாரணம்: 2 ஏக்கர்)",
+        'soil_type': "உங்கள் மண் எந்த வகை? (களிமண், மணல், கலவை, கருப்பு அல்லது சிவப்பு)",
+        'season': "எந்த பருவத்தில் பயிரிட விரும்புகிறீர்கள்?",
+        'budget': "சாகுபடிக்கு எவ்வளவு பணம் செலவிட முடியும்? (₹)",
+        'crop_preference': "எந்த பயிரை வளர்க்க விரும்புகிறீர்கள்?",
+        'water_availability': "உங்கள் நீர் ஆதாரம் என்ன? (கால்வாய், ஆழ்துளை கிணறு, கிணறு அல்லது மானாவாரி)",
+        'confirm': "நீங்கள் {value} என்று சொன்னீர்களா?"
+    },
+    'Telugu': {
+        'land_size': "మీకు ఎంత భూమి ఉంది? (ఉదాహరణ: 2 ఎకరాలు)",
+        'soil_type': "మీ నేల ఏ రకం? (బంకమట్టి, ఇసుకమట్టి, లోమిమట్టి, నల్లమట్టి లేదా ఎర్రమట్టి)",
+        'season': "మీరు ఏ కాలంలో పంట వేయాలనుకుంటున్నారు?",
+        'budget': "సాగుకు మీరు ఎంత డబ్బు ఖర్చు చేయగలరు? (₹)",
+        'crop_preference': "మీరు ఏ పంట పండించాలనుకుంటున్నారు?",
+        'water_availability': "మీ నీటి వనరు ఏమిటి? (కాలువ, బోరుబావి, బావి లేదా వర్షాధారం)",
+        'confirm': "మీరు {value} అన్నారా?"
+    },
+    'Kannada': {
+        'land_size': "ನಿಮ್ಮ ಬಳಿ ಎಷ್ಟು ಜಮೀನು ಇದೆ? (ಉದಾಹರಣೆ: 2 ಎಕರೆ)",
+        'soil_type': "ನಿಮ್ಮ ಮಣ್ಣು ಯಾವ ಬಗೆಯದು?",
+        'season': "ನೀವು ಯಾವ ಋತುವಿನಲ್ಲಿ ಬಿತ್ತನೆ ಮಾಡಲು ಬಯಸುತ್ತೀರಿ?",
+        'budget': "ಕೃಷಿಗೆ ನೀವು ಎಷ್ಟು ಹಣ ಖರ್ಚು ಮಾಡಬಹುದು? (₹)",
+        'crop_preference': "ನೀವು ಯಾವ ಬೆಳೆ ಬೆಳೆಯಲು ಬಯಸುತ್ತೀರಿ?",
+        'water_availability': "ನಿಮ್ಮ ನೀರಿನ ಮೂಲ ಯಾವುದು? (ಕಾಲುವೆ, ಕೊಳವೆಬಾವಿ, ಬಾವಿ ಅಥವಾ ಮಳೆಯಾಶ್ರಿತ)",
+        'confirm': "ನೀವು {value} ಎಂದು ಹೇಳಿದಿರಾ?"
+    }
+}
+
+# Care advice read out under the matching response headers
+CARE_ADVICE = {
+    'care_schedule': [
+        "Water plants early morning (6-8 AM)",
+        "Check for pests and diseases",
+        "Remove weeds regularly",
+        "Monitor soil moisture"
+    ],
+    'water_info': [
+        "2-3 liters per plant per day",
+        "Water early morning or evening",
+        "Check soil moisture before watering"
+    ],
+    'fertilizer_info': [
+        "Use organic compost monthly",
+        "Apply NPK fertilizer bi-weekly",
+        "Add cow dung before planting"
+    ]
+}
 
 class VoiceProcessor:
-    def __init__(self):
+    def __init__(self, transcriber=None, synthesizer=None):
         self.supported_languages = ['English', 'Hindi', 'Tamil', 'Telugu', 'Kannada']
-        A
+        # One compiled matcher per language, built once and reused for every message
+        self.entity_extractors = {
+            language: EntityExtractor(language) for language in self.supported_languages
+        }
+        # Offline speech recognition; the model itself is shared per process
+        self.transcriber = transcriber or SpeechTranscriber()
+        # Offline speech output with cached phrase clips
+        self.synthesizer = synthesizer or SpeechSynthesizer()
+        
+    def warm_up_speech_model(self):
+        """
+        Load and warm the offline speech model at startup.
+        
+        Returns:
+            bool: False if the speech recognition backend is not installed
+        """
+        
+        try:
+            self.transcriber.warm_up()
+        except ImportError:
+            return False
+        return True
+    
+    def transcribe_voice_note(self, audio_path, language=None):
+        """
+        Transcribe a recorded voice note offline, yielding partial transcripts.
+        
+        Args:
+            audio_path: Path to the audio file on disk
+            language: Expected language, or None to let the model detect it
+            
+        Yields:
+            dict: Partial transcript after each audio chunk
+        """
+        
+        return self.transcriber.transcribe_stream(audio_path, language)
+    
+    def process_voice_file(self, audio_path, language=None):
+        """Transcribe a voice note and extract farming information from it."""
+        
+        transcript = self.transcriber.transcribe(audio_path, language)
+        extracted_info = self.process_voice_input(transcript, language or 'English')
+        extracted_info['transcript'] = transcript
+        return extracted_info
+    
     def process_voice_input(self, text_input, detected_language='English'):
         """
         Process voice/text input and extract farming-related information.
         
+        The language of each part of the text is detected from its script, so
+        mixed input such as "2 ஏக்கர் paddy" is routed to the right extractors.
+        
         Args:
             text_input: Transcribed text from voice or direct text input
-            detected_language: Detected language of the input
+            detected_language: Language chosen in the UI, used only for text
+                               without any recognisable script (e.g. just numbers)
             
         Returns:
             dict: Extracted farming information
         """
         
-        # Normalize text input
-        text_input = text_input.lower().strip()
+        columns = self._extract_columns([text_input], detected_language)
+        return {field: values[0] for field, values in columns.items()}
+    
+    def fill_slots(self, text_input, detected_language='English', required_slots=REQUIRED_SLOTS):
+        """
+        Fill farming slots from one message and work out what to ask next.
+        
+        Args:
+            text_input: Transcribed text from voice or direct text input
+            detected_language: Language chosen in the UI, also used for the questions
+            required_slots: Slots that must be known before recommending crops
+            
+        Returns:
+            dict: 'slots' with the extracted values, 'confidence' per found slot
+                  (0 to 1), 'missing' required slots, and 'questions' to ask
+        """
         
-        # Extract farming details based on language
-        extracted_info = self._extract_farming_details(text_input, detected_language)
+        columns = self._extract_columns([text_input], detected_language, with_confidence=True)
+        confidence = columns.pop('confidence')[0]
+        slots = {field: values[0] for field, values in columns.items()}
+        missing = [slot for slot in required_slots if slots.get(slot) is None]
         
-        return extracted_info
-    
-    def _extract_farming_details(self, text, language):
-        """Extract farming details from text input."""
-        
-        # Initialize extraction results
-        farming_info = {
-            'land_size': None,
-            'land_type': None,
-            'crop_preference': None,
-            'location': None,
-            'soil_type': None,
-            'season': None,
-            'budget': None,
-            'water_availability': None,
-            'language': language
+        return {
+            'slots': slots,
+            'confidence': confidence,
+            'missing': missing,
+            'questions': self.clarifying_questions(slots, confidence, missing, detected_language)
         }
+    
+    def clarifying_questions(self, slots, confidence, missing, language='English'):
+        """Questions for missing slots, then read-backs for uncertain ones."""
         
-        # Language-specific keyword extraction
-        if language == 'Hindi':
-            farming_info.update(self._extract_hindi_details(text))
-        elif language == 'Tamil':
-            farming_info.update(self._extract_tamil_details(text))
-        elif language == 'Telugu':
-            farming_info.update(self._extract_telugu_details(text))
-        elif language == 'Kannada':
-            farming_info.update(self._extract_kannada_details(text))
-        else:
-            farming_info.update(self._extract_english_details(text))
+        questions = CLARIFYING_QUESTIONS.get(language, CLARIFYING_QUESTIONS['English'])
+        asked = [questions[slot] for slot in missing if slot in questions]
         
-        return farming_info
-    
-    def _extract_english_details(self, text):
-        """Extract farming details from English text."""
+        for slot, score in confidence.items():
+            if score < CONFIRM_BELOW and slot in questions:
+                value = self._spoken_value(slot, slots)
+                # Values that mean nothing when read back are asked for again
+                asked.append(questions[slot] if value is None else questions['confirm'].format(value=value))
         
-        details = {}
+        return asked
+    
+    @staticmethod
+    def _spoken_value(slot, slots):
+        """Slot value as it is read back to the farmer, or None if it cannot be."""
+        
+        if slot == 'water_availability':
+            # Stored as a High/Medium/Low level, not the source the farmer named
+            return None
+        if slot == 'land_size':
+            return f"{slots['land_size']:g} acres"
+        if slot == 'budget':
+            return f"₹{slots['budget']:,.0f}"
+        return slots[slot]
+    
+    def process_voice_input_batch(self, text_inputs, detected_languages=None):
+        """
+        Process many voice/text inputs at once, e.g. a burst of SMS messages.
         
-        # Land size extraction
-        size_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:acre|acres|hectare|hectares)',
-            r'(\d+(?:\.\d+)?)\s*(?:bigha|bighas)',
-            r'(\d+(?:\.\d+)?)\s*(?:square feet|sq ft|square meter|sq m)'
-        ]
+        Args:
+            text_inputs: List of transcribed texts
+            detected_languages: Fallback language for texts without a recognisable
+                                script; one for all, a list with one per text, or None
+            
+        Returns:
+            pd.DataFrame: One row per input with a column per extracted field
+        """
         
-        for pattern in size_patterns:
-            match = re.search(pattern, text)
-            if match:
-                details['land_size'] = float(match.group(1))
-                break
-        
-        # Crop extraction
-        crops = ['rice', 'wheat', 'corn', 'tomato', 'potato', 'onion', 'sugarcane', 'cotton', 'turmeric']
-        for crop in crops:
-            if crop in text:
-                details['crop_preference'] = crop.capitalize()
-                break
-        
-        # Soil type extraction
-        soil_types = ['clay', 'sandy', 'loamy', 'silty', 'black', 'red']
-        for soil in soil_types:
-            if soil in text:
-                details['soil_type'] = soil.capitalize()
-                break
-        
-        # Season extraction
-        seasons = ['spring', 'summer', 'winter', 'monsoon', 'rainy']
-        for season in seasons:
-            if season in text:
-                details['season'] = season.capitalize()
-                break
-        
-        return details
+        columns = self._extract_columns(text_inputs, detected_languages)
+        return pd.DataFrame(columns, columns=FARMING_FIELDS + ['language'])
     
-    def _extract_hindi_details(self, text):
-        """Extract farming details from Hindi text."""
-        
-        details = {}
-        
-        # Common Hindi farming terms
-        if 'एकड़' in text:
-            # Extract acre information
-            match = re.search(r'(\d+(?:\.\d+)?)\s*एकड़', text)
-            if match:
-                details['land_size'] = float(match.group(1))
-        
-        # Crop names in Hindi
-        hindi_crops = {
-            'चावल': 'Rice', 'गेहूं': 'Wheat', 'मक्का': 'Corn', 'टमाटर': 'Tomato',
-            'आलू': 'Potato', 'प्याज': 'Onion', 'गन्ना': 'Sugarcane', 'कपास': 'Cotton',
-            'हल्दी': 'Turmeric', 'मिर्च': 'Chili', 'बैंगन': 'Eggplant'
-        }
+    def _extract_columns(self, text_inputs, detected_languages, with_confidence=False):
+        """
+        Detect languages, extract every script segment and merge per text.
         
-        for hindi_crop, english_crop in hindi_crops.items():
-            if hindi_crop in text:
-                details['crop_preference'] = english_crop
-                break
+        With with_confidence a 'confidence' column holds a dict of slot scores per text.
+        """
         
-        # Soil types in Hindi
-        hindi_soils = {
-            'चिकनी': 'Clay', 'रेतीली': 'Sandy', 'दोमट': 'Loamy', 'काली': 'Black', 'लाल': 'Red'
-        }
+        # Normalize text input
+        texts = [text.lower().strip() for text in text_inputs]
         
-        for hindi_soil, english_soil in hindi_soils.items():
-            if hindi_soil in text:
-                details['soil_type'] = english_soil
-                break
+        if detected_languages is None or isinstance(detected_languages, str):
+            hints = [detected_languages or 'English'] * len(texts)
+        else:
+            hints = list(detected_languages)
         
-        return details
-    
-    def _extract_tamil_details(self, text):
-        """Extract farming details from Tamil text."""
-        
-        details = {}
-        
-        # Tamil farming terms
-        if 'ஏக்கர்' in text:
-            # Extract acre information
-            match = re.search(r'(\d+(?:\.\d+)?)\s*ஏக்கர்', text)
-            if match:
-                details['land_size'] = float(match.group(1))
-        
-        # Crop names in Tamil
-        tamil_crops = {
-            'அரிசி': 'Rice', 'கோதுமை': 'Wheat', 'சோளம்': 'Corn', 'தக்காளி': 'Tomato',
-            'உருளைக்கிழங்கு': 'Potato', 'வெங்காயம்': 'Onion', 'கரும்பு': 'Sugarcane',
-            'பருத்தி': 'Cotton', 'மஞ்சள்': 'Turmeric', 'மிளகாய்': 'Chili'
-        }
+        columns = {field: [None] * len(texts) for field in FARMING_FIELDS}
+        columns['language'] = [
+            detected or hint for detected, hint in zip(detect_languages(texts, default=None), hints)
+        ]
         
-        for tamil_crop, english_crop in tamil_crops.items():
-            if tamil_crop in text:
-                details['crop_preference'] = english_crop
-                break
+        # Group segments by language so each compiled extractor scans all of its
+        # segments in one pass, instead of trying every extractor on every text
+        segments = segment_languages(texts, default=None)
+        groups = {}
+        for row, text_segments in enumerate(segments):
+            for position, (language, segment) in enumerate(text_segments):
+                language = language or hints[row]
+                if language not in self.entity_extractors:
+                    language = 'English'
+                keys, parts = groups.setdefault(language, ([], []))
+                keys.append((row, position))
+                parts.append(segment)
+        
+        extracted = {}
+        for language, (keys, parts) in groups.items():
+            found = self.entity_extractors[language].extract_many(parts, with_confidence)
+            extracted.update(zip(keys, found if with_confidence else ((details, {}) for details in found)))
+        
+        # Merge in text order: the first segment to mention a slot keeps it
+        if with_confidence:
+            columns['confidence'] = [{} for _ in texts]
+        for row, text_segments in enumerate(segments):
+            for position in range(len(text_segments)):
+                details, confidences = extracted[(row, position)]
+                for field, value in details.items():
+                    if columns[field][row] is None:
+                        columns[field][row] = value
+                        if with_confidence:
+                            columns['confidence'][row][field] = confidences[field]
+        
+        return columns
+    
+    async def process_voice_stream(self, messages, batch_size=500, max_delay=0.05, detected_language=None):
+        """
+        Process an async stream of messages in micro-batches.
         
-        # Soil types in Tamil
-        tamil_soils = {
-            'களிமண்': 'Clay', 'மணல்': 'Sandy', 'கலவை': 'Loamy', 'கருப்பு': 'Black', 'சிவப்பு': 'Red'
-        }
+        Messages are collected until batch_size is reached or max_delay seconds
+        pass without a full batch, then extracted together off the event loop.
         
-        for tamil_soil, english_soil in tamil_soils.items():
-            if tamil_soil in text:
-                details['soil_type'] = english_soil
-                break
+        Args:
+            messages: Async iterable of transcribed texts
+            batch_size: Maximum messages per batch
+            max_delay: Seconds to wait for more messages before flushing
+            detected_language: Language for all messages, or None to detect
+            
+        Yields:
+            pd.DataFrame: Extracted fields for each micro-batch, in arrival order
+        """
         
-        return details
+        loop = asyncio.get_running_loop()
+        iterator = messages.__aiter__()
+        pending = asyncio.ensure_future(iterator.__anext__())
+        batch = []
+        exhausted = False
+        
+        while not exhausted:
+            done, _ = await asyncio.wait({pending}, timeout=max_delay if batch else None)
+            if done:
+                try:
+                    batch.append(pending.result())
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                except StopAsyncIteration:
+                    exhausted = True
+            
+            # Flush on a full batch, a quiet period or the end of the stream
+            if batch and (len(batch) >= batch_size or not done or exhausted):
+                yield await loop.run_in_executor(
+                    None, self.process_voice_input_batch, batch, detected_language
+                )
+                batch = []
     
-    def _extract_telugu_details(self, text):
-        """Extract farming details from Telugu text."""
-        
-        details = {}
-        
-        # Telugu farming terms
-        if 'ఎకరాలు' in text or 'ఎకరం' in text:
-            # Extract acre information
-            match = re.search(r'(\d+(?:\.\d+)?)\s*(?:ఎకరాలు|ఎకరం)', text)
-            if match:
-                details['land_size'] = float(match.group(1))
-        
-        # Crop names in Telugu
-        telugu_crops = {
-            'వరి': 'Rice', 'గోధుమ': 'Wheat', 'మొక్కజొన్న': 'Corn', 'టమోటా': 'Tomato',
-            'బంగాళాదుంప': 'Potato', 'ఉల్లిపాయ': 'Onion', 'చెరకు': 'Sugarcane',
-            'పత్తి': 'Cotton', 'పసుపు': 'Turmeric', 'మిరపకాయ': 'Chili'
-        }
-        
-        for telugu_crop, english_crop in telugu_crops.items():
-            if telugu_crop in text:
-                details['crop_preference'] = english_crop
-                break
+    def generate_response(self, recommendations, language='English'):
+        """Generate farmer-friendly response in the specified language."""
         
-        # Soil types in Telugu
-        telugu_soils = {
-            'బంకమట్టి': 'Clay', 'ఇసుకమట్టి': 'Sandy', 'లోమిమట్టి': 'Loamy', 'నల్లమట్టి': 'Black', 'ఎర్రమట్టి': 'Red'
-        }
+        return RESPONSE_HEADERS.get(language, RESPONSE_HEADERS['English'])
+    
+    def compose_spoken_response(self, recommendations, language='English'):
+        """
+        Build the text read out to the farmer, one phrase per line.
         
-        for telugu_soil, english_soil in telugu_soils.items():
-            if telugu_soil in text:
-                details['soil_type'] = english_soil
-                break
+        Headers, care advice, crop names and tips come from fixed phrase sets,
+        so nearly every line is already in the speech cache.
+        """
         
-        return details
+        headers = self.generate_response(recommendations, language)
+        lines = [headers['greeting']]
+        if recommendations['suitable_crops']:
+            lines.append(headers['crop_suggestion'])
+            lines.extend(crop['name'] for crop in recommendations['suitable_crops'])
+            for section, advice in CARE_ADVICE.items():
+                lines.append(headers[section])
+                lines.extend(advice)
+        lines.append(headers['tips'])
+        lines.extend(recommendations['general_tips'])
+        return '\n'.join(lines)
     
-    def _extract_kannada_details(self, text):
-        """Extract farming details from Kannada text."""
-        
-        details = {}
-        
-        # Kannada farming terms (basic implementation)
-        if 'ಎಕರೆ' in text:
-            # Extract acre information
-            match = re.search(r'(\d+(?:\.\d+)?)\s*ಎಕರೆ', text)
-            if match:
-                details['land_size'] = float(match.group(1))
-        
-        # Basic Kannada crop names
-        kannada_crops = {
-            'ಅಕ್ಕಿ': 'Rice', 'ಗೋಧಿ': 'Wheat', 'ಸೋಳ': 'Corn', 'ಟೊಮೇಟೊ': 'Tomato',
-            'ಆಲೂಗಡ್ಡೆ': 'Potato', 'ಈರುಳ್ಳಿ': 'Onion', 'ಕಬ್ಬು': 'Sugarcane'
-        }
+    def speak_response(self, text, language='English'):
+        """
+        Render response text as speech offline.
         
-        for kannada_crop, english_crop in kannada_crops.items():
-            if kannada_crop in text:
-                details['crop_preference'] = english_crop
-                break
+        Returns:
+            bytes: WAV audio
+            
+        Raises:
+            RuntimeError: If the speech synthesizer is not installed
+        """
         
-        return details
+        return self.synthesizer.speak(text, language)
     
-    def generate_response(self, recommendations, language='English'):
-        """Generate farmer-friendly response in the specified language."""
+    def prerender_common_phrases(self):
+        """
+        Synthesize the phrases shared by most responses ahead of time.
         
-        responses = {
-            'English': {
-                'greeting': "Based on your input, here are my recommendations:",
-                'crop_suggestion': "Recommended crops for your land:",
-                'care_schedule': "Daily care schedule:",
-                'water_info': "Water requirements:",
-                'fertilizer_info': "Fertilizer recommendations:",
-                'yield_info': "Expected yield:",
-                'tips': "Additional tips:"
-            },
-            'Hindi': {
-                'greeting': "आपकी जानकारी के आधार पर मेरे सुझाव:",
-                'crop_suggestion': "आपकी जमीन के लिए सुझाई गई फसलें:",
-                'care_schedule': "रोज की देखभाल:",
-                'water_info': "पानी की जरूरत:",
-                'fertilizer_info': "खाद की सलाह:",
-                'yield_info': "अपेक्षित उत्पादन:",
-                'tips': "अतिरिक्त सलाह:"
-            },
-            'Tamil': {
-                'greeting': "உங்கள் தகவலின் அடிப்படையில் எனது பரிந்துரைகள்:",
-                'crop_suggestion': "உங்கள் நிலத்திற்கு பரிந்துரைக்கப்பட்ட பயிர்கள்:",
-                'care_schedule': "தினசரி பராமரிப்பு:",
-                'water_info': "நீர் தேவைகள்:",
-                'fertilizer_info': "உர பரிந்துரைகள்:",
-                'yield_info': "எதிர்பார்க்கப்படும் மகசூல்:",
-                'tips': "கூடுதல் குறிப்புகள்:"
-            },
-            'Telugu': {
-                'greeting': "మీ సమాచారం ఆధారంగా నా సిఫార్సులు:",
-                'crop_suggestion': "మీ భూమికి సిఫార్సు చేయబడిన పంటలు:",
-                'care_schedule': "రోజువారీ సంరక్షణ:",
-                'water_info': "నీటి అవసరాలు:",
-                'fertilizer_info': "ఎరువుల సిఫార్సులు:",
-                'yield_info': "ఊహించిన దిగుబడి:",
-                'tips': "అదనపు సలహాలు:"
-            }
-        }
+        Returns:
+            bool: False if the speech synthesizer is not installed
+        """
         
-        return responses.get(language, responses['English'])
\ No newline at end of file
+        crops = get_crop_database().values()
+        try:
+            for language, headers in RESPONSE_HEADERS.items():
+                self.synthesizer.prerender(headers.values(), language)
+            for advice in CARE_ADVICE.values():
+                self.synthesizer.prerender(advice)
+            self.synthesizer.prerender(crop['name'] for crop in crops)
+            self.synthesizer.prerender(tip for crop in crops for tip in crop['growing_tips'])
+        except RuntimeError:
+            return False
+        return True